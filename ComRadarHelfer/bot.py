@@ -8,7 +8,7 @@ from discord.ext import commands
 from discord import app_commands
 from dotenv import load_dotenv
 import asyncio
-from utils.permissions import setup_discord_logging
+from utils.permissions import setup_discord_logging, setup_permission_cache
 from utils.guild_config import load_settings, save_settings
 
 # -------------------------------------------------
@@ -29,6 +29,7 @@ bot.remove_command("help")
 # 🎨 Logging aktivieren
 # -------------------------------------------------
 setup_discord_logging(bot)
+setup_permission_cache(bot)
 os.makedirs("data", exist_ok=True)
 
 # -------------------------------------------------
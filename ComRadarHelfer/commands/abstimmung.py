@@ -9,6 +9,7 @@ import aiohttp
 import os
 import json
 from datetime import datetime
+from utils.permissions import is_authorized
 
 GUILD_SETTINGS_FILE = "data/guild_settings.json"
 ABSTIMMUNGEN_FILE = "data/abstimmungen.json"
@@ -159,9 +160,7 @@ class Abstimmung(commands.Cog):
 
     @app_commands.command(name="abstimmung", description="Startet eine neue Abstimmung im ComRadar-System.")
     async def abstimmung(self, interaction: discord.Interaction):
-        guild_id = str(interaction.guild.id)
-        guild_settings = load_json(GUILD_SETTINGS_FILE).get(guild_id, {})
-        if not any(r.id == guild_settings.get("ADMIN_ROLE_IDS") for r in interaction.user.roles):
+        if not is_authorized(interaction.user, "admin"):
             await interaction.response.send_message("❌ Nur Admins dürfen diesen Befehl verwenden.", ephemeral=True)
             return
         await interaction.response.send_modal(AbstimmungModal())
@@ -3,14 +3,30 @@
 # =============================================
 import discord
 from discord.ext import commands
+from discord import app_commands
 import datetime
 import io
 import os
 import json
+import random
+import time
+from collections import Counter, OrderedDict, deque
+from difflib import SequenceMatcher
+from utils.guild_config import get_guild_settings_cached, load_settings, save_settings, settings_mtime
+from utils.log_router import get_log_router
 
-GUILD_SETTINGS_FILE = "data/guild_settings.json"
 os.makedirs("data", exist_ok=True)
 
+BULK_SUPPRESS_SECONDS = 120  # so lange werden IDs aus Bulk-Löschungen im Einzelpfad ignoriert
+EXACT_DIFF_MAX_CHARS = 1000  # längere Texte werden nicht mehr exakt (quadratisch) verglichen
+
+# Ereignis-Kategorien, auf die sich AUDIT_RULES beziehen
+AUDIT_CATEGORIES = [
+    "member_join", "member_remove", "member_update", "user_update",
+    "message_delete", "message_edit", "bulk_delete",
+    "channel_create", "channel_delete", "channel_update",
+]
+
 # -------------------------
 # JSON Load/Save helper
 # -------------------------
@@ -25,12 +41,177 @@ def save_json(path, data):
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
 
+# =============================================
+# 🧮 Filter- und Sampling-Regeln (AUDIT_RULES)
+# =============================================
+# Beispiel in guild_settings.json:
+# "AUDIT_RULES": {
+#     "ignore_channel_ids": [123], "ignore_role_ids": [456], "ignore_bots": false,
+#     "min_edit_diff": 10, "sample_rates": {"message_edit": 0.25},
+#     "user_rate_limit": {"count": 10, "seconds": 60}
+# }
+class AuditRules:
+    """Vorkompilierte Regeln einer Guild."""
+
+    def __init__(self, raw: dict):
+        raw = raw or {}
+        self.ignore_channels = frozenset(raw.get("ignore_channel_ids", []))
+        self.ignore_roles = frozenset(raw.get("ignore_role_ids", []))
+        self.ignore_bots = bool(raw.get("ignore_bots", False))
+        self.min_edit_diff = int(raw.get("min_edit_diff", 0))
+        self.sample_rates = {k: float(v) for k, v in raw.get("sample_rates", {}).items()}
+        limit = raw.get("user_rate_limit") or {}
+        self.rate_count = int(limit.get("count", 0))
+        self.rate_seconds = float(limit.get("seconds", 60))
+
+
+def edit_diff_size(before: str, after: str) -> int:
+    """Anzahl geänderter Zeichen zwischen zwei Texten (exakt, im schlimmsten Fall quadratisch)."""
+    matched = sum(block.size for block in SequenceMatcher(None, before, after, autojunk=False).get_matching_blocks())
+    return max(len(before), len(after)) - matched
+
+
+def edit_diff_at_least(before: str, after: str, threshold: int) -> bool:
+    """Ob sich mindestens threshold Zeichen geändert haben – mit linearen Vorfiltern.
+
+    1. Längenunterschied, 2. Obergrenze der Übereinstimmung über die
+    Zeichenhäufigkeiten (wie quick_ratio()), 3. exakter Vergleich nur für
+    kurze Texte. Lange Texte, die die Vorfilter nicht entscheiden, gelten als
+    geändert (lieber einmal zu viel loggen als den Event-Loop blockieren).
+    """
+    longest = max(len(before), len(after))
+    if abs(len(before) - len(after)) >= threshold:
+        return True
+    max_matched = sum((Counter(before) & Counter(after)).values())
+    if longest - max_matched >= threshold:
+        return True
+    if longest > EXACT_DIFF_MAX_CHARS:
+        return True
+    return edit_diff_size(before, after) >= threshold
+
+
+class AuditRuleEngine:
+    """Entscheidet rein im Speicher, ob ein Ereignis geloggt wird – bevor ein Embed gebaut wird."""
+
+    MAX_TRACKED_USERS = 10000
+
+    def __init__(self):
+        self._rules = {}  # guild_id → AuditRules
+        self._settings_mtime = settings_mtime()
+        self._hits = {}   # (guild_id, user_id) → deque der Zeitpunkte
+
+    def rules_for(self, guild_id: int) -> AuditRules:
+        mtime = settings_mtime()
+        if mtime != self._settings_mtime:
+            self._settings_mtime = mtime
+            self._rules.clear()
+        rules = self._rules.get(guild_id)
+        if rules is None:
+            rules = self._rules[guild_id] = AuditRules(get_guild_settings_cached(guild_id).get("AUDIT_RULES"))
+        return rules
+
+    def allows(self, category: str, guild_id: int, user=None, channel=None, before_text=None, after_text=None) -> bool:
+        rules = self.rules_for(guild_id)
+
+        if channel is not None and rules.ignore_channels:
+            if channel.id in rules.ignore_channels or getattr(channel, "category_id", None) in rules.ignore_channels:
+                return False
+
+        if user is not None:
+            if rules.ignore_bots and user.bot:
+                return False
+            if rules.ignore_roles and any(r.id in rules.ignore_roles for r in getattr(user, "roles", ())):
+                return False
+
+        if category == "message_edit" and rules.min_edit_diff and before_text is not None:
+            if not edit_diff_at_least(before_text, after_text, rules.min_edit_diff):
+                return False
+
+        rate = rules.sample_rates.get(category, 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            return False
+
+        if user is not None and rules.rate_count:
+            return self._within_rate_limit(guild_id, user.id, rules)
+        return True
+
+    def _within_rate_limit(self, guild_id: int, user_id: int, rules: AuditRules) -> bool:
+        now = time.monotonic()
+        hits = self._hits.get((guild_id, user_id))
+        if hits is None:
+            if len(self._hits) >= self.MAX_TRACKED_USERS:
+                self._prune(now)
+            hits = self._hits[(guild_id, user_id)] = deque()
+        while hits and now - hits[0] >= rules.rate_seconds:
+            hits.popleft()
+        if len(hits) >= rules.rate_count:
+            return False
+        hits.append(now)
+        return True
+
+    def _prune(self, now: float):
+        for key, hits in list(self._hits.items()):
+            rules = self.rules_for(key[0])
+            if not hits or now - hits[-1] >= rules.rate_seconds:
+                del self._hits[key]
+
+
+# =============================================
+# 🗂️ Reverse-Index: Benutzer → Guilds
+# =============================================
+class MemberGuildIndex:
+    """Merkt sich, in welchen Guilds ein Benutzer Mitglied ist.
+
+    Wird aus Member-Join/-Remove und dem Laden der Guilds gepflegt, damit
+    on_user_update nicht jede Guild des Bots abfragen muss.
+    """
+
+    def __init__(self):
+        self._guilds = {}  # user_id → set(guild_id)
+
+    def add(self, user_id: int, guild_id: int):
+        self._guilds.setdefault(user_id, set()).add(guild_id)
+
+    def remove(self, user_id: int, guild_id: int):
+        guild_ids = self._guilds.get(user_id)
+        if guild_ids is None:
+            return
+        guild_ids.discard(guild_id)
+        if not guild_ids:
+            del self._guilds[user_id]
+
+    def add_guild(self, guild):
+        for member in guild.members:
+            self.add(member.id, guild.id)
+
+    def remove_guild(self, guild_id: int):
+        for user_id in list(self._guilds):
+            self.remove(user_id, guild_id)
+
+    def rebuild(self, guilds):
+        self._guilds.clear()
+        for guild in guilds:
+            self.add_guild(guild)
+
+    def guilds_of(self, user_id: int):
+        return self._guilds.get(user_id, ())
+
+
 # =============================================
 # 📝 AuditLogger Cog
 # =============================================
 class AuditLogger(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.router = get_log_router(bot)
+        self._bulk_deleted = OrderedDict()  # message_id → Zeitpunkt der Bulk-Löschung
+        self.member_index = MemberGuildIndex()
+        self.rules = AuditRuleEngine()
+
+    async def cog_load(self):
+        # Beim /reload ist der Bot schon bereit – on_ready kommt dann nicht mehr.
+        if self.bot.is_ready():
+            self.member_index.rebuild(self.bot.guilds)
 
     # ---------------------------------------------------------
     # 🪶 Embed-Erstellung mit goldenem Design
@@ -53,30 +234,57 @@ class AuditLogger(commands.Cog):
     # ---------------------------------------------------------
     # 🔔 Nachricht an richtigen Kanal schicken (pro Guild)
     # ---------------------------------------------------------
-    async def send_log(self, guild_id: int, embed, file=None, join_log=False):
-        guild_settings = load_json(GUILD_SETTINGS_FILE).get(str(guild_id), {})
-        channel_id = guild_settings.get("JOIN_LOG_CHANNEL_ID" if join_log else "LOG_CHANNEL_ID")
-        if not channel_id:
-            return
-        channel = self.bot.get_guild(guild_id).get_channel(channel_id)
-        if channel:
-            await channel.send(embed=embed, file=file)
+    async def send_log(self, guild_id: int, embed, file=None, join_log=False, transcript=None):
+        await self.router.send(guild_id, embed, file=file, kind="join" if join_log else "log", transcript=transcript)
+
+    # ---------------------------------------------------------
+    # 🗂️ Pflege des Member-Index
+    # ---------------------------------------------------------
+    @commands.Cog.listener("on_ready")
+    async def _index_ready(self):
+        self.member_index.rebuild(self.bot.guilds)
+
+    @commands.Cog.listener("on_guild_join")
+    async def _index_guild_join(self, guild):
+        if not guild.chunked:
+            await guild.chunk()
+        self.member_index.add_guild(guild)
+
+    @commands.Cog.listener("on_guild_available")
+    async def _index_guild_available(self, guild):
+        self.member_index.add_guild(guild)
+
+    @commands.Cog.listener("on_guild_remove")
+    async def _index_guild_remove(self, guild):
+        self.member_index.remove_guild(guild.id)
+
+    @commands.Cog.listener("on_member_join")
+    async def _index_member_join(self, member):
+        self.member_index.add(member.id, member.guild.id)
+
+    @commands.Cog.listener("on_member_remove")
+    async def _index_member_remove(self, member):
+        self.member_index.remove(member.id, member.guild.id)
 
     # ---------------------------------------------------------
     # 👋 MEMBER JOIN / REMOVE
     # ---------------------------------------------------------
-    @commands.Cog.listener()
-    async def on_member_join(self, member):
-        embed = self.create_log_embed(
+    # Beitritte werden vom MemberJoinPipeline-Cog (member_join.py) verarbeitet,
+    # der dieses Embed zusammen mit AutoRole/AutoRoleRestore in einem Durchlauf erstellt.
+    def build_join_embed(self, member):
+        if not self.rules.allows("member_join", member.guild.id, user=member):
+            return None
+        return self.create_log_embed(
             "👋 Mitglied beigetreten",
             f"{member.mention} ist dem Server beigetreten.\n"
             f"Account erstellt: <t:{int(member.created_at.timestamp())}:R>",
             member,
         )
-        await self.send_log(member.guild.id, embed, join_log=True)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
+        if not self.rules.allows("member_remove", member.guild.id, user=member):
+            return
         embed = self.create_log_embed(
             "🚪 Mitglied hat den Server verlassen",
             f"{member.mention} hat den Server verlassen.",
@@ -109,7 +317,7 @@ class AuditLogger(commands.Cog):
                 removed_list = ", ".join(r.mention for r in removed)
                 changes.append(f"**Entfernt:** {removed_list}")
 
-        if changes:
+        if changes and self.rules.allows("member_update", after.guild.id, user=after):
             embed = self.create_log_embed(
                 "🧩 Mitglied aktualisiert",
                 "\n".join(changes),
@@ -123,6 +331,13 @@ class AuditLogger(commands.Cog):
     @commands.Cog.listener()
     async def on_user_update(self, before, after):
         if before.avatar != after.avatar:
+            # Nur Guilds, in denen der Benutzer ist und ein Log-Kanal existiert
+            guild_ids = [
+                gid for gid in self.member_index.guilds_of(after.id)
+                if self.router.has_channel(gid) and self.rules.allows("user_update", gid, user=after)
+            ]
+            if not guild_ids:
+                return
             embed = self.create_log_embed(
                 "🖼️ Avatar geändert",
                 f"{after.mention} hat seinen Avatar geändert.",
@@ -133,17 +348,18 @@ class AuditLogger(commands.Cog):
                 embed.set_image(url=after.display_avatar.url)
             except Exception:
                 pass
-            # Warnung: Benutzer kann in mehreren Guilds sein, hier pro Guild loggen
-            for guild in self.bot.guilds:
-                if guild.get_member(after.id):
-                    await self.send_log(guild.id, embed)
+            # Benutzer kann in mehreren Guilds sein, hier pro Guild loggen
+            for guild_id in guild_ids:
+                await self.send_log(guild_id, embed)
 
     # ---------------------------------------------------------
     # 💬 NACHRICHTEN (mit Textdatei bei langen Logs)
     # ---------------------------------------------------------
     @commands.Cog.listener()
     async def on_message_delete(self, message):
-        if message.author.bot:
+        if message.author.bot or message.id in self._bulk_deleted or not message.guild:
+            return
+        if not self.rules.allows("message_delete", message.guild.id, user=message.author, channel=message.channel):
             return
         text_content = message.content or "*Keine Nachricht*"
         embed = self.create_log_embed(
@@ -151,18 +367,75 @@ class AuditLogger(commands.Cog):
             f"**Autor:** {message.author.mention}\n**Kanal:** {message.channel.mention}",
             message.author,
         )
-        file = None
+        transcript = None
         if len(text_content) > 1000:
-            log_bytes = io.BytesIO(text_content.encode("utf-8"))
-            file = discord.File(log_bytes, filename=f"deleted_message_{message.id}.txt")
+            transcript = (f"deleted_message_{message.id}", text_content)
             embed.add_field(name="📎 Hinweis", value="Nachricht war zu lang – siehe Datei.", inline=False)
         else:
             embed.add_field(name="📝 Inhalt", value=text_content, inline=False)
-        await self.send_log(message.guild.id, embed, file=file)
+        await self.send_log(message.guild.id, embed, transcript=transcript)
+
+    # ---------------------------------------------------------
+    # 🧹 BULK-LÖSCHUNG (Purge) – ein Transkript statt vieler Embeds
+    # ---------------------------------------------------------
+    def _remember_bulk_ids(self, message_ids):
+        now = time.monotonic()
+        for message_id in message_ids:
+            self._bulk_deleted[message_id] = now
+        while self._bulk_deleted:
+            oldest_id, deleted_at = next(iter(self._bulk_deleted.items()))
+            if now - deleted_at < BULK_SUPPRESS_SECONDS:
+                break
+            del self._bulk_deleted[oldest_id]
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        if not payload.guild_id:
+            return
+        self._remember_bulk_ids(payload.message_ids)
+        if not self.rules.allows("bulk_delete", payload.guild_id, channel=discord.Object(id=payload.channel_id)):
+            return
+
+        guild = self.bot.get_guild(payload.guild_id)
+        channel = guild.get_channel(payload.channel_id) if guild else None
+        cached = {m.id: m for m in payload.cached_messages}
+
+        lines = []
+        for message_id in sorted(payload.message_ids):
+            message = cached.get(message_id)
+            if message is None:
+                ts = discord.utils.snowflake_time(message_id).strftime("%d.%m.%Y %H:%M:%S")
+                lines.append(f"[{ts}] <nicht im Cache> (Nachricht {message_id})")
+                continue
+            ts = message.created_at.strftime("%d.%m.%Y %H:%M:%S")
+            content = message.content or "*Keine Nachricht*"
+            if message.attachments:
+                content += "\n    📎 " + ", ".join(a.url for a in message.attachments)
+            lines.append(f"[{ts}] {message.author} ({message.author.id}): {content}")
+
+        channel_name = f"#{channel.name}" if channel else str(payload.channel_id)
+        header = (
+            f"# 🧹 Bulk-Löschung in {channel_name}\n"
+            f"# {len(payload.message_ids)} Nachrichten, davon {len(cached)} aus dem Cache\n\n"
+        )
+        file = discord.File(
+            io.BytesIO((header + "\n".join(lines)).encode("utf-8")),
+            filename=f"bulk_delete_{payload.channel_id}_{int(time.time())}.txt",
+        )
+        embed = self.create_log_embed(
+            "🧹 Nachrichten gesammelt gelöscht",
+            f"**Kanal:** <#{payload.channel_id}>\n"
+            f"**Anzahl:** {len(payload.message_ids)} (davon {len(cached)} mit Inhalt)",
+        )
+        embed.add_field(name="📎 Hinweis", value="Der Verlauf befindet sich in der angehängten Datei.", inline=False)
+        await self.send_log(payload.guild_id, embed, file=file)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
-        if after.author.bot or before.content == after.content:
+        if after.author.bot or before.content == after.content or not after.guild:
+            return
+        if not self.rules.allows("message_edit", after.guild.id, user=after.author, channel=after.channel,
+                                 before_text=before.content, after_text=after.content):
             return
         before_text = before.content or "*Leer*"
         after_text = after.content or "*Leer*"
@@ -171,22 +444,23 @@ class AuditLogger(commands.Cog):
             f"**Autor:** {after.author.mention}\n**Kanal:** {after.channel.mention}",
             after.author,
         )
-        file = None
+        transcript = None
         if len(before_text + after_text) > 1000:
             combined_text = "===== Vorher =====\n" + before_text + "\n\n===== Nachher =====\n" + after_text
-            log_bytes = io.BytesIO(combined_text.encode("utf-8"))
-            file = discord.File(log_bytes, filename=f"edited_message_{after.id}.txt")
+            transcript = (f"edited_message_{after.id}", combined_text)
             embed.add_field(name="📎 Hinweis", value="Nachricht war zu lang – siehe Datei.", inline=False)
         else:
             embed.add_field(name="📝 Vorher", value=before_text, inline=False)
             embed.add_field(name="📝 Nachher", value=after_text, inline=False)
-        await self.send_log(after.guild.id, embed, file=file)
+        await self.send_log(after.guild.id, embed, transcript=transcript)
 
     # ---------------------------------------------------------
     # 🧱 KANÄLE
     # ---------------------------------------------------------
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel):
+        if not self.rules.allows("channel_create", channel.guild.id, channel=channel):
+            return
         embed = self.create_log_embed(
             "➕ Kanal erstellt",
             f"**Name:** {channel.mention}\n**Typ:** {channel.type}",
@@ -195,6 +469,8 @@ class AuditLogger(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
+        if not self.rules.allows("channel_delete", channel.guild.id, channel=channel):
+            return
         embed = self.create_log_embed(
             "❌ Kanal gelöscht",
             f"**Name:** #{channel.name}\n**Typ:** {channel.type}",
@@ -203,13 +479,110 @@ class AuditLogger(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_channel_update(self, before, after):
-        if before.name != after.name:
+        if before.name != after.name and self.rules.allows("channel_update", after.guild.id, channel=after):
             embed = self.create_log_embed(
                 "✏️ Kanal umbenannt",
                 f"**Vorher:** #{before.name}\n**Nachher:** #{after.name}",
             )
             await self.send_log(after.guild.id, embed)
 
+    # ---------------------------------------------------------
+    # 📊 Zustand der Log-Queues
+    # ---------------------------------------------------------
+    @app_commands.command(name="auditlog_status", description="📊 Zeigt den Zustand der Log-Queues dieses Servers (Admin).")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def auditlog_status(self, interaction: discord.Interaction):
+        stats = self.router.stats(interaction.guild.id)
+        if not stats:
+            await interaction.response.send_message("ℹ️ Bisher wurden keine Logs versendet.", ephemeral=True)
+            return
+        embed = self.create_log_embed("📊 Log-Queues", "Kennzahlen seit dem letzten Neustart.")
+        for channel_id, s in stats.items():
+            embed.add_field(
+                name=f"#{getattr(interaction.guild.get_channel(channel_id), 'name', channel_id)}",
+                value=(
+                    f"**Warteschlange:** {s['depth']} (max. {s['max_depth']})\n"
+                    f"**Eingereiht:** {s['enqueued']} • **Verworfen:** {s['dropped']} • **Fehler:** {s['failed']}\n"
+                    f"**Nachrichten:** {s['sent_messages']} • **Embeds:** {s['sent_embeds']}"
+                ),
+                inline=False,
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    # ---------------------------------------------------------
+    # 🧮 Filterregeln anzeigen / ändern
+    # ---------------------------------------------------------
+    @app_commands.command(name="auditlog_regeln", description="🧮 Zeigt oder ändert die Filterregeln des Audit-Logs (Admin).")
+    @app_commands.describe(
+        kanal="Kanal (oder Kategorie) ignorieren bzw. wieder loggen",
+        rolle="Mitglieder mit dieser Rolle ignorieren bzw. wieder loggen",
+        bots_ignorieren="Ereignisse von Bots ignorieren",
+        min_aenderung="Bearbeitungen erst ab so vielen geänderten Zeichen loggen (0 = alle)",
+        kategorie="Ereignis-Kategorie für die Stichprobe",
+        stichprobe="Anteil der Ereignisse dieser Kategorie, die geloggt werden (0.0 – 1.0)",
+        limit_anzahl="Max. Ereignisse pro Benutzer im Zeitfenster (0 = kein Limit)",
+        limit_sekunden="Zeitfenster des Benutzer-Limits in Sekunden",
+    )
+    @app_commands.choices(kategorie=[app_commands.Choice(name=c, value=c) for c in AUDIT_CATEGORIES])
+    @app_commands.checks.has_permissions(administrator=True)
+    async def auditlog_regeln(
+        self,
+        interaction: discord.Interaction,
+        kanal: discord.abc.GuildChannel = None,
+        rolle: discord.Role = None,
+        bots_ignorieren: bool = None,
+        min_aenderung: int = None,
+        kategorie: str = None,
+        stichprobe: float = None,
+        limit_anzahl: int = None,
+        limit_sekunden: int = None,
+    ):
+        changed = any(v is not None for v in (kanal, rolle, bots_ignorieren, min_aenderung, stichprobe, limit_anzahl, limit_sekunden))
+        if changed:
+            settings = load_settings()
+            raw = settings.setdefault(str(interaction.guild.id), {}).setdefault("AUDIT_RULES", {})
+            for key, item in (("ignore_channel_ids", kanal), ("ignore_role_ids", rolle)):
+                if item is not None:
+                    ids = raw.setdefault(key, [])
+                    if item.id in ids:
+                        ids.remove(item.id)
+                    else:
+                        ids.append(item.id)
+            if bots_ignorieren is not None:
+                raw["ignore_bots"] = bots_ignorieren
+            if min_aenderung is not None:
+                raw["min_edit_diff"] = max(min_aenderung, 0)
+            if stichprobe is not None:
+                if not kategorie:
+                    await interaction.response.send_message("⚠️ Für eine Stichprobe bitte eine Kategorie wählen.", ephemeral=True)
+                    return
+                raw.setdefault("sample_rates", {})[kategorie] = min(max(stichprobe, 0.0), 1.0)
+            if limit_anzahl is not None or limit_sekunden is not None:
+                limit = raw.setdefault("user_rate_limit", {"count": 0, "seconds": 60})
+                if limit_anzahl is not None:
+                    limit["count"] = max(limit_anzahl, 0)
+                if limit_sekunden is not None:
+                    limit["seconds"] = max(limit_sekunden, 1)
+            save_settings(settings)
+
+        rules = self.rules.rules_for(interaction.guild.id)
+        embed = self.create_log_embed("🧮 Audit-Log-Regeln", "✅ Regeln gespeichert." if changed else "Aktuelle Regeln dieses Servers.")
+        embed.add_field(name="Ignorierte Kanäle", value=", ".join(f"<#{c}>" for c in rules.ignore_channels) or "—", inline=False)
+        embed.add_field(name="Ignorierte Rollen", value=", ".join(f"<@&{r}>" for r in rules.ignore_roles) or "—", inline=False)
+        embed.add_field(name="Bots ignorieren", value="Ja" if rules.ignore_bots else "Nein", inline=True)
+        embed.add_field(name="Min. Änderung", value=str(rules.min_edit_diff), inline=True)
+        embed.add_field(
+            name="Benutzer-Limit",
+            value=f"{rules.rate_count} / {int(rules.rate_seconds)}s" if rules.rate_count else "—",
+            inline=True,
+        )
+        embed.add_field(
+            name="Stichproben",
+            value="\n".join(f"{k}: {v:.0%}" for k, v in rules.sample_rates.items()) or "—",
+            inline=False,
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 
 # ---------------------------------------------------------
 # ⚙️ Setup
@@ -2,46 +2,120 @@
 # 📂 Einstellungen & Konstanten
 # =============================================
 import discord
-from discord.ext import commands
-import json
+from discord.ext import commands, tasks
+import base64
 import os
-from datetime import datetime
+import struct
+import time
+from datetime import datetime, timezone
+from utils.guild_config import get_guild_settings_cached
+from utils.journal import JournalStore
+from utils.log_router import get_log_router
 
 BACKUP_FILE = "data/roles_backup.json"  # Datei zum Speichern der Rollen
-GUILD_SETTINGS_FILE = "data/guild_settings.json"
 os.makedirs("data", exist_ok=True)
 
+BACKUP_TTL_DAYS = 90          # Standard-Aufbewahrung, pro Guild über ROLE_BACKUP_TTL_DAYS änderbar
+MAX_BACKUPS_PER_GUILD = 50000  # ältere Einträge werden beim Aufräumen verworfen
+LEGACY_GUILD = "*"             # Einträge aus dem alten, nur nach User-ID sortierten Format
+
+
 # -------------------------
-# Hilfsfunktionen für JSON-Handling
+# Rollen-IDs kompakt speichern (Base64 aus gepackten uint64)
 # -------------------------
-def load_backups():
-    """Lädt gespeicherte Rollen-Backups aus JSON."""
-    if not os.path.exists(BACKUP_FILE):
-        return {}
-    try:
-        with open(BACKUP_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        print("[WARNUNG] roles_backup.json war beschädigt – neue Datei wird erstellt.")
-        return {}
-
-
-def save_backups(data):
-    """Speichert Rollen-Backups als JSON."""
-    os.makedirs("data", exist_ok=True)
-    with open(BACKUP_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
-
-
-def load_guild_settings(guild_id: int):
-    settings = {}
-    if os.path.exists(GUILD_SETTINGS_FILE):
-        try:
-            all_settings = json.load(open(GUILD_SETTINGS_FILE, "r", encoding="utf-8"))
-            settings = all_settings.get(str(guild_id), {})
-        except Exception:
-            pass
-    return settings
+def pack_role_ids(role_ids) -> str:
+    return base64.b64encode(struct.pack(f"<{len(role_ids)}Q", *role_ids)).decode("ascii")
+
+
+def unpack_role_ids(packed: str) -> list:
+    raw = base64.b64decode(packed)
+    return list(struct.unpack(f"<{len(raw) // 8}Q", raw))
+
+
+# =============================================
+# 💾 Rollen-Backups pro Guild
+# =============================================
+class RoleBackupStore(JournalStore):
+    """Rollen-Backups als {guild_id: {user_id: [gepackte Rollen, Unix-Zeit]}}.
+
+    Änderungen werden nur ans Journal angehängt (siehe utils.journal), die
+    komplette Datei wird erst beim Kompaktieren neu geschrieben.
+    """
+
+    def from_snapshot(self, raw):
+        if raw.get("version") == 2:
+            return raw.get("guilds", {})
+        # Altes Format: {user_id: {"roles": [...], "timestamp": iso}} – Guild unbekannt
+        legacy = {}
+        for user_id, entry in raw.items():
+            try:
+                ts = int(datetime.fromisoformat(entry["timestamp"]).replace(tzinfo=timezone.utc).timestamp())
+                legacy[user_id] = [pack_role_ids(entry["roles"]), ts]
+            except (KeyError, TypeError, ValueError):
+                continue
+        return {LEGACY_GUILD: legacy} if legacy else {}
+
+    def to_snapshot(self):
+        return {"version": 2, "guilds": self.data}
+
+    def apply(self, op):
+        guild_id, user_id = op["g"], op["u"]
+        if op["op"] == "set":
+            self.data.setdefault(guild_id, {})[user_id] = [op["r"], op["t"]]
+        elif op["op"] == "del":
+            entries = self.data.get(guild_id)
+            if entries is not None:
+                entries.pop(user_id, None)
+                if not entries:
+                    del self.data[guild_id]
+
+    # ---------------------------------------------
+    def save(self, guild_id: int, user_id: int, role_ids):
+        self.record({"op": "set", "g": str(guild_id), "u": str(user_id),
+                     "r": pack_role_ids(role_ids), "t": int(time.time())})
+
+    def pop(self, guild_id: int, user_id: int, ttl_days: int):
+        """Entfernt das Backup und gibt die Rollen-IDs zurück (None, wenn keins oder abgelaufen)."""
+        for key in (str(guild_id), LEGACY_GUILD):
+            entry = self.data.get(key, {}).get(str(user_id))
+            if entry is None:
+                continue
+            self.record({"op": "del", "g": key, "u": str(user_id)})
+            if time.time() - entry[1] > ttl_days * 86400:
+                return None
+            return unpack_role_ids(entry[0])
+        return None
+
+    def sweep(self, bot) -> int:
+        """Entfernt abgelaufene Backups und gelöschte Rollen. Gibt die Anzahl entfernter Backups zurück."""
+        now = time.time()
+        removed = 0
+        for guild_id in list(self.data):
+            guild = bot.get_guild(int(guild_id)) if guild_id != LEGACY_GUILD else None
+            ttl = get_guild_settings_cached(guild_id).get("ROLE_BACKUP_TTL_DAYS", BACKUP_TTL_DAYS) * 86400
+            entries = self.data[guild_id]
+            for user_id, (packed, ts) in list(entries.items()):
+                if now - ts > ttl:
+                    del entries[user_id]
+                    removed += 1
+                    continue
+                if guild is not None:
+                    role_ids = unpack_role_ids(packed)
+                    existing = [rid for rid in role_ids if guild.get_role(rid) is not None]
+                    if not existing:
+                        del entries[user_id]
+                        removed += 1
+                    elif len(existing) != len(role_ids):
+                        entries[user_id] = [pack_role_ids(existing), ts]
+            if len(entries) > MAX_BACKUPS_PER_GUILD:
+                oldest = sorted(entries, key=lambda uid: entries[uid][1])[:len(entries) - MAX_BACKUPS_PER_GUILD]
+                for user_id in oldest:
+                    del entries[user_id]
+                removed += len(oldest)
+            if not entries:
+                del self.data[guild_id]
+        self.compact()
+        return removed
 
 
 # =============================================
@@ -50,6 +124,26 @@ def load_guild_settings(guild_id: int):
 class AutoRoleRestore(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.router = get_log_router(bot)
+        self.backups = RoleBackupStore(BACKUP_FILE)
+        self.sweep_backups.start()
+
+    def cog_unload(self):
+        self.sweep_backups.cancel()
+        self.backups.compact()
+
+    # -------------------------------------------------
+    # 🧹 Abgelaufene Backups & gelöschte Rollen entfernen
+    # -------------------------------------------------
+    @tasks.loop(hours=6)
+    async def sweep_backups(self):
+        removed = self.backups.sweep(self.bot)
+        if removed:
+            print(f"🧹 {removed} Rollen-Backups entfernt (abgelaufen oder Rollen gelöscht).")
+
+    @sweep_backups.before_loop
+    async def before_sweep(self):
+        await self.bot.wait_until_ready()
 
     # -------------------------------------------------
     # Hilfsfunktion: Goldenes Log-Embed
@@ -69,13 +163,7 @@ class AutoRoleRestore(commands.Cog):
 
     async def send_log(self, guild_id: int, embed, join_log=False):
         """Sendet das Embed in den passenden Log-Kanal der Guild."""
-        guild_settings = load_guild_settings(guild_id)
-        channel_id = guild_settings.get("JOIN_LOG_CHANNEL_ID" if join_log else "LOG_CHANNEL_ID")
-        if not channel_id:
-            return
-        channel = self.bot.get_guild(guild_id).get_channel(channel_id)
-        if channel:
-            await channel.send(embed=embed)
+        await self.router.send(guild_id, embed, kind="join" if join_log else "log")
 
     # -------------------------------------------------
     # 📤 Member verlässt den Server
@@ -85,15 +173,10 @@ class AutoRoleRestore(commands.Cog):
         if member.bot:
             return
 
-        backups = load_backups()
-        role_ids = [role.id for role in member.roles if role.name != "@everyone"]
+        role_ids = [role.id for role in member.roles if not role.is_default()]
 
         if role_ids:
-            backups[str(member.id)] = {
-                "roles": role_ids,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            save_backups(backups)
+            self.backups.save(member.guild.id, member.id, role_ids)
 
             # Logging im JOIN_LOG_CHANNEL der Guild
             roles_text = ", ".join([r.name for r in member.roles if r.name != "@everyone"]) or "Keine Rollen"
@@ -110,41 +193,27 @@ class AutoRoleRestore(commands.Cog):
     # -------------------------------------------------
     # 🔁 Member tritt erneut bei
     # -------------------------------------------------
-    @commands.Cog.listener()
-    async def on_member_join(self, member: discord.Member):
+    # Die Vergabe übernimmt der MemberJoinPipeline-Cog (member_join.py) in einem
+    # gemeinsamen Edit mit den Auto-Rollen – hier nur Backup-Lookup und Log.
+    def take_backup(self, member: discord.Member, guild_settings: dict):
+        """Entfernt das Backup des Mitglieds und gibt die gespeicherten Rollen-IDs zurück."""
         if member.bot:
-            return
-
-        backups = load_backups()
-        data = backups.get(str(member.id))
-
-        if not data:
-            return
-
-        restored = []
-        for role_id in data.get("roles", []):
-            role = member.guild.get_role(role_id)
-            if role:
-                try:
-                    await member.add_roles(role, reason="Rollen automatisch wiederhergestellt")
-                    restored.append(role.name)
-                except discord.Forbidden:
-                    continue
-
-        if restored:
-            embed = self.create_embed(
-                "🔁 Mitglied ist zurückgekehrt",
-                f"{member.mention} (`{member.id}`)",
-                discord.Color.green(),
-                member,
-                field_name="Wiederhergestellte Rollen",
-                field_value=", ".join(restored)
-            )
-            await self.send_log(member.guild.id, embed, join_log=True)
-
-        # Eintrag löschen, um doppelte Wiederherstellung zu vermeiden
-        backups.pop(str(member.id), None)
-        save_backups(backups)
+            return []
+        ttl_days = guild_settings.get("ROLE_BACKUP_TTL_DAYS", BACKUP_TTL_DAYS)
+        return self.backups.pop(member.guild.id, member.id, ttl_days) or []
+
+    def create_restore_log(self, member: discord.Member, restored, not_restored):
+        embed = self.create_embed(
+            "🔁 Mitglied ist zurückgekehrt",
+            f"{member.mention} (`{member.id}`)",
+            discord.Color.green(),
+            member,
+            field_name="Wiederhergestellte Rollen",
+            field_value=", ".join(r.name for r in restored)
+        )
+        if not_restored:
+            embed.add_field(name="Nicht wiederhergestellt", value=", ".join(not_restored)[:1024], inline=False)
+        return embed
 
 
 # -------------------------------------------------
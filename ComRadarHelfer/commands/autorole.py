@@ -2,28 +2,47 @@
 # 📂 Einstellungen & Konstanten
 # =============================================
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-from datetime import datetime
-import json
+from datetime import datetime, timezone
+import asyncio
 import os
+import time
+from utils.guild_config import get_guild_settings_cached
+from utils.log_router import get_log_router
+from utils.permissions import is_authorized, logger
+from utils.role_queue import get_role_queue
+from utils.timeparse import format_berlin
 
-GUILD_SETTINGS_FILE = "data/guild_settings.json"
 os.makedirs("data", exist_ok=True)
 
+RECONCILE_PROGRESS_EVERY = 250   # Fortschritt alle N vergebenen Mitglieder loggen
+RECONCILE_YIELD_EVERY = 500      # beim Durchsuchen regelmäßig an andere Tasks abgeben
+LAST_ONLINE_FILE = "data/autorole_last_online.txt"  # Unix-Zeit, zuletzt online gesehen
+HEARTBEAT_MINUTES = 5
+
 # -------------------------
 # Hilfsfunktionen für JSON-Handling
 # -------------------------
 def load_guild_settings(guild_id: int):
-    """Lädt die Einstellungen für eine bestimmte Guild."""
-    settings = {}
-    if os.path.exists(GUILD_SETTINGS_FILE):
-        try:
-            all_settings = json.load(open(GUILD_SETTINGS_FILE, "r", encoding="utf-8"))
-            settings = all_settings.get(str(guild_id), {})
-        except Exception:
-            pass
-    return settings
+    """Lädt die Einstellungen für eine bestimmte Guild (gecacht bis zur nächsten Änderung)."""
+    return get_guild_settings_cached(guild_id)
+
+
+def load_last_online():
+    """Zeitpunkt, zu dem der Bot zuletzt online war (UTC) – None, wenn unbekannt."""
+    try:
+        with open(LAST_ONLINE_FILE, "r", encoding="utf-8") as f:
+            return datetime.fromtimestamp(int(f.read().strip()), timezone.utc)
+    except (FileNotFoundError, ValueError, OSError):
+        return None
+
+
+def save_last_online():
+    tmp_path = LAST_ONLINE_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(str(int(time.time())))
+    os.replace(tmp_path, LAST_ONLINE_FILE)
 
 
 # =============================================
@@ -32,6 +51,30 @@ def load_guild_settings(guild_id: int):
 class AutoRole(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.router = get_log_router(bot)
+        self.role_queue = get_role_queue(bot)
+        self._reconcile_task = None
+        self.reconcile_status = {}  # guild_id → Fortschritt des letzten Abgleichs
+        # Vor dem ersten Heartbeat lesen – das ist das Ende der Downtime-Lücke
+        self.last_online = load_last_online()
+        self.heartbeat.start()
+
+    def cog_unload(self):
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+        self.heartbeat.cancel()
+        save_last_online()
+
+    # -------------------------------------------------
+    # 💓 Letzten Online-Zeitpunkt festhalten
+    # -------------------------------------------------
+    @tasks.loop(minutes=HEARTBEAT_MINUTES)
+    async def heartbeat(self):
+        save_last_online()
+
+    @heartbeat.before_loop
+    async def before_heartbeat(self):
+        await self.bot.wait_until_ready()
 
     # -------------------------------------------------
     # 🔆 Einheitliches goldenes Log-Embed
@@ -52,58 +95,146 @@ class AutoRole(commands.Cog):
 
     async def send_log(self, guild_id: int, embed, join_log=False):
         """Sendet das Embed in den passenden Log-Kanal der Guild."""
-        guild_settings = load_guild_settings(guild_id)
-        channel_id = guild_settings.get("JOIN_LOG_CHANNEL_ID" if join_log else "LOG_CHANNEL_ID")
-        if not channel_id:
-            return
-        channel = self.bot.get_guild(guild_id).get_channel(channel_id)
-        if channel:
-            await channel.send(embed=embed)
+        await self.router.send(guild_id, embed, kind="join" if join_log else "log")
 
     # -------------------------------------------------
     # 🪪 Automatische Rollenvergabe beim Beitritt
     # -------------------------------------------------
+    # Die eigentliche Vergabe übernimmt der MemberJoinPipeline-Cog (member_join.py),
+    # damit Auto-Rollen und wiederhergestellte Rollen in einem Edit landen.
+    def auto_role_ids(self, guild_settings: dict):
+        """Konfigurierte AUTO_ROLE_IDS der Guild."""
+        return guild_settings.get("AUTO_ROLE_IDS", [])
+
+    def create_join_log(self, member: discord.Member, roles):
+        role_names = ", ".join([r.name for r in roles])
+        print(f"✅ {member} hat automatisch Rollen erhalten: {role_names}")
+        return self.create_embed(
+            "🆕 Neuer Beitritt – Rollen vergeben",
+            f"{member.mention} hat automatisch folgende Rollen erhalten:",
+            discord.Color.gold(),
+            member,
+            field_name="Vergebene Rollen",
+            field_value=role_names
+        )
+
+    # -------------------------------------------------
+    # 🔄 Abgleich nach dem Start (Beitritte während der Downtime)
+    # -------------------------------------------------
     @commands.Cog.listener()
-    async def on_member_join(self, member: discord.Member):
-        if member.bot:
-            return
+    async def on_ready(self):
+        # on_ready kann bei Reconnects mehrfach kommen – nur einmal abgleichen
+        if self._reconcile_task is None:
+            self._reconcile_task = asyncio.create_task(self.reconcile_all())
 
-        guild_settings = load_guild_settings(member.guild.id)
-        AUTO_ROLE_IDS = guild_settings.get("AUTO_ROLE_IDS", [])
-        if not AUTO_ROLE_IDS:
+    async def reconcile_all(self):
+        if self.last_online is None:
+            logger.info("🔄 Auto-Rollen-Abgleich übersprungen: kein letzter Online-Zeitpunkt bekannt.")
             return
+        for guild in list(self.bot.guilds):
+            try:
+                await self.reconcile_guild(guild, since=self.last_online)
+            except Exception as e:
+                logger.error(f"❌ Auto-Rollen-Abgleich für {guild.name} fehlgeschlagen: {e}")
 
-        roles = [member.guild.get_role(rid) for rid in AUTO_ROLE_IDS]
-        roles = [r for r in roles if r is not None]
+    async def reconcile_guild(self, guild: discord.Guild, since: datetime = None):
+        """Vergibt fehlende Auto-Rollen (gedrosselt über die Rollen-Queue).
 
-        if not roles:
+        Mit since nur an Mitglieder, die danach beigetreten sind – also während
+        der Downtime. Ohne since an alle Mitglieder; das würde auch bewusst
+        entfernte Auto-Rollen zurückgeben und läuft deshalb nur per /autorole_sync.
+        """
+        wanted = {}
+        for rid in self.auto_role_ids(load_guild_settings(guild.id)):
+            role = guild.get_role(rid)
+            if role and role.is_assignable():
+                wanted[rid] = role
+        if not wanted:
             return
+        wanted_ids = set(wanted)
 
-        try:
-            await member.add_roles(*roles, reason="Automatische Rollenvergabe beim Beitritt")
-            role_names = ", ".join([r.name for r in roles])
+        status = self.reconcile_status[guild.id] = {"checked": 0, "queued": 0, "done": 0, "failed": 0, "finished": False}
+        if not guild.chunked:
+            await guild.chunk()
+
+        futures = set()  # submit() führt Aufträge pro Mitglied zusammen → jedes Future nur einmal zählen
+        for i, member in enumerate(guild.members, start=1):
+            status["checked"] = i
+            if i % RECONCILE_YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+            if member.bot:
+                continue
+            if since is not None and (member.joined_at is None or member.joined_at <= since):
+                continue
+            missing = wanted_ids - {r.id for r in member.roles}
+            if missing:
+                futures.add(self.role_queue.submit(
+                    member, [wanted[rid] for rid in missing], reason="Auto-Rollen nachträglich vergeben"
+                ))
+        status["queued"] = len(futures)
+        if futures:
+            logger.info(f"🔄 Auto-Rollen-Abgleich {guild.name}: {len(futures)} Mitglieder ohne Auto-Rollen gefunden.")
+
+        for future in asyncio.as_completed(futures):
+            added, rejected = await future
+            status["done"] += 1
+            if rejected:
+                status["failed"] += 1
+            if status["done"] % RECONCILE_PROGRESS_EVERY == 0:
+                logger.info(f"🔄 Auto-Rollen-Abgleich {guild.name}: {status['done']}/{status['queued']}")
+        status["finished"] = True
+
+        if futures:
+            scope = f"Beitritte seit {format_berlin(since)}" if since is not None else "alle Mitglieder"
             embed = self.create_embed(
-                "🆕 Neuer Beitritt – Rollen vergeben",
-                f"{member.mention} hat automatisch folgende Rollen erhalten:",
+                "🔄 Auto-Rollen abgeglichen",
+                f"**Umfang:** {scope}\n"
+                f"**Geprüft:** {status['checked']} Mitglieder\n"
+                f"**Nachträglich vergeben:** {status['done'] - status['failed']}\n"
+                f"**Fehlgeschlagen:** {status['failed']}",
                 discord.Color.gold(),
-                member,
-                field_name="Vergebene Rollen",
-                field_value=role_names
             )
-            await self.send_log(member.guild.id, embed, join_log=True)
-            print(f"✅ {member} hat automatisch Rollen erhalten: {role_names}")
-        except discord.Forbidden:
-            print(f"⚠️ Keine Berechtigung, um Rollen an {member} zu vergeben.")
+            await self.send_log(guild.id, embed, join_log=True)
+
+    # -------------------------------------------------
+    # 📊 Slash Command: Abgleich starten / Status
+    # -------------------------------------------------
+    @app_commands.command(name="autorole_sync", description="Zeigt den Fortschritt des Auto-Rollen-Abgleichs bzw. gleicht alle Mitglieder ab (Admin/Support).")
+    @app_commands.describe(alle_mitglieder="Fehlende Auto-Rollen an ALLE Mitglieder vergeben – auch an solche, denen sie bewusst entzogen wurden")
+    async def autorole_sync(self, interaction: discord.Interaction, alle_mitglieder: bool = False):
+        if not self.is_team_member(interaction.user):
+            await interaction.response.send_message("❌ Du hast keine Berechtigung für diesen Befehl.", ephemeral=True)
+            return
+
+        status = self.reconcile_status.get(interaction.guild.id)
+        if status and not status["finished"]:
+            await interaction.response.send_message(
+                f"⏳ Abgleich läuft: {status['checked']} geprüft, {status['done']}/{status['queued']} vergeben, "
+                f"{status['failed']} fehlgeschlagen.",
+                ephemeral=True,
+            )
+            return
+
+        if not alle_mitglieder:
+            if status:
+                text = (f"✅ Letzter Abgleich: {status['checked']} geprüft, {status['done'] - status['failed']} vergeben, "
+                        f"{status['failed']} fehlgeschlagen.")
+            else:
+                text = "ℹ️ Seit dem Start lief noch kein Abgleich."
+            await interaction.response.send_message(
+                text + "\nMit `alle_mitglieder: True` werden fehlende Auto-Rollen an alle Mitglieder vergeben.",
+                ephemeral=True,
+            )
+            return
+
+        asyncio.create_task(self.reconcile_guild(interaction.guild))
+        await interaction.response.send_message("🔄 Abgleich der Auto-Rollen für alle Mitglieder gestartet.", ephemeral=True)
 
     # -------------------------------------------------
     # 🛡️ Prüfen ob Admin oder Support
     # -------------------------------------------------
     def is_team_member(self, member: discord.Member):
-        guild_settings = load_guild_settings(member.guild.id)
-        ADMIN_ROLE_IDS = guild_settings.get("ADMIN_ROLE_IDS", [])
-        SUPPORT_ROLE_IDS = guild_settings.get("SUPPORT_ROLE_IDS", [])
-        team_roles = set(ADMIN_ROLE_IDS + SUPPORT_ROLE_IDS)
-        return any(role.id in team_roles for role in member.roles) or member.guild_permissions.administrator
+        return is_authorized(member, "support")
 
     # -------------------------------------------------
     # ➕ Slash Command: Rolle hinzufügen
@@ -5,6 +5,7 @@ from discord.ui import Modal, TextInput
 import aiohttp
 import os, json
 from datetime import datetime
+from utils.permissions import is_authorized
 
 DATA_FILE = "data/entschaedigungen.json"
 ABSTIMMUNGEN_FILE = "data/abstimmungen.json"
@@ -234,9 +235,7 @@ class Entschaedigt(commands.Cog):
 
     @app_commands.command(name="entschädigt", description="Reicht eine Entschädigungsanfrage ein (Team only).")
     async def entschädigt(self, interaction: discord.Interaction):
-        guild_id = interaction.guild.id
-        admin_roles = get_guild_setting(guild_id, "ADMIN_ROLE_IDS", [])
-        if not any(r.id in admin_roles for r in interaction.user.roles) and not interaction.user.guild_permissions.administrator:
+        if not is_authorized(interaction.user, "admin"):
             await interaction.response.send_message("❌ Du hast keine Berechtigung.", ephemeral=True)
             return
         await interaction.response.send_modal(EntschaedigtModal(self.bot))
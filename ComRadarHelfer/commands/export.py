@@ -0,0 +1,26 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from utils.export import EXPORTERS, send_export
+
+
+# =============================================
+# 📤 Daten-Export (CSV / XLSX)
+# =============================================
+class Export(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="export", description="📤 Exportiert Daten dieses Servers als CSV oder XLSX.")
+    @app_commands.describe(bereich="Welche Daten exportiert werden", format="Dateiformat (Standard: CSV)")
+    @app_commands.choices(
+        bereich=[app_commands.Choice(name=title, value=domain) for domain, (title, *_) in EXPORTERS.items()],
+        format=[app_commands.Choice(name="CSV", value="csv"), app_commands.Choice(name="Excel (XLSX)", value="xlsx")],
+    )
+    async def export_daten(self, interaction: discord.Interaction, bereich: app_commands.Choice[str],
+                           format: app_commands.Choice[str] = None):
+        await send_export(interaction, bereich.value, format.value if format else "csv")
+
+
+async def setup(bot):
+    await bot.add_cog(Export(bot))
@@ -4,17 +4,18 @@ from discord.ext import commands, tasks
 from discord.ui import Modal, TextInput
 from utils.permissions import has_permission, logger
 from utils.guild_config import load_settings
+from utils.persistent_views import get_view_registry, persistent_view
+from utils.timeparse import BERLIN_TZ, parse_when
 import json
 import os
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from datetime import datetime, timedelta
 import random
 
 # =============================================
 # 📂 Einstellungen & Konstanten
 # =============================================
 DATA_FILE = "data/giveaways.json"
-BERLIN_TZ = ZoneInfo("Europe/Berlin")  # Automatische Sommer-/Winterzeit
+MIN_DURATION = timedelta(minutes=1)
 
 
 # =============================================
@@ -34,31 +35,23 @@ def save_giveaways(data):
         json.dump(data, f, indent=4)
 
 
-def parse_datetime(dt_str):
-    """Erwartet Format TT.MM.JJJJ HH:MM"""
-    try:
-        dt = datetime.strptime(dt_str, "%d.%m.%Y %H:%M")
-        return dt.replace(tzinfo=BERLIN_TZ)
-    except ValueError:
-        return None
-
-
 # =============================================
 # 🎉 Giveaway Modal
 # =============================================
 class GiveawayModal(Modal, title="🎁 Neues Giveaway erstellen"):
     preis = TextInput(label="🎁 Preis", placeholder="z.B. Discord Nitro oder Amazon-Gutschein")
     gewinner = TextInput(label="🏆 Anzahl Gewinner", placeholder="z.B. 2", default="1")
-    endzeit = TextInput(label="⏰ Endzeit (TT.MM.JJJJ HH:MM)", placeholder="z.B. 15.10.2025 20:30")
+    endzeit = TextInput(label="⏰ Endzeit (TT.MM.JJJJ HH:MM oder Dauer)", placeholder="z.B. 15.10.2025 20:30, 24.12. 18:00 oder 3d")
 
     async def on_submit(self, interaction: discord.Interaction):
         if not has_permission(interaction.user):
             await interaction.response.send_message("❌ Du hast keine Berechtigung.", ephemeral=True)
             return
 
-        end_dt = parse_datetime(self.endzeit.value)
-        if not end_dt:
-            await interaction.response.send_message("❌ Falsches Datumsformat. Bitte TT.MM.JJJJ HH:MM verwenden.", ephemeral=True)
+        try:
+            end_dt = parse_when(self.endzeit.value, minimum=MIN_DURATION)
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
             return
 
         # Channel dynamisch aus JSON laden
@@ -86,8 +79,7 @@ class GiveawayModal(Modal, title="🎁 Neues Giveaway erstellen"):
         )
         embed.set_footer(text=f"Endet am {end_dt.strftime('%d.%m.%Y um %H:%M Uhr (MEZ/MESZ)')}")
 
-        view = GiveawayView(self.preis.value, int(self.gewinner.value), end_dt)
-        msg = await channel.send(embed=embed, view=view)
+        msg = await channel.send(embed=embed, view=persistent_view(GiveawayJoinButton()))
 
         data = load_giveaways()
         data[str(msg.id)] = {
@@ -105,17 +97,17 @@ class GiveawayModal(Modal, title="🎁 Neues Giveaway erstellen"):
 
 
 # =============================================
-# 🎟️ Giveaway View
+# 🎟️ Teilnehmen-Button (persistent, Zustand per Nachrichten-ID)
 # =============================================
-class GiveawayView(discord.ui.View):
-    def __init__(self, preis, gewinner, end_dt):
-        super().__init__(timeout=None)
-        self.preis = preis
-        self.gewinner = gewinner
-        self.end_dt = end_dt
-
-    @discord.ui.button(label="🎉 Teilnehmen", style=discord.ButtonStyle.success)
-    async def join(self, interaction: discord.Interaction, button: discord.ui.Button):
+class GiveawayJoinButton(discord.ui.DynamicItem[discord.ui.Button], template=r"giveaway:join"):
+    def __init__(self):
+        super().__init__(discord.ui.Button(label="🎉 Teilnehmen", style=discord.ButtonStyle.success, custom_id="giveaway:join"))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls()
+
+    async def callback(self, interaction: discord.Interaction):
         data = load_giveaways()
         giveaway = data.get(str(interaction.message.id))
 
@@ -140,10 +132,12 @@ class GiveawayView(discord.ui.View):
 class GiveawayCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        get_view_registry(bot).register(self.qualified_name, GiveawayJoinButton)
         self.check_giveaways.start()
 
     def cog_unload(self):
         self.check_giveaways.cancel()
+        get_view_registry(self.bot).unregister(self.qualified_name)
 
     # -----------------------------------------
     # /giveaway starten
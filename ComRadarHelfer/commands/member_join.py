@@ -0,0 +1,184 @@
+# =============================================
+# 📂 Einstellungen & Konstanten
+# =============================================
+import discord
+from discord.ext import commands, tasks
+import time
+from collections import deque
+from datetime import datetime
+from utils.guild_config import get_guild_settings_cached
+from utils.log_router import get_log_router
+from utils.permissions import logger
+from utils.role_queue import get_role_queue
+from utils.roles import assignable_roles
+
+RAID_JOIN_THRESHOLD = 10     # Beitritte im Zeitfenster, ab denen eine Beitrittswelle erkannt wird
+RAID_JOIN_WINDOW = 10        # Zeitfenster in Sekunden
+RAID_COOLDOWN = 60           # so lange nach dem letzten "Welle"-Beitritt bleibt der Modus aktiv
+RAID_SUMMARY_INTERVAL = 15   # Sekunden zwischen zwei Sammel-Logs während einer Welle
+
+
+# =============================================
+# 🚨 Erkennung von Beitrittswellen
+# =============================================
+class JoinSpikeDetector:
+    """Zählt Beitritte pro Guild in einem gleitenden Zeitfenster."""
+
+    def __init__(self):
+        self._joins = {}       # guild_id → deque der Zeitpunkte
+        self._raid_until = {}  # guild_id → Ende des Wellen-Modus
+
+    def register(self, guild_id: int, settings: dict) -> bool:
+        """Registriert einen Beitritt. Gibt True zurück, wenn dadurch eine Welle beginnt."""
+        threshold = settings.get("RAID_JOIN_THRESHOLD", RAID_JOIN_THRESHOLD)
+        window = settings.get("RAID_JOIN_WINDOW", RAID_JOIN_WINDOW)
+        now = time.monotonic()
+        joins = self._joins.setdefault(guild_id, deque())
+        joins.append(now)
+        while joins and now - joins[0] > window:
+            joins.popleft()
+
+        if len(joins) < threshold:
+            return False
+        started = not self.active(guild_id)
+        self._raid_until[guild_id] = now + RAID_COOLDOWN
+        return started
+
+    def active(self, guild_id: int) -> bool:
+        return self._raid_until.get(guild_id, 0) > time.monotonic()
+
+    def tracked_guilds(self):
+        return list(self._raid_until)
+
+    def forget(self, guild_id: int):
+        self._raid_until.pop(guild_id, None)
+
+
+# =============================================
+# 🚪 MemberJoinPipeline Cog
+# =============================================
+class MemberJoinPipeline(commands.Cog):
+    """Verarbeitet jeden Beitritt in einem Durchlauf.
+
+    Statt dass AuditLogger, AutoRole und AutoRoleRestore jeweils selbst auf
+    on_member_join reagieren (dreimal Settings lesen, mehrere Rollen-Edits),
+    werden Settings einmal gelesen, Auto-Rollen und wiederhergestellte Rollen
+    gemeinsam über die Rollen-Queue vergeben und die Logs gebündelt. Während
+    einer Beitrittswelle gibt es statt einzelner Join-Logs nur Sammel-Logs.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.router = get_log_router(bot)
+        self.role_queue = get_role_queue(bot)
+        self.spikes = JoinSpikeDetector()
+        self._raid_joins = {}  # guild_id → Liste der Beitritte seit dem letzten Sammel-Log
+        self.flush_raid_logs.start()
+
+    def cog_unload(self):
+        self.flush_raid_logs.cancel()
+
+    # -------------------------------------------------
+    # 👋 Beitritt
+    # -------------------------------------------------
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        guild = member.guild
+        settings = get_guild_settings_cached(guild.id)
+
+        audit = self.bot.get_cog("AuditLogger")
+        autorole = self.bot.get_cog("AutoRole")
+        restore = self.bot.get_cog("AutoRoleRestore")
+
+        auto_ids = autorole.auto_role_ids(settings) if autorole and not member.bot else []
+        backup_ids = restore.take_backup(member, settings) if restore else []
+        roles, skipped = assignable_roles(member, list(auto_ids) + list(backup_ids))
+
+        if self.spikes.register(guild.id, settings):
+            logger.warning(f"🚨 Beitrittswelle auf {guild.name} erkannt – Join-Logs werden gebündelt.")
+            await self.router.send(guild.id, self._raid_embed(
+                "🚨 Beitrittswelle erkannt",
+                "Ungewöhnlich viele Beitritte – Join-Logs werden ab jetzt gesammelt "
+                f"(alle {RAID_SUMMARY_INTERVAL}s) und Rollen gedrosselt vergeben.",
+                discord.Color.red(),
+            ), kind="join")
+
+        reason = "Automatische Rollenvergabe beim Beitritt"
+        if backup_ids:
+            reason = "Rollen automatisch wiederhergestellt" if not auto_ids else reason + " / Wiederherstellung"
+
+        # 🚨 Degradierter Modus: nur sammeln, Rollen im Hintergrund vergeben
+        if self.spikes.active(guild.id):
+            self._raid_joins.setdefault(guild.id, []).append(
+                (member.id, str(member), member.created_at.strftime("%d.%m.%Y %H:%M"))
+            )
+            if roles:
+                self.role_queue.submit(member, roles, reason)
+            return
+
+        join_embed = audit.build_join_embed(member) if audit else None
+        if join_embed:
+            await self.router.send(guild.id, join_embed, kind="join")
+
+        if not roles:
+            return
+        added, rejected = await self.role_queue.submit(member, roles, reason)
+
+        auto_set, backup_set = set(auto_ids), set(backup_ids)
+        auto_added = [r for r in added if r.id in auto_set]
+        if autorole and auto_added:
+            await self.router.send(guild.id, autorole.create_join_log(member, auto_added), kind="join")
+        if any(r.id in auto_set for r in rejected):
+            print(f"⚠️ Keine Berechtigung, um Rollen an {member} zu vergeben.")
+
+        restored = [r for r in added if r.id in backup_set]
+        if restore and restored:
+            not_restored = [r.name for r in rejected if r.id in backup_set]
+            not_restored += [f"`{rid}` ({grund})" for rid, grund in skipped if rid in backup_set]
+            await self.router.send(guild.id, restore.create_restore_log(member, restored, not_restored), kind="join")
+
+    # -------------------------------------------------
+    # 📦 Sammel-Logs während einer Beitrittswelle
+    # -------------------------------------------------
+    def _raid_embed(self, title, description, color):
+        embed = discord.Embed(title=title, description=description, color=color, timestamp=datetime.utcnow())
+        embed.set_footer(text="📜 ComRadar Logsystem")
+        return embed
+
+    @tasks.loop(seconds=RAID_SUMMARY_INTERVAL)
+    async def flush_raid_logs(self):
+        for guild_id in list(self._raid_joins):
+            joins = self._raid_joins.pop(guild_id)
+            if not joins:
+                continue
+            mentions = " ".join(f"<@{uid}>" for uid, _, _ in joins)
+            if len(mentions) > 3500:
+                mentions = mentions[:3500].rsplit(" ", 1)[0] + " …"
+            embed = self._raid_embed(
+                f"👥 {len(joins)} Beitritte (Beitrittswelle)",
+                mentions,
+                discord.Color.orange(),
+            )
+            embed.add_field(name="Rollen in Warteschlange", value=str(self.role_queue.pending(guild_id)), inline=True)
+            transcript = "\n".join(f"{uid}\t{name}\tAccount erstellt: {created}" for uid, name, created in joins)
+            await self.router.send(guild_id, embed, kind="join", transcript=(f"beitritte_{guild_id}", transcript))
+
+        for guild_id in self.spikes.tracked_guilds():
+            if not self.spikes.active(guild_id) and guild_id not in self._raid_joins:
+                self.spikes.forget(guild_id)
+                await self.router.send(guild_id, self._raid_embed(
+                    "✅ Beitrittswelle vorbei",
+                    "Join-Logs werden wieder einzeln versendet.",
+                    discord.Color.green(),
+                ), kind="join")
+
+    @flush_raid_logs.before_loop
+    async def before_flush(self):
+        await self.bot.wait_until_ready()
+
+
+# -------------------------------------------------
+# ⚙️ Setup-Funktion für das Cog
+# -------------------------------------------------
+async def setup(bot):
+    await bot.add_cog(MemberJoinPipeline(bot))
@@ -1,14 +1,24 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import asyncio
 import json
 import os
+import re
+import time
 from dotenv import load_dotenv
+from utils.deadline_queue import get_deadline_queue
+from utils.log_router import get_log_router
+from utils.mod_cases import get_case_store
+from utils.permissions import is_authorized
+from utils.timeparse import format_duration, parse_duration
 load_dotenv()
 
-DATA_FILE = "data/modactions.json"
 GUILD_SETTINGS_FILE = "data/guild_settings.json"
+TEMPBAN_MIN_DURATION = timedelta(minutes=5)
+TIMEOUT_MAX_DURATION = timedelta(days=28)  # Discord-Limit für Timeouts
+WARN_MIN_DURATION = timedelta(hours=1)
 
 # ---------------------------
 # Hilfsfunktionen
@@ -27,28 +37,8 @@ def get_guild_setting(guild_id: int, key: str, default=None):
     guild_data = load_guild_settings().get(str(guild_id), {})
     return guild_data.get(key, default)
 
-def load_data():
-    if not os.path.exists(DATA_FILE):
-        return {}
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def save_data(data):
-    os.makedirs("data", exist_ok=True)
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
-
-def add_modlog_entry(user_id: int, action: str, moderator_id: int, reason: str, duration: str = None):
-    data = load_data()
-    entry = {
-        "action": action,
-        "reason": reason,
-        "moderator": moderator_id,
-        "timestamp": datetime.utcnow().isoformat(),
-        "duration": duration
-    }
-    data.setdefault(str(user_id), []).append(entry)
-    save_data(data)
+def add_modlog_entry(guild_id: int, user_id: int, action: str, moderator_id: int, reason: str, duration: str = None):
+    return get_case_store().add_case(guild_id, user_id, action, moderator_id, reason, duration)
 
 async def log_action(guild: discord.Guild, title: str, description: str):
     log_channel_id = get_guild_setting(guild.id, "LOG_CHANNEL_ID")
@@ -59,9 +49,173 @@ async def log_action(guild: discord.Guild, title: str, description: str):
             await channel.send(embed=embed)
 
 def has_mod_permissions(interaction: discord.Interaction) -> bool:
-    guild_id = interaction.guild.id
-    admin_roles = get_guild_setting(guild_id, "MOD_ROLE_IDS", [])
-    return any(r.id in admin_roles for r in interaction.user.roles) or interaction.user.guild_permissions.administrator
+    return is_authorized(interaction.user, "mod")
+
+# ---------------------------
+# Massenban
+# ---------------------------
+MASSBAN_LIMIT = 200        # höchstens so viele Benutzer pro Aufruf
+MASSBAN_CONCURRENCY = 4    # gleichzeitige Ban-Requests
+MASSBAN_RETRY_DELAY = 5.0
+USER_ID_PATTERN = re.compile(r"\d{15,20}")
+
+def massban_targets(interaction: discord.Interaction, user_ids: str = None, minuten: int = None):
+    """Sammelt die Ziel-IDs. Gibt (ids, übersprungen) zurück – übersprungen als (id, Grund)."""
+    guild = interaction.guild
+    ids = []
+    if user_ids:
+        ids.extend(int(x) for x in USER_ID_PATTERN.findall(user_ids))
+    if minuten:
+        since = datetime.now(timezone.utc) - timedelta(minutes=minuten)
+        ids.extend(m.id for m in guild.members if not m.bot and m.joined_at and m.joined_at >= since)
+
+    targets, skipped = [], []
+    for user_id in dict.fromkeys(ids):
+        member = guild.get_member(user_id)
+        if user_id in (interaction.user.id, guild.me.id, guild.owner_id):
+            skipped.append((user_id, "geschützt"))
+        elif member and (member.top_role >= guild.me.top_role or
+                         (interaction.user.id != guild.owner_id and member.top_role >= interaction.user.top_role)):
+            skipped.append((user_id, "Rolle zu hoch"))
+        else:
+            targets.append(user_id)
+    return targets, skipped
+
+async def ban_many(guild: discord.Guild, user_ids, reason: str):
+    """Bannt mehrere Benutzer mit begrenzter Parallelität. Gibt (gebannt, fehlgeschlagen) zurück."""
+    semaphore = asyncio.Semaphore(MASSBAN_CONCURRENCY)
+
+    async def ban_one(user_id: int):
+        async with semaphore:
+            for attempt in range(2):
+                try:
+                    await guild.ban(discord.Object(id=user_id), reason=reason, delete_message_seconds=0)
+                    return user_id, None
+                except discord.NotFound:
+                    return user_id, "unbekannt"
+                except discord.Forbidden:
+                    return user_id, "keine Berechtigung"
+                except discord.HTTPException as e:
+                    if (e.status == 429 or e.status >= 500) and attempt == 0:
+                        await asyncio.sleep(MASSBAN_RETRY_DELAY)
+                        continue
+                    return user_id, f"HTTP {e.status}"
+
+    results = await asyncio.gather(*(ban_one(uid) for uid in user_ids))
+    banned = [uid for uid, error in results if error is None]
+    failed = [(uid, error) for uid, error in results if error is not None]
+    return banned, failed
+
+
+class MassbanConfirmView(discord.ui.View):
+    def __init__(self, owner_id: int):
+        super().__init__(timeout=60)
+        self.owner_id = owner_id
+        self.confirmed = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.owner_id
+
+    @discord.ui.button(label="Bannen", style=discord.ButtonStyle.danger)
+    async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.confirmed = True
+        await interaction.response.edit_message(content="⏳ Bans werden ausgeführt …", view=None)
+        self.stop()
+
+    @discord.ui.button(label="Abbrechen", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.confirmed = False
+        await interaction.response.edit_message(content="❌ Abgebrochen.", view=None)
+        self.stop()
+
+# ---------------------------
+# Termine: Tempban-Ende & ablaufende Verwarnungen
+# ---------------------------
+async def expire_tempban(bot, item: dict):
+    guild = bot.get_guild(int(item["guild"]))
+    if guild is None:
+        return  # Bot nicht mehr auf dem Server
+    user_id = int(item["key"])
+    try:
+        await guild.unban(discord.Object(id=user_id), reason="Tempban abgelaufen")
+    except discord.NotFound:
+        return  # bereits manuell entbannt
+    add_modlog_entry(guild.id, user_id, "Unban", bot.user.id, "Tempban abgelaufen")
+    await log_action(guild, "✅ Tempban abgelaufen", f"<@{user_id}> wurde automatisch entbannt.")
+
+async def expire_warn(bot, item: dict):
+    if get_case_store().expire_case(int(item["guild"]), item["payload"]["case"]):
+        guild = bot.get_guild(int(item["guild"]))
+        if guild:
+            await log_action(guild, "⌛ Verwarnung abgelaufen",
+                             f"Verwarnung #{item['payload']['case']} von <@{item['payload']['user']}> ist abgelaufen.")
+
+# ---------------------------
+# Modlog-Ansicht (seitenweise)
+# ---------------------------
+MODLOG_PAGE_SIZE = 5
+
+def build_modlog_embed(user: discord.abc.User, cases: list, page_no: int, total: int) -> discord.Embed:
+    embed = discord.Embed(
+        title=f"📋 Modlog: {user}",
+        description=f"{user.mention} (`{user.id}`)",
+        color=discord.Color.gold(),
+        timestamp=datetime.utcnow()
+    )
+    if not cases:
+        embed.description += "\n\nℹ️ Keine Einträge gefunden."
+    for case in cases:
+        try:
+            when = f"<t:{int(datetime.fromisoformat(case['timestamp']).replace(tzinfo=timezone.utc).timestamp())}:f>"
+        except (TypeError, ValueError):
+            when = case.get("timestamp") or "Unbekannt"
+        value = f"**Grund:** {case.get('reason') or '—'}\n**Von:** <@{case.get('moderator')}> • {when}"
+        if case.get("duration"):
+            value += f"\n**Dauer:** {case['duration']}"
+        embed.add_field(name=f"#{case['id']} • {case['action']}", value=value[:1024], inline=False)
+    pages = max(1, -(-total // MODLOG_PAGE_SIZE))
+    embed.set_footer(text=f"Seite {page_no}/{pages} • {total} Einträge")
+    return embed
+
+
+class ModlogView(discord.ui.View):
+    """Blättert durch die Historie. Jede Seite wird erst beim Klick geladen (Cursor = Fall-ID)."""
+
+    def __init__(self, owner_id: int, guild_id: int, user: discord.abc.User, next_cursor):
+        super().__init__(timeout=300)
+        self.owner_id = owner_id
+        self.guild_id = guild_id
+        self.user = user
+        self.cursors = [None]   # Cursor der bisher besuchten Seiten
+        self.next_cursor = next_cursor
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.newer.disabled = len(self.cursors) <= 1
+        self.older.disabled = self.next_cursor is None
+
+    async def _show(self, interaction: discord.Interaction):
+        store = get_case_store()
+        cases, self.next_cursor = store.page(self.guild_id, self.user.id, self.cursors[-1], MODLOG_PAGE_SIZE)
+        self._update_buttons()
+        total = store.count(self.guild_id, self.user.id)
+        await interaction.response.edit_message(embed=build_modlog_embed(self.user, cases, len(self.cursors), total), view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.owner_id:
+            await interaction.response.send_message("❌ Nur wer den Befehl ausgeführt hat, kann blättern.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="◀️ Neuere", style=discord.ButtonStyle.secondary)
+    async def newer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.cursors.pop()
+        await self._show(interaction)
+
+    @discord.ui.button(label="Ältere ▶️", style=discord.ButtonStyle.secondary)
+    async def older(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.cursors.append(self.next_cursor)
+        await self._show(interaction)
 
 # ---------------------------
 # Moderations-Cog
@@ -69,20 +223,30 @@ def has_mod_permissions(interaction: discord.Interaction) -> bool:
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.deadlines = get_deadline_queue(bot)
+
+    async def cog_load(self):
+        self.deadlines.register("unban", expire_tempban)
+        self.deadlines.register("warn_expire", expire_warn)
 
     # Timeout Command
     @app_commands.command(name="timeout", description="Setzt einen Benutzer für eine bestimmte Zeit auf Timeout.")
-    async def timeout(self, interaction: discord.Interaction, member: discord.Member, stunden: int, grund: str):
+    @app_commands.describe(dauer="z.B. 30m, 12h, 2d (höchstens 28 Tage)")
+    async def timeout(self, interaction: discord.Interaction, member: discord.Member, dauer: str, grund: str):
         if not has_mod_permissions(interaction):
             return await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
-        
-        until = datetime.utcnow() + timedelta(hours=stunden)
-        await member.timeout(until, reason=grund)
-        add_modlog_entry(member.id, "Timeout", interaction.user.id, grund, f"{stunden} Stunden")
+        try:
+            duration = parse_duration(dauer, maximum=TIMEOUT_MAX_DURATION)
+        except ValueError as e:
+            return await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        dauer_text = format_duration(duration)
+
+        await member.timeout(duration, reason=grund)
+        add_modlog_entry(interaction.guild.id, member.id, "Timeout", interaction.user.id, grund, dauer_text)
 
         embed = discord.Embed(title="⏱️ Timeout", color=discord.Color.orange(), timestamp=datetime.utcnow())
         embed.add_field(name="Benutzer", value=member.mention, inline=True)
-        embed.add_field(name="Dauer", value=f"{stunden} Stunden", inline=True)
+        embed.add_field(name="Dauer", value=dauer_text, inline=True)
         embed.add_field(name="Grund", value=grund, inline=False)
         embed.set_footer(text=f"Von {interaction.user}")
         await interaction.response.send_message(embed=embed)
@@ -95,7 +259,7 @@ class Moderation(commands.Cog):
             return await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
 
         await member.kick(reason=grund)
-        add_modlog_entry(member.id, "Kick", interaction.user.id, grund)
+        add_modlog_entry(interaction.guild.id, member.id, "Kick", interaction.user.id, grund)
 
         embed = discord.Embed(title="👢 Kick", color=discord.Color.red(), timestamp=datetime.utcnow())
         embed.add_field(name="Benutzer", value=member.mention, inline=True)
@@ -111,7 +275,7 @@ class Moderation(commands.Cog):
             return await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
 
         await member.ban(reason=grund)
-        add_modlog_entry(member.id, "Ban", interaction.user.id, grund)
+        add_modlog_entry(interaction.guild.id, member.id, "Ban", interaction.user.id, grund)
 
         embed = discord.Embed(title="⛔ Ban", color=discord.Color.dark_red(), timestamp=datetime.utcnow())
         embed.add_field(name="Benutzer", value=member.mention, inline=True)
@@ -120,6 +284,80 @@ class Moderation(commands.Cog):
         await interaction.response.send_message(embed=embed)
         await log_action(interaction.guild, "⛔ Ban", f"{member.mention} wurde von {interaction.user.mention} gebannt.")
 
+    # Tempban Command
+    @app_commands.command(name="tempban", description="Bannt einen Benutzer für eine bestimmte Zeit.")
+    @app_commands.describe(dauer="z.B. 12h, 3d, 1w oder 1d12h")
+    async def tempban(self, interaction: discord.Interaction, member: discord.Member, dauer: str, grund: str):
+        if not has_mod_permissions(interaction):
+            return await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
+        try:
+            duration = parse_duration(dauer, minimum=TEMPBAN_MIN_DURATION)
+        except ValueError as e:
+            return await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        dauer_text = format_duration(duration)
+
+        await member.ban(reason=f"{grund} (Tempban {dauer_text})")
+        add_modlog_entry(interaction.guild.id, member.id, "Tempban", interaction.user.id, grund, dauer_text)
+        due = time.time() + duration.total_seconds()
+        self.deadlines.schedule("unban", interaction.guild.id, due, key=member.id)
+
+        embed = discord.Embed(title="⏳ Tempban", color=discord.Color.dark_red(), timestamp=datetime.utcnow())
+        embed.add_field(name="Benutzer", value=member.mention, inline=True)
+        embed.add_field(name="Entbannung", value=f"<t:{int(due)}:R>", inline=True)
+        embed.add_field(name="Grund", value=grund, inline=False)
+        embed.set_footer(text=f"Von {interaction.user}")
+        await interaction.response.send_message(embed=embed)
+        await log_action(interaction.guild, "⏳ Tempban", f"{member.mention} wurde von {interaction.user.mention} für {dauer_text} gebannt.")
+
+    # Massenban Command
+    @app_commands.command(name="massban", description="Bannt mehrere Benutzer auf einmal (IDs oder zuletzt beigetreten).")
+    @app_commands.describe(
+        user_ids="Benutzer-IDs, getrennt durch Leerzeichen oder Kommas",
+        minuten="Alle Mitglieder, die in den letzten N Minuten beigetreten sind"
+    )
+    async def massban(self, interaction: discord.Interaction, grund: str, user_ids: str = None, minuten: int = None):
+        if not has_mod_permissions(interaction):
+            return await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
+        if not user_ids and not minuten:
+            return await interaction.response.send_message("❌ Bitte `user_ids` oder `minuten` angeben.", ephemeral=True)
+
+        targets, skipped = massban_targets(interaction, user_ids, minuten)
+        if not targets:
+            return await interaction.response.send_message("ℹ️ Keine passenden Benutzer gefunden.", ephemeral=True)
+        if len(targets) > MASSBAN_LIMIT:
+            return await interaction.response.send_message(
+                f"❌ Zu viele Ziele ({len(targets)}). Maximal {MASSBAN_LIMIT} pro Aufruf.", ephemeral=True)
+
+        view = MassbanConfirmView(interaction.user.id)
+        preview = ", ".join(f"<@{uid}>" for uid in targets[:20]) + (" …" if len(targets) > 20 else "")
+        await interaction.response.send_message(
+            f"⚠️ **{len(targets)}** Benutzer bannen?\n{preview}", view=view, ephemeral=True)
+        timed_out = await view.wait()
+        if timed_out:
+            await interaction.edit_original_response(content="⌛ Abgebrochen (Zeitüberschreitung).", view=None)
+            return
+        if not view.confirmed:
+            return
+
+        banned, failed = await ban_many(interaction.guild, targets, f"Massenban: {grund}")
+        # Ein laufender Tempban würde den neuen, dauerhaften Ban sonst wieder aufheben
+        for uid in banned:
+            self.deadlines.cancel("unban", interaction.guild.id, uid)
+        get_case_store().add_cases(interaction.guild.id, banned, "Ban", interaction.user.id, grund, massban=True)
+
+        embed = discord.Embed(title="⛔ Massenban", color=discord.Color.dark_red(), timestamp=datetime.utcnow())
+        embed.add_field(name="Gebannt", value=str(len(banned)), inline=True)
+        embed.add_field(name="Fehlgeschlagen", value=str(len(failed)), inline=True)
+        embed.add_field(name="Übersprungen", value=str(len(skipped)), inline=True)
+        embed.add_field(name="Grund", value=grund, inline=False)
+        embed.set_footer(text=f"Von {interaction.user}")
+
+        lines = [f"{uid}\tgebannt" for uid in banned]
+        lines += [f"{uid}\tfehlgeschlagen ({error})" for uid, error in failed]
+        lines += [f"{uid}\tübersprungen ({reason})" for uid, reason in skipped]
+        await get_log_router(self.bot).send(interaction.guild.id, embed, transcript=(f"massenban_{interaction.guild.id}", "\n".join(lines)))
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
     # Unban Command
     @app_commands.command(name="unban", description="Entbannt einen Benutzer anhand seiner ID.")
     async def unban(self, interaction: discord.Interaction, user_id: str):
@@ -128,7 +366,8 @@ class Moderation(commands.Cog):
 
         user = await self.bot.fetch_user(int(user_id))
         await interaction.guild.unban(user)
-        add_modlog_entry(user.id, "Unban", interaction.user.id, "Manuell entbannt")
+        self.deadlines.cancel("unban", interaction.guild.id, user.id)
+        add_modlog_entry(interaction.guild.id, user.id, "Unban", interaction.user.id, "Manuell entbannt")
 
         embed = discord.Embed(title="✅ Unban", description=f"{user.mention} wurde entbannt.", color=discord.Color.green())
         embed.timestamp = datetime.utcnow()
@@ -138,25 +377,33 @@ class Moderation(commands.Cog):
 
     # Warnsystem
     @app_commands.command(name="warn", description="Verwarnt einen Benutzer und speichert die Verwarnung.")
-    async def warn(self, interaction: discord.Interaction, member: discord.Member, grund: str):
+    @app_commands.describe(ablauf="Optional: Verwarnung läuft nach dieser Dauer ab, z.B. 30d oder 2w")
+    async def warn(self, interaction: discord.Interaction, member: discord.Member, grund: str, ablauf: str = None):
         if not has_mod_permissions(interaction):
             return await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
+        duration = None
+        if ablauf:
+            try:
+                duration = parse_duration(ablauf, minimum=WARN_MIN_DURATION)
+            except ValueError as e:
+                return await interaction.response.send_message(f"❌ {e}", ephemeral=True)
 
-        data = load_data()
-        entry = {
-            "action": "Warn",
-            "reason": grund,
-            "moderator": interaction.user.id,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        data.setdefault(str(member.id), []).append(entry)
-        save_data(data)
+        store = get_case_store()
+        store.claim_legacy(interaction.guild.id, member.id)
+        case = add_modlog_entry(interaction.guild.id, member.id, "Warn", interaction.user.id, grund,
+                                format_duration(duration) if duration else None)
+        warnings = store.count(interaction.guild.id, member.id, "Warn")
 
-        warnings = len([a for a in data[str(member.id)] if a["action"] == "Warn"])
+        description = f"{member.mention} wurde verwarnt.\n**Grund:** {grund}\n**Verwarnungen:** {warnings}"
+        if duration:
+            due = time.time() + duration.total_seconds()
+            self.deadlines.schedule("warn_expire", interaction.guild.id, due,
+                                    payload={"case": case["id"], "user": member.id}, key=f"{member.id}:{case['id']}")
+            description += f"\n**Läuft ab:** <t:{int(due)}:R>"
 
         embed = discord.Embed(
             title="⚠️ Verwarnung ausgesprochen",
-            description=f"{member.mention} wurde verwarnt.\n**Grund:** {grund}\n**Verwarnungen:** {warnings}",
+            description=description,
             color=discord.Color.orange(),
             timestamp=datetime.utcnow()
         )
@@ -167,15 +414,15 @@ class Moderation(commands.Cog):
         if warnings == 3:
             until = datetime.utcnow() + timedelta(hours=24)
             await member.timeout(until, reason="Automatischer 24h-Mute nach 3 Verwarnungen.")
-            add_modlog_entry(member.id, "Auto-Mute (24h)", interaction.user.id, "3 Verwarnungen erreicht", "24 Stunden")
+            add_modlog_entry(interaction.guild.id, member.id, "Auto-Mute (24h)", interaction.user.id, "3 Verwarnungen erreicht", "24 Stunden")
             await log_action(interaction.guild, "⏱️ Automatischer Mute", f"{member.mention} wurde automatisch für 24h gemutet (3 Verwarnungen).")
         elif warnings == 4:
             await member.kick(reason="Automatischer Kick nach 4 Verwarnungen.")
-            add_modlog_entry(member.id, "Auto-Kick", interaction.user.id, "4 Verwarnungen erreicht")
+            add_modlog_entry(interaction.guild.id, member.id, "Auto-Kick", interaction.user.id, "4 Verwarnungen erreicht")
             await log_action(interaction.guild, "🚫 Automatischer Kick", f"{member.mention} wurde automatisch gekickt (4 Verwarnungen).")
         elif warnings >= 5:
             await member.ban(reason="Automatischer Ban nach 5 Verwarnungen.")
-            add_modlog_entry(member.id, "Auto-Ban", interaction.user.id, "5 Verwarnungen erreicht")
+            add_modlog_entry(interaction.guild.id, member.id, "Auto-Ban", interaction.user.id, "5 Verwarnungen erreicht")
             await log_action(interaction.guild, "⛔ Automatischer Ban", f"{member.mention} wurde automatisch gebannt (5 Verwarnungen).")
 
     # Verwarnungen löschen
@@ -184,12 +431,12 @@ class Moderation(commands.Cog):
         if not has_mod_permissions(interaction):
             return await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
 
-        data = load_data()
-        if str(member.id) in data:
-            before = len(data[str(member.id)])
-            data[str(member.id)] = [a for a in data[str(member.id)] if a["action"] != "Warn"]
-            after = len(data[str(member.id)])
-            save_data(data)
+        store = get_case_store()
+        store.claim_legacy(interaction.guild.id, member.id)
+        before = store.count(interaction.guild.id, member.id)
+        if before:
+            store.delete_action(interaction.guild.id, member.id, "Warn")
+            after = store.count(interaction.guild.id, member.id)
 
             embed = discord.Embed(
                 title="🧹 Verwarnungen gelöscht",
@@ -202,5 +449,21 @@ class Moderation(commands.Cog):
         else:
             await interaction.response.send_message("ℹ️ Keine Verwarnungen gefunden.", ephemeral=True)
 
+    # Modlog anzeigen
+    @app_commands.command(name="modlog", description="Zeigt die Moderations-Historie eines Benutzers.")
+    async def modlog(self, interaction: discord.Interaction, benutzer: discord.User):
+        if not has_mod_permissions(interaction):
+            return await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
+
+        store = get_case_store()
+        store.claim_legacy(interaction.guild.id, benutzer.id)
+        cases, next_cursor = store.page(interaction.guild.id, benutzer.id, None, MODLOG_PAGE_SIZE)
+        total = store.count(interaction.guild.id, benutzer.id)
+        embed = build_modlog_embed(benutzer, cases, 1, total)
+        if next_cursor is None:
+            return await interaction.response.send_message(embed=embed, ephemeral=True)
+        view = ModlogView(interaction.user.id, interaction.guild.id, benutzer, next_cursor)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
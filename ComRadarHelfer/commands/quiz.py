@@ -4,19 +4,27 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-import json, os, random
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+import asyncio
+import csv
+import io
+import json, os, random, time as clock
+from datetime import datetime, timedelta, time
+from utils.persistent_views import get_view_registry, persistent_view
+from utils.permissions import has_permission
+from utils.quiz_analytics import MIN_ANSWERS_FOR_RANKING
+from utils.quiz_pool import get_quiz_pool, parse_question
+from utils.quiz_state import get_quiz_state
+from utils.timeparse import BERLIN_TZ
 
 DATA_DIR = "data"
 os.makedirs(DATA_DIR, exist_ok=True)
 
-QUESTIONS_FILE = os.path.join(DATA_DIR, "quizfragen.json")
-POOL_FILE = os.path.join(DATA_DIR, "quizpool.json")
-ANSWERS_FILE = os.path.join(DATA_DIR, "quiz_answers.json")
-SCORES_FILE = os.path.join(DATA_DIR, "quiz_scores.json")
+SCHEDULE_FILE = os.path.join(DATA_DIR, "quiz_schedule.json")  # letzte Läufe für das Nachholen
+SNAPSHOT_MINUTES = 5   # so oft werden Antworten & Punkte komplett gespeichert
 GUILD_FILE = os.path.join(DATA_DIR, "guild_settings.json")
-BERLIN_TZ = ZoneInfo("Europe/Berlin")
+QUIZ_TIME = time(hour=0, minute=0, tzinfo=BERLIN_TZ)
+QUIZ_CONCURRENCY = 5    # so viele Guilds werden gleichzeitig bedient
+CATCHUP_MAX_DAYS = 3    # Tagesgewinner werden höchstens so weit rückwirkend gezogen
 
 # =============================================
 # 🔧 Hilfsfunktionen
@@ -31,51 +39,61 @@ def save_json(path, data):
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=4)
 
+def berlin_day(offset: int = 0) -> str:
+    """Datum (YYYY-MM-DD) in deutscher Zeit – unabhängig von der Server-Zeitzone."""
+    return (datetime.now(BERLIN_TZ) + timedelta(days=offset)).strftime("%Y-%m-%d")
+
 def get_quiz_channel(bot, guild_id):
     guilds = load_json(GUILD_FILE)
     channel_id = guilds.get(str(guild_id), {}).get("QUIZ_CHANNEL_ID")
     return bot.get_channel(channel_id) if channel_id else None
 
 # =============================================
-# 🎟️ Antwort-Buttons
+# 🎟️ Antwort-Buttons (persistent: Datum, Guild und Option stecken in der custom_id)
 # =============================================
-class QuizAnswerButton(discord.ui.Button):
-    def __init__(self, label, option, date, guild_id):
-        super().__init__(label=label, style=discord.ButtonStyle.primary)
-        self.option = option
+class QuizAnswerButton(discord.ui.DynamicItem[discord.ui.Button],
+                       template=r"quiz:answer:(?P<date>[0-9-]+):(?P<guild>[0-9]+):(?P<idx>[0-9]+)"):
+    def __init__(self, date, guild_id, index):
+        super().__init__(discord.ui.Button(
+            label=chr(65 + index), style=discord.ButtonStyle.primary,
+            custom_id=f"quiz:answer:{date}:{guild_id}:{index}"
+        ))
         self.date = date
         self.guild_id = guild_id
+        self.index = index
 
-    async def callback(self, interaction: discord.Interaction):
-        user_id = str(interaction.user.id)
-        answers = load_json(ANSWERS_FILE)
-        scores = load_json(SCORES_FILE)
-        today_data = answers.setdefault(self.date, {}).setdefault(str(self.guild_id), {})
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["date"], int(match["guild"]), int(match["idx"]))
 
-        if user_id in today_data:
+    async def callback(self, interaction: discord.Interaction):
+        state = get_quiz_state()
+        if state.has_answered(self.date, self.guild_id, interaction.user.id):
             await interaction.response.send_message("⚠️ Du hast heute schon geantwortet!", ephemeral=True)
             return
 
-        questions = load_json(QUESTIONS_FILE)
-        question_info = questions[self.date][str(self.guild_id)]
+        question_info = state.question(self.date, self.guild_id)
+        if not question_info or self.index >= len(question_info["optionen"]):
+            await interaction.response.send_message("⚠️ Diese Quizfrage ist nicht mehr verfügbar.", ephemeral=True)
+            return
+        option = question_info["optionen"][self.index]
         correct_answer = question_info["korrekt"]
         loesung = question_info.get("loesung", "Keine Begründung angegeben.")
-        is_correct = (self.option == correct_answer)
-
-        today_data[user_id] = {"antwort": self.option, "richtig": is_correct}
-        save_json(ANSWERS_FILE, answers)
-
-        # Punkte speichern
-        guild_scores = scores.setdefault(str(self.guild_id), {})
-        if is_correct:
-            guild_scores[user_id] = guild_scores.get(user_id, 0) + 1
-            save_json(SCORES_FILE, scores)
+        is_correct = (option == correct_answer)
+
+        # Antwort & Punkt nur im Speicher + Journal-Zeile
+        posted_at = question_info.get("posted_at")
+        state.record_answer(
+            self.date, self.guild_id, interaction.user.id, option, is_correct,
+            question_id=question_info.get("id"), index=self.index,
+            seconds=clock.time() - posted_at if posted_at else None,
+        )
 
         # Immer Embed mit richtiger Antwort + Begründung (ephemeral)
         embed = discord.Embed(
             title="✅ Richtige Antwort!" if is_correct else "❌ Falsche Antwort!",
             description=(
-                f"**Deine Antwort:** {self.option}\n"
+                f"**Deine Antwort:** {option}\n"
                 f"**Richtige Antwort:** {correct_answer}\n"
                 f"🧠 **Begründung:** {loesung}"
             ),
@@ -83,11 +101,8 @@ class QuizAnswerButton(discord.ui.Button):
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
-class QuizAnswerView(discord.ui.View):
-    def __init__(self, date, options, guild_id):
-        super().__init__(timeout=None)
-        for i, opt in enumerate(options):
-            self.add_item(QuizAnswerButton(chr(65+i), opt, date, guild_id))
+def quiz_answer_view(date, options, guild_id) -> discord.ui.View:
+    return persistent_view(*(QuizAnswerButton(date, guild_id, i) for i in range(len(options))))
 
 # =============================================
 # 🎯 Haupt-Cog
@@ -95,44 +110,76 @@ class QuizAnswerView(discord.ui.View):
 class DailyQuiz(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.daily_question_task.start()
-        self.daily_winner_task.start()
+        self.state = get_quiz_state()
+        get_view_registry(bot).register(self.qualified_name, QuizAnswerButton)
+        self.daily_task.start()
+        self.snapshot_task.start()
 
     def cog_unload(self):
-        self.daily_question_task.cancel()
-        self.daily_winner_task.cancel()
+        self.daily_task.cancel()
+        self.snapshot_task.cancel()
+        self.state.snapshot()
+        get_view_registry(self.bot).unregister(self.qualified_name)
+
+    # -----------------------------------------
+    # 💾 Antworten & Punkte regelmäßig komplett speichern
+    # -----------------------------------------
+    @tasks.loop(minutes=SNAPSHOT_MINUTES)
+    async def snapshot_task(self):
+        self.state.snapshot()
 
     # -----------------------------------------
-    # 🕛 Jeden Tag automatisch neue Frage posten
+    # 🕛 Täglich um Mitternacht (deutsche Zeit): Gewinner ziehen, neue Frage posten
     # -----------------------------------------
-    @tasks.loop(minutes=1)
-    async def daily_question_task(self):
-        now = datetime.now(BERLIN_TZ)
-        if now.hour == 0 and now.minute == 0:
-            for guild_id in load_json(GUILD_FILE).keys():
-                await self.post_daily_question(int(guild_id))
+    @tasks.loop(time=QUIZ_TIME)
+    async def daily_task(self):
+        await self.run_daily(berlin_day())
+
+    @daily_task.before_loop
+    async def before_daily(self):
+        await self.bot.wait_until_ready()
+        # Läufe nachholen, die während einer Downtime verpasst wurden
+        today = berlin_day()
+        if load_json(SCHEDULE_FILE).get("last_run") != today:
+            await self.run_daily(today)
+
+    async def run_daily(self, today: str):
+        schedule = load_json(SCHEDULE_FILE)
+        last_run = schedule.get("last_run")
+        # Ohne bekannten letzten Lauf (erster Start) wird nichts rückwirkend gezogen
+        for offset in range(CATCHUP_MAX_DAYS, 0, -1):
+            day = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=offset)).strftime("%Y-%m-%d")
+            if last_run is not None and day >= last_run:
+                await self.for_all_guilds(self.announce_winner, day)
+        await self.for_all_guilds(self.post_daily_question)
+        save_json(SCHEDULE_FILE, {"last_run": today})
+
+    async def for_all_guilds(self, func, *args):
+        """Führt func(guild_id, *args) für alle Guilds parallel aus (begrenzt)."""
+        semaphore = asyncio.Semaphore(QUIZ_CONCURRENCY)
+
+        async def run(guild_id):
+            async with semaphore:
+                try:
+                    await func(int(guild_id), *args)
+                except Exception as e:
+                    print(f"[Quiz] Fehler in {func.__name__} für Guild {guild_id}: {e}")
+
+        await asyncio.gather(*(run(guild_id) for guild_id in load_json(GUILD_FILE).keys()))
 
     async def post_daily_question(self, guild_id: int, category: str = None):
-        pool = load_json(POOL_FILE)
-        used = load_json(QUESTIONS_FILE)
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = berlin_day()
 
-        used.setdefault(today, {})
-        if str(guild_id) in used[today]:
+        if self.state.question(today, guild_id):
             return
 
-        # 🔹 Kategorie filtern
-        available = {k:v for k,v in pool.items() if (not category or v.get("kategorie")==category)}
-        if not available:
+        # 🔹 Nächste Frage aus dem Stapel der Guild (pro Kategorie)
+        question_id, question_data = get_quiz_pool().draw(guild_id, category)
+        if not question_data:
             return
 
-        key = random.choice(list(available.keys()))
-        question_data = available[key]
-        pool.pop(key)
-        save_json(POOL_FILE, pool)
-
-        used[today][str(guild_id)] = question_data
-        save_json(QUESTIONS_FILE, used)
+        question_data = dict(question_data, id=question_id, posted_at=clock.time())
+        self.state.set_question(today, guild_id, question_data)
 
         channel = get_quiz_channel(self.bot, guild_id)
         if not channel:
@@ -142,12 +189,12 @@ class DailyQuiz(commands.Cog):
         options = question_data["optionen"]
 
         embed = discord.Embed(
-            title=f"🎉 Quiz für {datetime.now().strftime('%d.%m.%Y')}",
+            title=f"🎉 Quiz für {datetime.now(BERLIN_TZ).strftime('%d.%m.%Y')}",
             description=f"**{question}**\n\n" + "\n".join([f"{chr(65+i)}️⃣ {opt}" for i,opt in enumerate(options)]),
             color=discord.Color.gold()
         )
         embed.set_footer(text="Wähle die richtige Antwort! Du hast nur einen Versuch.")
-        await channel.send(embed=embed, view=QuizAnswerView(today, options, guild_id))
+        await channel.send(embed=embed, view=quiz_answer_view(today, options, guild_id))
 
     # -----------------------------------------
     # /quiz_post – Admin kann Kategorie wählen
@@ -169,7 +216,8 @@ class DailyQuiz(commands.Cog):
         option_c="Antwort C",
         korrekt="Welche Antwort ist korrekt? (A, B oder C)",
         loesung="Begründung oder Erklärung zur richtigen Antwort",
-        kategorie="Kategorie der Frage (z.B. Adventsquiz, Sommerquiz, Filmquiz)"
+        kategorie="Kategorie der Frage (z.B. Adventsquiz, Sommerquiz, Filmquiz)",
+        schwierigkeit="leicht, mittel oder schwer (Standard: mittel)"
     )
     async def add_question(
         self,
@@ -180,24 +228,24 @@ class DailyQuiz(commands.Cog):
         option_c: str,
         korrekt: str,
         loesung: str,
-        kategorie: str
+        kategorie: str,
+        schwierigkeit: str = "mittel"
     ):
         korrekt = korrekt.strip().upper()
         if korrekt not in ["A","B","C"]:
             await interaction.response.send_message("❌ Bitte gib A, B oder C als richtige Antwort an!", ephemeral=True)
             return
 
-        pool = load_json(POOL_FILE)
-        new_id = str(len(pool)+1)
-        korrekte_option = {"A": option_a, "B": option_b, "C": option_c}[korrekt]
-        pool[new_id] = {
-            "frage": frage,
-            "optionen": [option_a, option_b, option_c],
-            "korrekt": korrekte_option,
-            "loesung": loesung,
-            "kategorie": kategorie
-        }
-        save_json(POOL_FILE, pool)
+        try:
+            question = parse_question({
+                "frage": frage, "option_a": option_a, "option_b": option_b, "option_c": option_c,
+                "korrekt": korrekt, "loesung": loesung, "kategorie": kategorie, "schwierigkeit": schwierigkeit,
+            })
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            return
+        get_quiz_pool().add(question)
+        korrekte_option = question["korrekt"]
 
         embed = discord.Embed(
             title="✅ Neue Frage hinzugefügt",
@@ -206,72 +254,185 @@ class DailyQuiz(commands.Cog):
                 f"A️⃣ {option_a}\nB️⃣ {option_b}\nC️⃣ {option_c}\n"
                 f"✅ **Korrekte Antwort:** {korrekte_option}\n"
                 f"🧠 **Begründung:** {loesung}\n"
-                f"📂 **Kategorie:** {kategorie}"
+                f"📂 **Kategorie:** {kategorie}\n"
+                f"📊 **Schwierigkeit:** {question['schwierigkeit']}"
             ),
             color=discord.Color.green()
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     # -----------------------------------------
-    # 🕛 Täglicher Gewinner wird automatisch gezogen
+    # 📥 Fragen-Sets importieren (CSV/JSON)
     # -----------------------------------------
-    @tasks.loop(minutes=1)
-    async def daily_winner_task(self):
-        now = datetime.now(BERLIN_TZ)
-        if now.hour == 0 and now.minute == 0:
-            yesterday = (now - timedelta(days=1)).strftime("%Y-%m-%d")
-            answers = load_json(ANSWERS_FILE)
-            scores = load_json(SCORES_FILE)
-
-            for guild_id in load_json(GUILD_FILE).keys():
-                guild_answers = answers.get(yesterday, {}).get(guild_id, {})
-                if not guild_answers:
-                    continue
-
-                correct_users = [uid for uid, info in guild_answers.items() if info["richtig"]]
-                channel = get_quiz_channel(self.bot, int(guild_id))
-                if not channel:
-                    continue
-
-                if not correct_users:
-                    await channel.send(f"❌ Kein Gewinner für den {yesterday} – niemand hatte die richtige Antwort!")
-                    continue
-
-                winner_id = random.choice(correct_users)
-                winner = channel.guild.get_member(int(winner_id))
-                await channel.send(f"🏆 **Tagesgewinner ({yesterday})** ist {winner.mention}! Glückwunsch 🎉")
-
-                # Punkte zählen
-                guild_scores = scores.setdefault(guild_id, {})
-                for uid in correct_users:
-                    guild_scores[uid] = guild_scores.get(uid,0)+1
-                save_json(SCORES_FILE, scores)
+    @app_commands.command(name="quiz_import", description="Importiert Quizfragen aus einer CSV- oder JSON-Datei.")
+    @app_commands.describe(datei="CSV (frage, option_a, option_b, option_c, korrekt, loesung, kategorie, schwierigkeit) oder JSON")
+    async def import_questions(self, interaction: discord.Interaction, datei: discord.Attachment):
+        if not has_permission(interaction.user):
+            await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
+            return
+        if not datei.filename.lower().endswith((".csv", ".json")):
+            await interaction.response.send_message("❌ Bitte eine .csv- oder .json-Datei anhängen.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            imported, errors = get_quiz_pool().import_questions(datei.filename, await datei.read())
+        except (ValueError, csv.Error) as e:  # inkl. UnicodeDecodeError / JSONDecodeError
+            await interaction.followup.send(f"❌ Datei konnte nicht gelesen werden: {e}", ephemeral=True)
+            return
+
+        text = f"✅ **{imported}** Fragen importiert."
+        if errors:
+            text += f"\n⚠️ {len(errors)} übersprungen:\n" + "\n".join(errors[:10])
+            if len(errors) > 10:
+                text += f"\n… und {len(errors) - 10} weitere"
+        await interaction.followup.send(text, ephemeral=True)
+
+    # -----------------------------------------
+    # 🏆 Tagesgewinner eines Tages ziehen
+    # -----------------------------------------
+    async def announce_winner(self, guild_id: int, day: str):
+        guild_answers = self.state.answers(day, guild_id)
+        if not guild_answers:
+            return
+
+        correct_users = [uid for uid, info in guild_answers.items() if info["richtig"]]
+        channel = get_quiz_channel(self.bot, guild_id)
+        if not channel:
+            return
+
+        if not correct_users:
+            await channel.send(f"❌ Kein Gewinner für den {day} – niemand hatte die richtige Antwort!")
+            return
+
+        winner_id = random.choice(correct_users)
+        winner = channel.guild.get_member(int(winner_id))
+        await channel.send(f"🏆 **Tagesgewinner ({day})** ist {winner.mention if winner else f'<@{winner_id}>'}! Glückwunsch 🎉")
+
+        # Punkte zählen
+        self.state.add_points(guild_id, correct_users)
 
     # -----------------------------------------
     # /quiz_end – Gesamtsieger
     # -----------------------------------------
     @app_commands.command(name="quiz_end", description="Beendet das Quiz und ermittelt den Gesamtsieger.")
-    async def end_quiz(self, interaction: discord.Interaction):
-        scores = load_json(SCORES_FILE).get(str(interaction.guild.id), {})
-        if not scores:
+    @app_commands.describe(neue_saison="Punkte archivieren und eine neue Saison starten")
+    async def end_quiz(self, interaction: discord.Interaction, neue_saison: bool = False):
+        if not has_permission(interaction.user):
+            await interaction.response.send_message("❌ Du hast keine Berechtigung.", ephemeral=True)
+            return
+        winners, max_points = self.state.leaderboard(interaction.guild.id).leaders()
+        if not winners:
             await interaction.response.send_message("❌ Keine Teilnehmer gefunden!", ephemeral=True)
             return
 
-        max_points = max(scores.values())
-        winners = [uid for uid, pts in scores.items() if pts==max_points]
         final_winner = random.choice(winners) if len(winners)>1 else winners[0]
         member = interaction.guild.get_member(int(final_winner))
 
         embed = discord.Embed(
             title="🏁 Quiz-Gesamtsieger",
-            description=f"🎉 {member.mention} hat das Quiz gewonnen!\nPunkte: **{max_points}**",
+            description=f"🎉 {member.mention if member else f'<@{final_winner}>'} hat das Quiz gewonnen!\nPunkte: **{max_points}**",
             color=discord.Color.green()
         )
+        if neue_saison:
+            season = self.state.end_season(interaction.guild.id, final_winner)
+            embed.set_footer(text=f"Saison {season['saison']} archiviert – die Punkte starten neu.")
         await interaction.response.send_message(embed=embed)
         channel = get_quiz_channel(self.bot, interaction.guild.id)
         if channel:
             await channel.send(embed=embed)
 
+    # -----------------------------------------
+    # 📈 /quiz_stats – Auswertung pro Frage
+    # -----------------------------------------
+    @app_commands.command(name="quiz_stats", description="Zeigt, welche Quizfragen leicht oder schwer sind (Admin).")
+    @app_commands.describe(frage_id="Nur eine bestimmte Frage anzeigen", export="Alle Werte als CSV-Datei anhängen")
+    async def quiz_stats(self, interaction: discord.Interaction, frage_id: str = None, export: bool = False):
+        if not has_permission(interaction.user):
+            await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
+            return
+
+        analytics = self.state.analytics
+        questions = get_quiz_pool().questions
+        embed = discord.Embed(title="📈 Quiz-Auswertung", color=discord.Color.blurple())
+
+        if frage_id:
+            stats = analytics.summary(frage_id)
+            if not stats:
+                await interaction.response.send_message("ℹ️ Für diese Frage gibt es noch keine Daten.", ephemeral=True)
+                return
+            question = questions.get(frage_id, {})
+            options = question.get("optionen", [])
+            embed.description = f"**#{frage_id}:** {question.get('frage', 'Unbekannte Frage')}"
+            embed.add_field(name="Gestellt", value=str(stats["asked"]), inline=True)
+            embed.add_field(name="Antworten", value=str(stats["answers"]), inline=True)
+            embed.add_field(name="Richtig", value="—" if stats["rate"] is None else f"{stats['rate']:.0%}", inline=True)
+            if stats["avg_time"] is not None:
+                embed.add_field(name="Antwortzeit", value=(
+                    f"Ø {stats['avg_time']:.0f}s (min {stats['min_time']:.0f}s / max {stats['max_time']:.0f}s)"
+                ), inline=False)
+            total = stats["answers"] or 1
+            embed.add_field(name="Verteilung", value="\n".join(
+                f"{chr(65 + i)}️⃣ {options[i] if i < len(options) else '?'} – {stats['options'].get(i, 0)} "
+                f"({stats['options'].get(i, 0) / total:.0%})"
+                for i in range(max(len(options), max(stats["options"], default=-1) + 1))
+            ) or "—", inline=False)
+        else:
+            ranked = analytics.ranked()
+            def fmt(items):
+                return "\n".join(f"#{qid} – {rate:.0%} richtig: {questions.get(qid, {}).get('frage', '?')[:60]}"
+                                 for qid, rate in items) or "—"
+            embed.add_field(name="🔴 Am schwersten", value=fmt(ranked[:5]), inline=False)
+            embed.add_field(name="🟢 Am leichtesten", value=fmt(reversed(ranked[-5:])), inline=False)
+            embed.set_footer(text=f"{len(analytics.data)} Fragen mit Daten • Rangliste ab {MIN_ANSWERS_FOR_RANKING} Antworten")
+
+        file = None
+        if export:
+            csv_text = analytics.to_csv(questions)
+            file = discord.File(io.BytesIO(csv_text.encode("utf-8-sig")), filename="quiz_auswertung.csv")
+        if file:
+            await interaction.response.send_message(embed=embed, file=file, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    # -----------------------------------------
+    # 📊 /quiz_top & /quiz_rank – Rangliste
+    # -----------------------------------------
+    @app_commands.command(name="quiz_top", description="Zeigt die Quiz-Rangliste der aktuellen Saison.")
+    @app_commands.describe(anzahl="Wie viele Plätze angezeigt werden (max. 25)")
+    async def quiz_top(self, interaction: discord.Interaction, anzahl: int = 10):
+        board = self.state.leaderboard(interaction.guild.id)
+        top = board.top(max(1, min(anzahl, 25)))
+        if not top:
+            await interaction.response.send_message("❌ Noch keine Punkte in dieser Saison.", ephemeral=True)
+            return
+
+        medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+        lines = []
+        for uid, points in top:
+            rank = board.rank(uid)
+            lines.append(f"{medals.get(rank, f'**{rank}.**')} <@{uid}> – {points} Punkte")
+        embed = discord.Embed(
+            title="🏆 Quiz-Rangliste",
+            description="\n".join(lines),
+            color=discord.Color.gold()
+        )
+        embed.set_footer(text=f"Saison {len(self.state.seasons(interaction.guild.id)) + 1} • {len(board)} Teilnehmer")
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="quiz_rank", description="Zeigt deinen Platz (oder den eines anderen) in der Quiz-Rangliste.")
+    async def quiz_rank(self, interaction: discord.Interaction, benutzer: discord.Member = None):
+        benutzer = benutzer or interaction.user
+        board = self.state.leaderboard(interaction.guild.id)
+        rank = board.rank(str(benutzer.id))
+        if rank is None:
+            await interaction.response.send_message(f"ℹ️ {benutzer.mention} hat in dieser Saison noch keine Punkte.", ephemeral=True)
+            return
+        await interaction.response.send_message(
+            f"📊 {benutzer.mention} ist auf **Platz {rank}** von {len(board)} mit **{board.points[str(benutzer.id)]}** Punkten.",
+            ephemeral=True
+        )
+
 # -----------------------------------------
 # ⚙️ Setup
 # -----------------------------------------
@@ -6,6 +6,7 @@ import io
 import json
 import os
 from datetime import datetime
+from utils.persistent_views import get_view_registry, persistent_view
 
 # -------------------------------
 # Dateien & Ordner
@@ -81,7 +82,7 @@ async def create_ticket_channel(interaction: discord.Interaction, ticket_type: s
     )
     embed.set_footer(text=f"Erstellt am {datetime.now().strftime('%d.%m.%Y um %H:%M Uhr')}")
 
-    await channel.send(embed=embed, view=CloseTicketView(interaction.user.id))
+    await channel.send(embed=embed, view=persistent_view(CloseTicketButton(interaction.user.id)))
 
     # Ticket-Log
     log_channel = guild.get_channel(ticket_log_id)
@@ -119,19 +120,24 @@ async def create_admin_thread(interaction, ticket_type, fields, ticket_channel,
     admin_embed.add_field(name="📌 Status", value="🟢 Offen", inline=False)
     admin_embed.set_footer(text="ScammerHilfe-Thread für Teammitglieder")
 
-    view = StatusControlView(admin_embed)
+    view = persistent_view(*(StatusButton(key) for key in TICKET_STATUSES))
     await thread.send(content=f"{admin_role.mention}" if admin_role else None, embed=admin_embed, view=view)
 
 # -------------------------------
-# Ticket schließen
+# Ticket schließen (persistent, Ersteller steckt in der custom_id)
 # -------------------------------
-class CloseTicketView(View):
+class CloseTicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r"ticket:close:(?P<author>[0-9]+)"):
     def __init__(self, author_id: int):
-        super().__init__(timeout=None)
+        super().__init__(discord.ui.Button(
+            label="✅ Ticket schließen", style=discord.ButtonStyle.danger, custom_id=f"ticket:close:{author_id}"
+        ))
         self.author_id = author_id
 
-    @discord.ui.button(label="✅ Ticket schließen", style=discord.ButtonStyle.danger)
-    async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["author"]))
+
+    async def callback(self, interaction: discord.Interaction):
         if interaction.user.id != self.author_id and not interaction.user.guild_permissions.manage_channels:
             await interaction.response.send_message("❌ Du darfst dieses Ticket nicht schließen.", ephemeral=True)
             return
@@ -190,26 +196,33 @@ class CloseTicketView(View):
         await interaction.channel.delete()
 
 # -------------------------------
-# Status-Buttons
+# Status-Buttons (persistent, Embed kommt aus der Nachricht selbst)
 # -------------------------------
-class StatusControlView(View):
-    def __init__(self, embed: discord.Embed):
-        super().__init__(timeout=None)
-        self.embed = embed
-
-    async def update_status(self, interaction, text, color):
-        self.embed.set_field_at(1, name="📌 Status", value=text, inline=False)
-        self.embed.color = color
-        await interaction.response.edit_message(embed=self.embed, view=self)
-
-    @discord.ui.button(label="🟢 Offen", style=discord.ButtonStyle.secondary)
-    async def open_status(self, interaction, button): await self.update_status(interaction, "🟢 Offen", discord.Color.green())
-    @discord.ui.button(label="💰 Entschädigt", style=discord.ButtonStyle.success)
-    async def refunded_status(self, interaction, button): await self.update_status(interaction, "💰 Entschädigt", discord.Color.teal())
-    @discord.ui.button(label="❌ Abgelehnt", style=discord.ButtonStyle.danger)
-    async def denied_status(self, interaction, button): await self.update_status(interaction, "❌ Abgelehnt", discord.Color.red())
-    @discord.ui.button(label="⏰ Keine Rückmeldung", style=discord.ButtonStyle.primary)
-    async def no_response_status(self, interaction, button): await self.update_status(interaction, "⏰ Keine Rückmeldung", discord.Color.orange())
+TICKET_STATUSES = {
+    "open":        ("🟢 Offen", discord.ButtonStyle.secondary, discord.Color.green),
+    "refunded":    ("💰 Entschädigt", discord.ButtonStyle.success, discord.Color.teal),
+    "denied":      ("❌ Abgelehnt", discord.ButtonStyle.danger, discord.Color.red),
+    "no_response": ("⏰ Keine Rückmeldung", discord.ButtonStyle.primary, discord.Color.orange),
+}
+
+class StatusButton(discord.ui.DynamicItem[discord.ui.Button], template=r"ticket:status:(?P<key>[a-z_]+)"):
+    def __init__(self, key: str):
+        label, style, _ = TICKET_STATUSES[key]
+        super().__init__(discord.ui.Button(label=label, style=style, custom_id=f"ticket:status:{key}"))
+        self.key = key
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        if match["key"] not in TICKET_STATUSES:
+            raise ValueError(f"Unbekannter Ticket-Status: {match['key']}")
+        return cls(match["key"])
+
+    async def callback(self, interaction: discord.Interaction):
+        text, _, color = TICKET_STATUSES[self.key]
+        embed = interaction.message.embeds[0]
+        embed.set_field_at(1, name="📌 Status", value=text, inline=False)
+        embed.color = color()
+        await interaction.response.edit_message(embed=embed)
 
 # -------------------------------
 # TicketSystem Cog
@@ -217,6 +230,10 @@ class StatusControlView(View):
 class TicketSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        get_view_registry(bot).register(self.qualified_name, CloseTicketButton, StatusButton)
+
+    def cog_unload(self):
+        get_view_registry(self.bot).unregister(self.qualified_name)
 
     @app_commands.command(name="ticketpanel", description="Zeigt das Ticket-Erstellungs-Panel.")
     async def ticket_panel(self, interaction: discord.Interaction):
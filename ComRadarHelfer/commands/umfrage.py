@@ -1,15 +1,26 @@
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord.ui import Modal, TextInput
-from config import TEST_GUILD_ID  # optional, kann auch entfernt werden
 import asyncio
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from utils.deadline_queue import get_deadline_queue
 from utils.permissions import has_permission
+from utils.persistent_views import get_view_registry, persistent_view
+from utils.timeparse import format_berlin, parse_when
+from utils.umfrage_state import get_umfrage_votes
 
-DATA_FILE = "data/umfragen.json"
+DATA_FILE = "data/umfragen.json"            # nur laufende Umfragen
+ARCHIVE_FILE = "data/umfragen_archiv.json"  # beendete Umfragen mit Ergebnis
+CLOSE_KIND = "umfrage_close"
+
+EMOJI_LIST = ["🅰️", "🅱️", "🇨", "🇩", "🇪", "🇫", "🇬"]  # Reaktions-Modus: max. 7 Optionen
+MAX_BUTTON_OPTIONS = 20        # Button-Modus: 4 Reihen à 5 Buttons, die 5. Reihe bleibt für "Zurückziehen"
+RESULT_UPDATE_DELAY = 3        # Sekunden – Klicks in diesem Fenster ergeben nur eine Embed-Bearbeitung
+BAR_LENGTH = 12
+MIN_DURATION = timedelta(minutes=1)
 
 os.makedirs("data", exist_ok=True)
 if not os.path.exists(DATA_FILE):
@@ -27,19 +38,143 @@ def save_umfragen(umfragen):
         json.dump(umfragen, f, indent=4)
 
 
+def archive_umfragen(umfragen):
+    """Hängt beendete Umfragen an das Archiv an (wird nur beim Beenden geöffnet)."""
+    archive = []
+    if os.path.exists(ARCHIVE_FILE):
+        with open(ARCHIVE_FILE, "r", encoding="utf-8") as f:
+            archive = json.load(f)
+    archive.extend(umfragen)
+    with open(ARCHIVE_FILE, "w", encoding="utf-8") as f:
+        json.dump(archive, f, indent=4)
+
+
+def end_timestamp(umfrage: dict) -> float:
+    """end_time ist naive UTC (datetime.utcnow())."""
+    return datetime.fromisoformat(umfrage["end_time"]).replace(tzinfo=timezone.utc).timestamp()
+
+
+def option_label(index: int, option: str) -> str:
+    return f"{chr(65 + index)}) {option}"
+
+
+def result_bar(count: int, total: int) -> str:
+    share = count / total if total else 0
+    filled = round(share * BAR_LENGTH)
+    return f"`{'█' * filled}{'░' * (BAR_LENGTH - filled)}` {share * 100:.0f}% ({count})"
+
+
+def build_poll_embed(umfrage: dict, tally: dict, voters: int, ended: bool = False) -> discord.Embed:
+    """Embed einer Button-Umfrage mit Ergebnisbalken pro Option."""
+    end_time = datetime.fromisoformat(umfrage["end_time"])
+    embed = discord.Embed(
+        title=f"📊 {umfrage['title']}" + (" (beendet)" if ended else ""),
+        description=umfrage["question"],
+        color=discord.Color.dark_grey() if ended else discord.Color.gold(),
+        timestamp=end_time,
+    )
+    total = sum(tally.get(i, 0) for i in range(len(umfrage["options"])))
+    for index, option in enumerate(umfrage["options"]):
+        embed.add_field(name=option_label(index, option), value=result_bar(tally.get(index, 0), total), inline=False)
+    embed.add_field(
+        name="🗳️ Abstimmungsart",
+        value="Mehrfachantworten erlaubt ✅" if umfrage["allow_multiple"] else "Nur eine Antwort erlaubt ❌",
+        inline=False
+    )
+    if ended:
+        embed.set_footer(text=f"Beendet · {voters} Teilnehmer")
+    else:
+        embed.set_footer(text=f"{voters} Teilnehmer · Endet am {format_berlin(end_time)}")
+    return embed
+
+
+# -------------------------------------------------
+# Persistente Abstimm-Elemente (Button-Modus)
+# -------------------------------------------------
+class UmfrageVoteButton(discord.ui.DynamicItem[discord.ui.Button], template=r"umfrage:vote:(?P<index>[0-9]+)"):
+    def __init__(self, index: int, option: str = ""):
+        super().__init__(discord.ui.Button(
+            label=option_label(index, option)[:80] if option else chr(65 + index),
+            style=discord.ButtonStyle.primary,
+            custom_id=f"umfrage:vote:{index}",
+            row=index // 5,
+        ))
+        self.index = index
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["index"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("UmfragenSystem")
+        if cog is None:
+            return await interaction.response.send_message("⚠️ Umfragen sind gerade nicht verfügbar.", ephemeral=True)
+        await cog.handle_vote(interaction, [self.index], toggle=True)
+
+
+class UmfrageSelect(discord.ui.DynamicItem[discord.ui.Select], template=r"umfrage:select"):
+    def __init__(self, options=()):
+        super().__init__(discord.ui.Select(
+            custom_id="umfrage:select",
+            placeholder="Wähle eine oder mehrere Antworten …",
+            min_values=0,
+            max_values=max(1, len(options)),
+            options=[discord.SelectOption(label=option_label(i, o)[:100], value=str(i)) for i, o in enumerate(options)],
+            row=0,
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+        return cls()
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("UmfragenSystem")
+        if cog is None:
+            return await interaction.response.send_message("⚠️ Umfragen sind gerade nicht verfügbar.", ephemeral=True)
+        values = [int(v) for v in interaction.data.get("values", [])]
+        await cog.handle_vote(interaction, values, toggle=False)
+
+
+class UmfrageResetButton(discord.ui.DynamicItem[discord.ui.Button], template=r"umfrage:reset"):
+    def __init__(self):
+        super().__init__(discord.ui.Button(
+            label="Stimme zurückziehen", style=discord.ButtonStyle.secondary, custom_id="umfrage:reset", row=4
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls()
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("UmfragenSystem")
+        if cog is None:
+            return await interaction.response.send_message("⚠️ Umfragen sind gerade nicht verfügbar.", ephemeral=True)
+        await cog.handle_vote(interaction, [], toggle=False)
+
+
+def umfrage_view(options, allow_multiple: bool) -> discord.ui.View:
+    """Mehrfachauswahl über ein Auswahlmenü, Einzelauswahl über je einen Button pro Option."""
+    if allow_multiple:
+        items = [UmfrageSelect(options)]
+    else:
+        items = [UmfrageVoteButton(i, o) for i, o in enumerate(options)]
+    return persistent_view(*items, UmfrageResetButton())
+
+
 # -------------------------------------------------
 # Modal zum Erstellen einer Umfrage
 # -------------------------------------------------
 class UmfrageModal(Modal, title="📊 Neue Umfrage erstellen"):
-    def __init__(self, bot, interaction_user):
+    def __init__(self, bot, interaction_user, modus: str = "buttons"):
         super().__init__()
         self.bot = bot
         self.user = interaction_user
+        self.modus = modus
 
         self.title_input = TextInput(label="Titel der Umfrage", required=True, max_length=100)
         self.question_input = TextInput(label="Frage oder Beschreibung", style=discord.TextStyle.paragraph, required=True)
         self.options_input = TextInput(label="Antwortoptionen (durch Kommas getrennt)", required=True, placeholder="z.B. Ja, Nein, Vielleicht")
-        self.duration_input = TextInput(label="Laufzeit (z.B. 1h, 2d6h, 30m)", required=True, placeholder="1h")
+        self.duration_input = TextInput(label="Laufzeit oder Ende (z.B. 2d6h, 24.12. 18:00)", required=True, placeholder="1h")
         self.multiple_input = TextInput(
             label="Mehrfachantworten erlauben? (ja/nein)",
             required=True,
@@ -62,70 +197,67 @@ class UmfrageModal(Modal, title="📊 Neue Umfrage erstellen"):
             await interaction.response.send_message("⚠️ Du musst mindestens **zwei Antwortoptionen** angeben.", ephemeral=True)
             return
 
-        duration = self.parse_duration(self.duration_input.value)
-        if not duration:
-            await interaction.response.send_message("⚠️ Ungültiges Zeitformat. Beispiele: `1h`, `2d6h`, `30m`", ephemeral=True)
+        max_options = MAX_BUTTON_OPTIONS if self.modus == "buttons" else len(EMOJI_LIST)
+        if len(options) > max_options:
+            await interaction.response.send_message(f"⚠️ In diesem Modus sind höchstens **{max_options}** Antwortoptionen möglich.", ephemeral=True)
             return
 
-        allow_multiple = self.multiple_input.value.strip().lower() in ["ja", "yes", "true", "y"]
-
-        end_time = datetime.utcnow() + duration
-        embed = discord.Embed(
-            title=f"📊 {self.title_input.value}",
-            description=self.question_input.value,
-            color=discord.Color.gold(),
-            timestamp=end_time
-        )
-        embed.set_footer(text=f"Endet am {end_time.strftime('%d.%m.%Y um %H:%M Uhr UTC')}")
-
-        emoji_list = ["🅰️", "🅱️", "🇨", "🇩", "🇪", "🇫", "🇬"]
-        option_emojis = emoji_list[:len(options)]
-
-        for emoji, option in zip(option_emojis, options):
-            embed.add_field(name=f"{emoji} {option}", value="\u200b", inline=False)
-
-        embed.add_field(
-            name="🗳️ Abstimmungsart",
-            value="Mehrfachantworten erlaubt ✅" if allow_multiple else "Nur eine Antwort erlaubt ❌",
-            inline=False
-        )
+        try:
+            end = parse_when(self.duration_input.value, minimum=MIN_DURATION)
+        except ValueError as e:
+            await interaction.response.send_message(f"⚠️ {e}", ephemeral=True)
+            return
 
-        message = await interaction.channel.send(embed=embed)
-        for emoji in option_emojis:
-            await message.add_reaction(emoji)
+        allow_multiple = self.multiple_input.value.strip().lower() in ["ja", "yes", "true", "y"]
 
-        umfragen = load_umfragen()
-        umfragen.append({
-            "message_id": message.id,
-            "channel_id": message.channel.id,
+        end_time = end.astimezone(timezone.utc).replace(tzinfo=None)  # gespeichert wird naive UTC
+        umfrage = {
+            "channel_id": interaction.channel.id,
             "creator_id": interaction.user.id,
             "guild_id": interaction.guild.id,
             "title": self.title_input.value,
             "question": self.question_input.value,
             "options": options,
-            "emojis": option_emojis,
             "end_time": end_time.isoformat(),
             "allow_multiple": allow_multiple,
-        })
-        save_umfragen(umfragen)
+            "mode": self.modus,
+        }
 
-        await interaction.response.send_message(f"✅ Umfrage **{self.title_input.value}** gestartet!", ephemeral=True)
+        if self.modus == "buttons":
+            message = await interaction.channel.send(
+                embed=build_poll_embed(umfrage, {}, 0),
+                view=umfrage_view(options, allow_multiple),
+            )
+            umfrage["emojis"] = []
+        else:
+            embed = discord.Embed(
+                title=f"📊 {self.title_input.value}",
+                description=self.question_input.value,
+                color=discord.Color.gold(),
+                timestamp=end_time
+            )
+            embed.set_footer(text=f"Endet am {format_berlin(end_time)}")
 
-    def parse_duration(self, duration_str):
-        try:
-            days = hours = minutes = 0
-            tmp = duration_str
-            if "d" in tmp:
-                days = int(tmp.split("d")[0])
-                tmp = tmp.split("d")[1]
-            if "h" in tmp:
-                hours = int(tmp.split("h")[0])
-                tmp = tmp.split("h")[1]
-            if "m" in tmp:
-                minutes = int(tmp.split("m")[0])
-            return timedelta(days=days, hours=hours, minutes=minutes)
-        except Exception:
-            return None
+            option_emojis = EMOJI_LIST[:len(options)]
+            for emoji, option in zip(option_emojis, options):
+                embed.add_field(name=f"{emoji} {option}", value="\u200b", inline=False)
+
+            embed.add_field(
+                name="🗳️ Abstimmungsart",
+                value="Mehrfachantworten erlaubt ✅" if allow_multiple else "Nur eine Antwort erlaubt ❌",
+                inline=False
+            )
+
+            message = await interaction.channel.send(embed=embed)
+            for emoji in option_emojis:
+                await message.add_reaction(emoji)
+            umfrage["emojis"] = option_emojis
+
+        umfrage["message_id"] = message.id
+        cog = self.bot.get_cog("UmfragenSystem")
+        cog.add_umfrage(umfrage)
+
+        await interaction.response.send_message(f"✅ Umfrage **{self.title_input.value}** gestartet!", ephemeral=True)
 
 
 # -------------------------------------------------
@@ -134,9 +266,173 @@ class UmfrageModal(Modal, title="📊 Neue Umfrage erstellen"):
 class UmfragenSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.umfrage_watcher.start()
+        self.votes = get_umfrage_votes()
+        # Alle Umfragen einmal laden; Klicks lesen nur noch aus dem Speicher
+        self.deadlines = get_deadline_queue(bot)
+        self.umfragen = {}
+        finished = []
+        for umfrage in load_umfragen():
+            if umfrage.get("beendet"):
+                finished.append(umfrage)  # Altbestand aus der Zeit vor dem Archiv
+            else:
+                self.umfragen[str(umfrage["message_id"])] = umfrage
+        if finished:
+            archive_umfragen(finished)
+            self.save()
+        self._pending_updates = {}  # nachricht_id → Task der verzögerten Embed-Bearbeitung
+        get_view_registry(bot).register(self.qualified_name, UmfrageVoteButton, UmfrageSelect, UmfrageResetButton)
+
+    async def cog_load(self):
+        self.deadlines.register(CLOSE_KIND, close_due_umfrage)
+        # Nur laufende Umfragen ohne Termin nachtragen (z.B. aus der Zeit vor der Termin-Queue)
+        for umfrage in self.umfragen.values():
+            if self.deadlines.get(CLOSE_KIND, umfrage["guild_id"], umfrage["message_id"]) is None:
+                self.schedule_close(umfrage)
 
     def cog_unload(self):
-        self.umfrage_watcher.cancel()
+        for task in self._pending_updates.values():
+            task.cancel()
+        self.votes.compact()
+        get_view_registry(self.bot).unregister(self.qualified_name)
+
+    def save(self):
+        save_umfragen(list(self.umfragen.values()))
+
+    def add_umfrage(self, umfrage: dict):
+        self.umfragen[str(umfrage["message_id"])] = umfrage
+        self.save()
+        self.schedule_close(umfrage)
+
+    def schedule_close(self, umfrage: dict):
+        self.deadlines.schedule(CLOSE_KIND, umfrage["guild_id"], end_timestamp(umfrage), key=umfrage["message_id"])
+
+    @app_commands.command(name="umfrage", description="📊 Erstelle eine neue Umfrage")
+    @app_commands.describe(modus="Abstimmen per Buttons/Auswahlmenü (Standard) oder per Reaktionen")
+    @app_commands.choices(modus=[
+        app_commands.Choice(name="Buttons", value="buttons"),
+        app_commands.Choice(name="Reaktionen", value="reaktionen"),
+    ])
+    async def umfrage(self, interaction: discord.Interaction, modus: app_commands.Choice[str] = None):
+        if not has_permission(interaction.user):
+            await interaction.response.send_message("❌ Nur Administratoren dürfen Umfragen erstellen.", ephemeral=True)
+            return
+        await interaction.response.send_modal(UmfrageModal(self.bot, interaction.user, modus.value if modus else "buttons"))
+
+    # -------------------------------------------------
+    # Abstimmen (Button-Modus)
+    # -------------------------------------------------
+    async def handle_vote(self, interaction: discord.Interaction, indices: list, toggle: bool):
+        umfrage = self.umfragen.get(str(interaction.message.id))
+        if not umfrage or umfrage.get("beendet"):
+            return await interaction.response.send_message("🚫 Diese Umfrage ist bereits beendet.", ephemeral=True)
+
+        options = umfrage["options"]
+        if any(i < 0 or i >= len(options) for i in indices):
+            return await interaction.response.send_message("⚠️ Unbekannte Antwortoption.", ephemeral=True)
+
+        current = self.votes.choices(umfrage["message_id"], interaction.user.id)
+        if toggle:
+            index = indices[0]
+            if index in current:
+                choices = [i for i in current if i != index]
+            elif umfrage["allow_multiple"]:
+                choices = current + [index]
+            else:
+                choices = [index]
+        else:
+            choices = indices if umfrage["allow_multiple"] else indices[:1]
+
+        self.votes.vote(umfrage["message_id"], interaction.user.id, choices)
+        self.schedule_update(umfrage)
+
+        if choices:
+            chosen = ", ".join(option_label(i, options[i]) for i in sorted(set(choices)))
+            await interaction.response.send_message(f"✅ Deine Stimme: **{chosen}**", ephemeral=True)
+        else:
+            await interaction.response.send_message("❎ Deine Stimme wurde zurückgezogen.", ephemeral=True)
+
+    def schedule_update(self, umfrage: dict):
+        """Bearbeitet das Embed höchstens einmal pro RESULT_UPDATE_DELAY Sekunden."""
+        key = str(umfrage["message_id"])
+        if key not in self._pending_updates:
+            self._pending_updates[key] = asyncio.create_task(self._update_after_delay(umfrage))
+
+    async def _update_after_delay(self, umfrage: dict):
+        try:
+            await asyncio.sleep(RESULT_UPDATE_DELAY)
+        finally:
+            self._pending_updates.pop(str(umfrage["message_id"]), None)
+        if umfrage.get("beendet"):
+            return
+        channel = self.bot.get_channel(umfrage["channel_id"])
+        if not channel:
+            return
+        embed = build_poll_embed(umfrage, self.votes.tally(umfrage["message_id"]), self.votes.voters(umfrage["message_id"]))
+        try:
+            await channel.get_partial_message(umfrage["message_id"]).edit(embed=embed)
+        except discord.HTTPException as e:
+            print(f"[UMFRAGE] Ergebnis für {umfrage['message_id']} konnte nicht aktualisiert werden: {e}")
+
+    # -------------------------------------------------
+    # Ablauf & Auswertung
+    # -------------------------------------------------
+    async def finish_umfrage(self, message_id):
+        """Beendet eine fällige Umfrage und verschiebt sie ins Archiv."""
+        umfrage = self.umfragen.get(str(message_id))
+        if umfrage is None:
+            return  # bereits beendet
+        await self.close_umfrage(umfrage)
+        del self.umfragen[str(message_id)]
+        self.votes.drop(message_id)
+        archive_umfragen([umfrage])
+        self.save()
+
+    async def close_umfrage(self, umfrage: dict):
+        """Wertet eine abgelaufene Umfrage aus und veröffentlicht das Ergebnis."""
+        umfrage["beendet"] = True
+        pending = self._pending_updates.pop(str(umfrage["message_id"]), None)
+        if pending:
+            pending.cancel()
+
+        channel = self.bot.get_channel(umfrage["channel_id"])
+        if not channel:
+            return
+        try:
+            message = await channel.fetch_message(umfrage["message_id"])
+        except discord.NotFound:
+            return
+
+        if umfrage.get("mode") == "buttons":
+            tally = self.votes.tally(umfrage["message_id"])
+            counts = [tally.get(i, 0) for i in range(len(umfrage["options"]))]
+            voters = self.votes.voters(umfrage["message_id"])
+            await message.edit(embed=build_poll_embed(umfrage, tally, voters, ended=True), view=None)
+        else:
+            counts = []
+            for emoji in umfrage["emojis"]:
+                reaction = discord.utils.get(message.reactions, emoji=emoji)
+                counts.append(max(0, reaction.count - 1) if reaction else 0)  # Bot-Reaktion abziehen
+            voters = None
+
+        umfrage["ergebnis"] = counts
+        total = sum(counts)
+        lines = [f"**{option_label(i, option)}** – {result_bar(n, total)}" for i, (option, n) in enumerate(zip(umfrage["options"], counts))]
+        embed = discord.Embed(
+            title=f"📊 Ergebnis: {umfrage['title']}",
+            description="\n".join(lines),
+            color=discord.Color.green(),
+        )
+        if voters is not None:
+            embed.set_footer(text=f"{voters} Teilnehmer")
+        await channel.send(embed=embed)
+
+
+async def close_due_umfrage(bot, item: dict):
+    cog = bot.get_cog("UmfragenSystem")
+    if cog is None:
+        raise RuntimeError("Umfragen-Cog nicht geladen")
+    await cog.finish_umfrage(item["key"])
+
 
-    @app_comman_
+async def setup(bot):
+    await bot.add_cog(UmfragenSystem(bot))
@@ -2,29 +2,67 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button, Modal, TextInput
-import os, json, csv
+import asyncio
+import os
 from datetime import datetime
 
-from utils.guild_settings import get_guild_settings  # ⚡️ holt die server-spezifischen Einstellungen
-from config import DATA_PATH, TEST_GUILD_ID
-
-DATA_FILE = os.path.join(DATA_PATH, "comradar_wahlen.json")
-
-def load_data():
-    os.makedirs(os.path.dirname(DATA_FILE) or "data", exist_ok=True)
-    if not os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump([], f)
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return []
-
-def save_data(data):
-    os.makedirs(os.path.dirname(DATA_FILE) or "data", exist_ok=True)
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+from utils.export import send_export
+from utils.guild_config import get_guild_settings_cached  # ⚡️ holt die server-spezifischen Einstellungen
+from utils.permissions import is_authorized
+from utils.persistent_views import get_view_registry, persistent_view
+from utils.wahlen_votes import get_nomination_store
+
+TEST_GUILD_ID = int(os.getenv("TEST_GUILD_ID", 0)) or None
+EMBED_UPDATE_DELAY = 3    # Sekunden – Stimmen in diesem Fenster ergeben nur eine Bearbeitung pro Nachricht
+MIRROR_MAX_MENTIONS = 40  # danach nur noch "+N weitere" im Admin-Spiegel
+
+
+def test_guild_only(command):
+    """Beschränkt den Befehl auf den Test-Server, falls TEST_GUILD_ID gesetzt ist."""
+    if TEST_GUILD_ID:
+        return app_commands.guilds(discord.Object(id=TEST_GUILD_ID))(command)
+    return command
+
+
+def _mentions(user_ids) -> str:
+    ids = sorted(user_ids)
+    if not ids:
+        return "—"
+    text = ", ".join(f"<@{uid}>" for uid in ids[:MIRROR_MAX_MENTIONS])
+    if len(ids) > MIRROR_MAX_MENTIONS:
+        text += f" … +{len(ids) - MIRROR_MAX_MENTIONS} weitere"
+    return text
+
+
+def _created_at(nomination: dict):
+    created = nomination.get("created_at")
+    return datetime.fromisoformat(created) if created else None
+
+
+def public_embed(nomination: dict) -> discord.Embed:
+    voters = nomination["voters"]
+    embed = discord.Embed(
+        title=f"Nominierung: {nomination['mc_name']}",
+        description=(f"**MC-Name:** `{nomination['mc_name']}`\n**DC-Name:** `{nomination['dc_name']}`\n\n"
+                     f"**Ja:** {len(voters['yes'])}\n**Nein:** {len(voters['no'])}"),
+        color=discord.Color.blurple(),
+        timestamp=_created_at(nomination),
+    )
+    embed.set_footer(text="Anonyme Abstimmung")
+    return embed
+
+
+def mirror_embed(nomination: dict) -> discord.Embed:
+    voters = nomination["voters"]
+    return discord.Embed(
+        title=f"[Admin] Nominierung: {nomination['mc_name']}",
+        description=(f"**MC-Name:** `{nomination['mc_name']}`\n**DC-Name:** `{nomination['dc_name']}`\n"
+                     f"**Nominiert von:** <@{nomination['nominator_id']}>\n\n"
+                     f"**Ja ({len(voters['yes'])}):** {_mentions(voters['yes'])}\n"
+                     f"**Nein ({len(voters['no'])}):** {_mentions(voters['no'])}"),
+        color=discord.Color.gold(),
+        timestamp=_created_at(nomination),
+    )
 
 # ==========================================
 # 🪪 Nominierungs-Modal
@@ -44,7 +82,7 @@ class NominationModal(Modal, title="Nominierung"):
         author = interaction.user
         guild = interaction.guild
 
-        settings = await get_guild_settings(guild.id)
+        settings = get_guild_settings_cached(guild.id)
         if not settings:
             return await interaction.followup.send("❌ Guild-Settings konnten nicht geladen werden.", ephemeral=True)
 
@@ -53,59 +91,53 @@ class NominationModal(Modal, title="Nominierung"):
         if not public_channel or not result_channel:
             return await interaction.followup.send("❌ Ein Kanal wurde nicht gefunden.", ephemeral=True)
 
-        embed = discord.Embed(
-            title=f"Nominierung: {mc}",
-            description=f"**MC-Name:** `{mc}`\n**DC-Name:** `{dc}`\n\n**Ja:** 0\n**Nein:** 0",
-            color=discord.Color.blurple(),
-            timestamp=datetime.utcnow(),
-        )
-        embed.set_footer(text="Anonyme Abstimmung")
-
-        view = VotingView(self.cog)
-        public_msg = await public_channel.send(embed=embed, view=view)
-
-        mirror_embed = discord.Embed(
-            title=f"[Admin] Nominierung: {mc}",
-            description=f"**MC-Name:** `{mc}`\n**DC-Name:** `{dc}`\n**Nominiert von:** {author.mention}\n\n**Ja (0):** —\n**Nein (0):** —",
-            color=discord.Color.gold(),
-            timestamp=datetime.utcnow(),
-        )
-        mirror_msg = await result_channel.send(embed=mirror_embed)
-
-        data = load_data()
-        data.append({
+        nomination = {
             "mc_name": mc,
             "dc_name": dc,
             "nominator_id": author.id,
             "guild_id": guild.id,
+            "created_at": datetime.utcnow().isoformat(),
+            "voters": {"yes": [], "no": []},
+        }
+        public_msg = await public_channel.send(embed=public_embed(nomination), view=voting_view())
+        mirror_msg = await result_channel.send(embed=mirror_embed(nomination))
+
+        nomination.update({
             "public_channel_id": public_channel.id,
             "public_msg_id": public_msg.id,
             "mirror_channel_id": result_channel.id,
             "mirror_msg_id": mirror_msg.id,
-            "voters": {"yes": [], "no": []},
         })
-        save_data(data)
+        get_nomination_store().add_nomination(nomination)
         await interaction.followup.send("✅ Du wurdest erfolgreich nominiert!", ephemeral=True)
 
 # ==========================================
-# 🧩 Voting-Buttons
+# 🧩 Voting-Buttons (persistent, die Nominierung wird über die Nachrichten-ID gefunden)
 # ==========================================
-class VotingView(View):
-    def __init__(self, cog):
-        super().__init__(timeout=None)
-        self.cog = cog
-
-    @discord.ui.button(label="Ja", style=discord.ButtonStyle.success)
-    async def vote_yes(self, interaction: discord.Interaction, button: Button):
-        await self.cog.handle_vote(interaction, "yes")
-
-    @discord.ui.button(label="Nein", style=discord.ButtonStyle.danger)
-    async def vote_no(self, interaction: discord.Interaction, button: Button):
-        await self.cog.handle_vote(interaction, "no")
-
-    @discord.ui.button(label="Stimme löschen", style=discord.ButtonStyle.secondary)
-    async def vote_reset(self, interaction: discord.Interaction, button: Button):
-        await self.cog.handle_vote(interaction, "reset")
+VOTE_BUTTONS = {
+    "yes": ("Ja", discord.ButtonStyle.success),
+    "no": ("Nein", discord.ButtonStyle.danger),
+    "reset": ("Stimme löschen", discord.ButtonStyle.secondary),
+}
+
+class VoteButton(discord.ui.DynamicItem[Button], template=r"wahlen:vote:(?P<choice>yes|no|reset)"):
+    def __init__(self, choice: str):
+        label, style = VOTE_BUTTONS[choice]
+        super().__init__(Button(label=label, style=style, custom_id=f"wahlen:vote:{choice}"))
+        self.choice = choice
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(match["choice"])
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("ComRadarWahlen")
+        if cog is None:
+            return await interaction.response.send_message("⚠️ Wahlen sind gerade nicht verfügbar.", ephemeral=True)
+        await cog.handle_vote(interaction, self.choice)
+
+def voting_view() -> View:
+    return persistent_view(*(VoteButton(choice) for choice in VOTE_BUTTONS))
 
 # ==========================================
 # 🗳️ ComRadar Wahlen Cog
@@ -113,22 +145,24 @@ class VotingView(View):
 class ComRadarWahlen(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.store = get_nomination_store()
+        self._pending_updates = {}  # public_msg_id → Task der verzögerten Embed-Bearbeitung
         self.bot.add_view(NominatePanel(self))  # persistent
+        get_view_registry(bot).register(self.qualified_name, VoteButton)
 
-    async def get_admin_roles(self, guild: discord.Guild):
-        settings = await get_guild_settings(guild.id)
-        if not settings:
-            return []
-        return settings.get("comradar_admin_roles", [])
+    def cog_unload(self):
+        for task in self._pending_updates.values():
+            task.cancel()
+        self.store.close()
+        get_view_registry(self.bot).unregister(self.qualified_name)
 
     @app_commands.command(name="wahlen", description="Erstellt das Nominierungs-Panel (Admin).")
-    @app_commands.guilds(discord.Object(id=TEST_GUILD_ID))
+    @test_guild_only
     async def wahlen(self, interaction: discord.Interaction):
-        admin_roles = await self.get_admin_roles(interaction.guild)
-        if not any(r.id in admin_roles for r in interaction.user.roles):
+        if not is_authorized(interaction.user, "wahlen"):
             return await interaction.response.send_message("❌ Nur Admins dürfen das.", ephemeral=True)
 
-        settings = await get_guild_settings(interaction.guild.id)
+        settings = get_guild_settings_cached(interaction.guild.id)
         if not settings:
             return await interaction.response.send_message("❌ Guild-Settings konnten nicht geladen werden.", ephemeral=True)
 
@@ -140,38 +174,61 @@ class ComRadarWahlen(commands.Cog):
         await channel.send("📢 **Nominierungen** – Drücke auf **Nominieren**, um dich einzutragen:", view=view)
         await interaction.response.send_message("✅ Wahl-Panel erstellt.", ephemeral=True)
 
-    # ---------- handle_vote & update_votes bleiben unverändert ----------
-    # ---------- export_wahlen angepasst für guild_settings ----------
+    # ---------- Abstimmen ----------
+    async def handle_vote(self, interaction: discord.Interaction, choice: str):
+        nomination = self.store.by_message(interaction.message.id)
+        if nomination is None:
+            return await interaction.response.send_message("⚠️ Diese Nominierung wurde nicht gefunden.", ephemeral=True)
+
+        user_id = interaction.user.id
+        current = self.store.choice_of(nomination, user_id)
+        if choice == "reset":
+            if current is None:
+                return await interaction.response.send_message("ℹ️ Du hast hier noch nicht abgestimmt.", ephemeral=True)
+            self.store.vote(nomination, user_id, None)
+            message = "🗑️ Deine Stimme wurde gelöscht."
+        elif choice == current:
+            label = VOTE_BUTTONS[choice][0]
+            return await interaction.response.send_message(f"ℹ️ Du hast bereits mit **{label}** gestimmt.", ephemeral=True)
+        else:
+            self.store.vote(nomination, user_id, choice)
+            message = f"✅ Deine Stimme (**{VOTE_BUTTONS[choice][0]}**) wurde gezählt."
+
+        await interaction.response.send_message(message, ephemeral=True)
+        self.schedule_update(nomination)
+
+    def schedule_update(self, nomination: dict):
+        """Öffentliche Nachricht und Admin-Spiegel werden höchstens alle EMBED_UPDATE_DELAY Sekunden bearbeitet."""
+        key = str(nomination["public_msg_id"])
+        if key not in self._pending_updates:
+            self._pending_updates[key] = asyncio.create_task(self.update_votes(nomination))
+
+    async def update_votes(self, nomination: dict):
+        try:
+            await asyncio.sleep(EMBED_UPDATE_DELAY)
+        finally:
+            self._pending_updates.pop(str(nomination["public_msg_id"]), None)
+
+        targets = (
+            (nomination["public_channel_id"], nomination["public_msg_id"], public_embed(nomination)),
+            (nomination["mirror_channel_id"], nomination["mirror_msg_id"], mirror_embed(nomination)),
+        )
+        for channel_id, message_id, embed in targets:
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                continue
+            try:
+                await channel.get_partial_message(message_id).edit(embed=embed)
+            except discord.HTTPException as e:
+                print(f"[WAHLEN] Nachricht {message_id} konnte nicht aktualisiert werden: {e}")
+
+    # ---------- export_wahlen ----------
     @app_commands.command(name="export_wahlen", description="Exportiert alle Wahldaten als CSV (Admin).")
-    @app_commands.guilds(discord.Object(id=TEST_GUILD_ID))
+    @test_guild_only
     async def export_wahlen(self, interaction: discord.Interaction):
-        admin_roles = await self.get_admin_roles(interaction.guild)
-        if not any(r.id in admin_roles for r in interaction.user.roles):
-            return await interaction.response.send_message("❌ Nur Admins dürfen das.", ephemeral=True)
-
-        data = load_data()
-        if not data:
-            return await interaction.response.send_message("⚠️ Keine Wahldaten gefunden.", ephemeral=True)
-
-        guild_data = [e for e in data if e["guild_id"] == interaction.guild.id]
-        if not guild_data:
-            return await interaction.response.send_message("⚠️ Keine Wahldaten für diesen Server gefunden.", ephemeral=True)
-
-        os.makedirs(DATA_PATH, exist_ok=True)
-        csv_path = os.path.join(DATA_PATH, f"comradar_wahlen_{interaction.guild.id}.csv")
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["MC-Name", "DC-Name", "Nominator ID", "Ja-Stimmen", "Nein-Stimmen"])
-            for entry in guild_data:
-                writer.writerow([
-                    entry["mc_name"],
-                    entry["dc_name"],
-                    entry["nominator_id"],
-                    len(entry["voters"]["yes"]),
-                    len(entry["voters"]["no"])
-                ])
-        await interaction.response.send_message(file=discord.File(csv_path))
-        print(f"✅ CSV exportiert: {csv_path}")
+        # Bisheriges Format beibehalten: öffentlich, Komma-getrennt, ohne BOM, gleicher Dateiname
+        await send_export(interaction, "wahlen", "csv", ephemeral=False,
+                          filename=f"comradar_wahlen_{interaction.guild.id}.csv", delimiter=",", bom=False)
 
 # ==========================================
 # 🧩 Nominierungs-Panel
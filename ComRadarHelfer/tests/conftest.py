@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Die Module werden wie im Bot relativ zu ComRadarHelfer/ importiert (utils.…)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,110 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils.timeparse import (
+    BERLIN_TZ, MAX_DURATION, format_duration, parse_datetime, parse_duration, parse_when,
+)
+
+UNITS = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1}
+LONG_UNITS = {"w": "Wochen", "d": "Tage", "h": "Std", "m": "min", "s": "sek"}
+
+
+# ---------------------------------------------
+# Dauern
+# ---------------------------------------------
+def test_duration_random_unit_combinations():
+    rng = random.Random(48)
+    for _ in range(2000):
+        units = rng.sample(list(UNITS), rng.randint(1, len(UNITS)))
+        values = {unit: rng.randint(0, 60) for unit in units}
+        expected = timedelta(seconds=sum(v * UNITS[u] for u, v in values.items()))
+        if not expected or expected > MAX_DURATION:
+            continue
+        separator = rng.choice(["", " "])
+        names = LONG_UNITS if rng.random() < 0.3 else {u: u for u in UNITS}
+        text = separator.join(f"{v}{rng.choice(['', ' '])}{names[u]}" for u, v in values.items())
+        assert parse_duration(text) == expected, text
+
+
+def test_format_duration_round_trip():
+    rng = random.Random(480)
+    for _ in range(2000):
+        duration = timedelta(seconds=rng.randint(1, int(MAX_DURATION.total_seconds())))
+        text = format_duration(duration)
+        for word, unit in (("Wochen", "w"), ("Woche", "w"), ("Tage", "d"), ("Tag", "d"), ("Stunden", "h"),
+                           ("Stunde", "h"), ("Minuten", "m"), ("Minute", "m"), ("Sekunden", "s"), ("Sekunde", "s")):
+            text = text.replace(f" {word}", unit)
+        assert parse_duration(text) == duration, text
+
+
+@pytest.mark.parametrize("text", ["1h1h", "1h 2std", "2d 3 Tage", "5m 1min"])
+def test_duration_rejects_duplicate_units(text):
+    with pytest.raises(ValueError, match="mehrfach"):
+        parse_duration(text)
+
+
+@pytest.mark.parametrize("text", ["", "h", "1x", "1h-", "0m", "-5m", "1.5h", "400d"])
+def test_duration_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_duration(text)
+
+
+def test_duration_limits():
+    with pytest.raises(ValueError):
+        parse_duration("30s", minimum=timedelta(minutes=1))
+    with pytest.raises(ValueError):
+        parse_duration("29d", maximum=timedelta(days=28))
+    assert parse_duration("28d", maximum=timedelta(days=28)) == timedelta(days=28)
+
+
+# ---------------------------------------------
+# Zeitpunkte
+# ---------------------------------------------
+NOW = datetime(2026, 10, 19, 14, 0, tzinfo=BERLIN_TZ)
+
+
+def test_datetime_absolute_formats():
+    expected = datetime(2026, 12, 24, 18, 30, tzinfo=BERLIN_TZ)
+    for text in ("24.12.2026 18:30", "24.12.26 18:30", "2026-12-24 18:30", "2026-12-24T18:30", "24.12. 18:30"):
+        assert parse_datetime(text, NOW) == expected, text
+
+
+def test_bare_time_rolls_to_tomorrow():
+    assert parse_datetime("15:00", NOW) == datetime(2026, 10, 19, 15, 0, tzinfo=BERLIN_TZ)
+    assert parse_datetime("13:59", NOW) == datetime(2026, 10, 20, 13, 59, tzinfo=BERLIN_TZ)
+    assert parse_datetime("14:00 Uhr", NOW) == datetime(2026, 10, 20, 14, 0, tzinfo=BERLIN_TZ)
+
+
+def test_day_month_rolls_to_next_year():
+    assert parse_datetime("01.03. 10:00", NOW) == datetime(2027, 3, 1, 10, 0, tzinfo=BERLIN_TZ)
+    assert parse_datetime("20.10.", NOW) == datetime(2026, 10, 20, 0, 0, tzinfo=BERLIN_TZ)
+
+
+@pytest.mark.parametrize("text", ["31.02.2027 10:00", "32.01.2027", "29.02.2027", "25:00", "12:60", "2027-13-01"])
+def test_datetime_rejects_invalid_dates(text):
+    with pytest.raises(ValueError):
+        parse_datetime(text, NOW)
+
+
+def test_datetime_rejects_dst_gap():
+    with pytest.raises(ValueError, match="Zeitumstellung"):
+        parse_datetime("29.03.2026 02:30", NOW)
+    # Die doppelte Stunde im Oktober existiert und wird akzeptiert
+    assert parse_datetime("25.10.2026 02:30", NOW).hour == 2
+
+
+def test_when_relative_across_dst_transition():
+    before = datetime(2026, 3, 29, 1, 0, tzinfo=BERLIN_TZ)  # 00:00 UTC, eine Stunde vor der Umstellung
+    when = parse_when("2h", before)
+    assert when.astimezone(timezone.utc) == datetime(2026, 3, 29, 2, 0, tzinfo=timezone.utc)
+    assert (when.hour, when.utcoffset()) == (4, timedelta(hours=2))
+    assert parse_when("in 1 Tag", before).astimezone(timezone.utc) - before.astimezone(timezone.utc) == timedelta(days=1)
+
+
+def test_when_rejects_past_and_far_future():
+    with pytest.raises(ValueError, match="Vergangenheit"):
+        parse_when("01.01.2020 10:00", NOW)
+    with pytest.raises(ValueError):
+        parse_when("01.01.2030 10:00", NOW)
@@ -0,0 +1,181 @@
+import asyncio
+import heapq
+import time
+from utils.journal import JournalStore
+from utils.permissions import logger
+
+# =====================================================
+# ⏰ Persistente Termin-Queue (Tempbans, ablaufende Warns, …)
+# =====================================================
+DEADLINES_FILE = "data/deadlines.json"
+BATCH_SIZE = 25          # höchstens so viele fällige Einträge pro Durchlauf
+RETRY_DELAY = 60         # Sekunden bis zum nächsten Versuch nach einem Fehler
+MAX_ATTEMPTS = 5
+
+
+class DeadlineQueue(JournalStore):
+    """Termine als {"next_id": n, "items": {id: eintrag}}, gespeichert über das Journal.
+
+    Ein Eintrag: {"id", "kind", "guild", "key", "due" (Unix-Zeit), "payload", "attempts"}.
+    Im Speicher liegt zusätzlich ein Heap (due, id), damit der Worker nur bis
+    zum nächsten fälligen Termin schläft, statt regelmäßig alles zu prüfen.
+    Gelöschte Einträge bleiben im Heap und werden beim Herausnehmen verworfen.
+    """
+
+    def __init__(self, bot, path: str = DEADLINES_FILE):
+        self.bot = bot
+        self.handlers = {}   # kind → async handler(bot, eintrag)
+        self._parked = {}    # kind → [id, ...] fällig, aber Handler noch nicht angemeldet
+        self._wakeup = asyncio.Event()
+        self._task = None
+        super().__init__(path)
+
+    def empty(self):
+        self._heap = []
+        self._by_key = {}    # (kind, guild, key) → id
+        return {"next_id": 1, "items": {}}
+
+    def from_snapshot(self, raw):
+        data = {"next_id": raw.get("next_id", 1), "items": raw.get("items", {})}
+        for item in data["items"].values():
+            self._index(item)
+        return data
+
+    def _index(self, item: dict):
+        heapq.heappush(self._heap, (item["due"], item["id"]))
+        if item.get("key") is not None:
+            self._by_key[(item["kind"], item["guild"], item["key"])] = item["id"]
+
+    def apply(self, op):
+        items = self.data["items"]
+        if op["op"] == "add":
+            item = op["item"]
+            items[str(item["id"])] = item
+            self.data["next_id"] = max(self.data["next_id"], item["id"] + 1)
+            self._index(item)
+        elif op["op"] == "done":
+            for item_id in op["ids"]:
+                item = items.pop(str(item_id), None)
+                if item and item.get("key") is not None:
+                    key = (item["kind"], item["guild"], item["key"])
+                    if self._by_key.get(key) == item["id"]:
+                        del self._by_key[key]
+        elif op["op"] == "retry":
+            item = items.get(str(op["id"]))
+            if item:
+                item["due"] = op["due"]
+                item["attempts"] = op["attempts"]
+                heapq.heappush(self._heap, (item["due"], item["id"]))
+
+    # ---------------------------------------------
+    # Öffentliche API
+    # ---------------------------------------------
+    def register(self, kind: str, handler):
+        """Meldet einen Handler für eine Terminart an und startet ggf. den Worker."""
+        self.handlers[kind] = handler
+        for item_id in self._parked.pop(kind, []):
+            item = self.data["items"].get(str(item_id))
+            if item:
+                heapq.heappush(self._heap, (item["due"], item["id"]))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._worker())
+        self._wakeup.set()
+
+    def schedule(self, kind: str, guild_id: int, due: float, payload: dict = None, key=None) -> dict:
+        """Legt einen Termin an. Ein bestehender Termin mit gleichem (kind, guild, key) wird ersetzt."""
+        if key is not None:
+            self.cancel(kind, guild_id, key)
+        item = {
+            "id": self.data["next_id"],
+            "kind": kind,
+            "guild": str(guild_id),
+            "key": None if key is None else str(key),
+            "due": float(due),
+            "payload": payload or {},
+            "attempts": 0,
+        }
+        self.record({"op": "add", "item": item})
+        self._wakeup.set()
+        return item
+
+    def cancel(self, kind: str, guild_id: int, key) -> bool:
+        item_id = self._by_key.get((kind, str(guild_id), str(key)))
+        if item_id is None:
+            return False
+        self.record({"op": "done", "ids": [item_id]})
+        return True
+
+    def get(self, kind: str, guild_id: int, key):
+        item_id = self._by_key.get((kind, str(guild_id), str(key)))
+        return None if item_id is None else self.data["items"].get(str(item_id))
+
+    def pending(self, guild_id: int = None) -> int:
+        if guild_id is None:
+            return len(self.data["items"])
+        return sum(1 for item in self.data["items"].values() if item["guild"] == str(guild_id))
+
+    # ---------------------------------------------
+    # Worker
+    # ---------------------------------------------
+    def _pop_due(self, now: float) -> list:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < BATCH_SIZE:
+            due_at, item_id = heapq.heappop(self._heap)
+            item = self.data["items"].get(str(item_id))
+            if item is None or item["due"] != due_at:
+                continue  # erledigt, abgebrochen oder verschoben
+            due.append(item)
+        return due
+
+    async def _worker(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            batch = self._pop_due(now)
+            if not batch:
+                timeout = self._heap[0][0] - now if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            results = await asyncio.gather(*(self._run(item) for item in batch), return_exceptions=True)
+            done, ops = [], []
+            for item, result in zip(batch, results):
+                if result is None:
+                    done.append(item["id"])
+                elif result == "deferred":
+                    continue
+                elif item["attempts"] + 1 >= MAX_ATTEMPTS:
+                    logger.error(f"❌ Termin {item['kind']} #{item['id']} endgültig fehlgeschlagen: {result}")
+                    done.append(item["id"])
+                else:
+                    ops.append({"op": "retry", "id": item["id"], "due": now + RETRY_DELAY * (item["attempts"] + 1),
+                                "attempts": item["attempts"] + 1})
+            if done:
+                ops.append({"op": "done", "ids": done})
+            self.record_many(ops)
+
+    async def _run(self, item: dict):
+        handler = self.handlers.get(item["kind"])
+        if handler is None:
+            # Cog noch nicht geladen – parken, bis sich ein Handler anmeldet
+            self._parked.setdefault(item["kind"], []).append(item["id"])
+            return "deferred"
+        try:
+            await handler(self.bot, item)
+        except Exception as e:
+            logger.warning(f"⚠️ Termin {item['kind']} #{item['id']} fehlgeschlagen: {e}")
+            return e
+        return None
+
+
+def get_deadline_queue(bot) -> DeadlineQueue:
+    """Liefert die gemeinsame Termin-Queue des Bots."""
+    queue = getattr(bot, "deadline_queue", None)
+    if queue is None:
+        queue = DeadlineQueue(bot)
+        bot.deadline_queue = queue
+    return queue
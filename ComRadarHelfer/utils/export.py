@@ -0,0 +1,181 @@
+import discord
+import asyncio
+import codecs
+import csv
+import json
+import os
+from datetime import datetime, timezone
+from tempfile import SpooledTemporaryFile
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX-Export ist optional
+    Workbook = None
+
+from utils.mod_cases import LEGACY_GUILD, get_case_store
+from utils.permissions import is_authorized
+from utils.quiz_state import get_quiz_state
+from utils.wahlen_votes import get_nomination_store
+
+# =====================================================
+# 📤 Exporte (CSV / XLSX) für alle Datenbereiche
+# =====================================================
+# Jeder Bereich liefert Spalten, eine Auswahl der Datensätze (im Event-Loop,
+# nur Referenzen aus den Indizes – oder ein Generator, der erst im Thread
+# liest) und eine Zeilenfunktion. Formatieren und Schreiben laufen in einem
+# Worker-Thread in eine SpooledTemporaryFile: bis
+# SPOOL_MAX_BYTES im Speicher, darüber in einer anonymen Temp-Datei, die beim
+# Schließen verschwindet. Auf der Festplatte bleibt nichts liegen.
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+GIVEAWAYS_FILE = "data/giveaways.json"
+EXPORT_FORMATS = ("csv", "xlsx") if Workbook else ("csv",)
+
+
+def _select_wahlen(guild_id):
+    return list(get_nomination_store().for_guild(guild_id))
+
+
+def _row_wahlen(entry):
+    return [entry["mc_name"], entry["dc_name"], entry["nominator_id"],
+            len(entry["voters"]["yes"]), len(entry["voters"]["no"])]
+
+
+def _select_modcases(guild_id):
+    # Dazu die noch nicht zugeordneten Fälle aus modactions.json (Guild unbekannt,
+    # siehe claim_legacy); als "alt-<nr>" markiert, damit sie sich nicht mit den
+    # Fallnummern der Guild vermischen.
+    data = get_case_store().data
+    cases = list(data.get(str(guild_id), {}).get("cases", {}).values())
+    cases += [dict(case, id=f"alt-{case['id']}") for case in data.get(LEGACY_GUILD, {}).get("cases", {}).values()]
+    return cases
+
+
+def _row_modcases(case):
+    return [case["id"], case["user"], case["action"], case.get("reason") or "", case.get("moderator"),
+            case.get("timestamp") or "", case.get("duration") or "", "ja" if case.get("expired") else "nein"]
+
+
+def _select_giveaways(guild_id):
+    # Generator: die Datei wird erst beim Schreiben im Worker-Thread gelesen
+    if not os.path.exists(GIVEAWAYS_FILE):
+        return
+    with open(GIVEAWAYS_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for msg_id, giveaway in data.items():
+        if str(giveaway.get("guild_id")) == str(guild_id):
+            yield msg_id, giveaway
+
+
+def _row_giveaways(item):
+    msg_id, giveaway = item
+    return [msg_id, giveaway.get("preis", ""), giveaway.get("gewinner", ""), giveaway.get("endzeit", ""),
+            len(giveaway.get("teilnehmer", [])), "ja" if giveaway.get("beendet") else "nein"]
+
+
+def _select_quiz(guild_id):
+    board = get_quiz_state().leaderboard(guild_id)
+    return [(board.rank(uid), uid, points) for uid, points in board.top(len(board))]
+
+
+def _row_quiz(item):
+    return list(item)
+
+
+# Bereich → (Titel, Berechtigung für is_authorized, Spalten, Auswahl, Zeile)
+EXPORTERS = {
+    "wahlen": ("Wahlen", "wahlen", ["MC-Name", "DC-Name", "Nominator ID", "Ja-Stimmen", "Nein-Stimmen"],
+               _select_wahlen, _row_wahlen),
+    "modcases": ("Moderationsfälle", "mod",
+                 ["Fall", "Benutzer ID", "Aktion", "Grund", "Moderator ID", "Zeitpunkt (UTC)", "Dauer", "Abgelaufen"],
+                 _select_modcases, _row_modcases),
+    "giveaways": ("Giveaways", "team", ["Nachricht ID", "Preis", "Gewinner", "Endzeit", "Teilnehmer", "Beendet"],
+                  _select_giveaways, _row_giveaways),
+    "quiz": ("Quiz-Punkte", "team", ["Rang", "Benutzer ID", "Punkte"], _select_quiz, _row_quiz),
+}
+
+
+# ---------------------------------------------
+# Schreiben (läuft im Worker-Thread)
+# ---------------------------------------------
+def _write_csv(buffer, columns, records, row, delimiter=";", bom=True) -> int:
+    text = codecs.getwriter("utf-8")(buffer)
+    if bom:
+        text.write("\ufeff")  # BOM, damit Excel Umlaute richtig erkennt
+    writer = csv.writer(text, delimiter=delimiter)
+    writer.writerow(columns)
+    count = 0
+    for record in records:
+        writer.writerow(row(record))
+        count += 1
+    return count
+
+
+def _write_xlsx(buffer, title, columns, records, row) -> int:
+    workbook = Workbook(write_only=True)  # Zeilen werden durchgereicht, nicht im Speicher gehalten
+    sheet = workbook.create_sheet(title[:31])
+    sheet.append(columns)
+    count = 0
+    for record in records:
+        sheet.append(row(record))
+        count += 1
+    workbook.save(buffer)
+    return count
+
+
+def _render(domain: str, fmt: str, records, csv_options: dict):
+    title, _, columns, _, row = EXPORTERS[domain]
+    buffer = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+    try:
+        if fmt == "xlsx":
+            count = _write_xlsx(buffer, title, columns, records, row)
+        else:
+            count = _write_csv(buffer, columns, records, row, **csv_options)
+        buffer.seek(0)
+    except Exception:
+        buffer.close()
+        raise
+    return buffer, count
+
+
+async def export(domain: str, guild_id: int, fmt: str = "csv", **csv_options):
+    """Erstellt einen Export. Gibt (datei, dateiname, anzahl) zurück; datei muss geschlossen werden.
+
+    csv_options (delimiter, bom) überschreiben das Standard-CSV (";" mit BOM).
+    Wirft ValueError bei unbekanntem Bereich oder nicht verfügbarem Format.
+    """
+    if domain not in EXPORTERS:
+        raise ValueError(f"Unbekannter Bereich `{domain}`.")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("XLSX-Export ist nicht verfügbar (openpyxl fehlt)." if fmt == "xlsx"
+                         else f"Unbekanntes Format `{fmt}`.")
+    records = EXPORTERS[domain][3](guild_id)
+    buffer, count = await asyncio.to_thread(_render, domain, fmt, records, csv_options)
+    filename = f"{domain}_{guild_id}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M')}.{fmt}"
+    return buffer, filename, count
+
+
+async def send_export(interaction: discord.Interaction, domain: str, fmt: str, ephemeral: bool = True,
+                      filename: str = None, **csv_options):
+    """Erstellt den Export im Worker-Thread und schickt ihn als Anhang."""
+    if not is_authorized(interaction.user, EXPORTERS[domain][1]):
+        return await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
+
+    await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+    try:
+        buffer, default_name, count = await export(domain, interaction.guild.id, fmt, **csv_options)
+    except ValueError as e:
+        return await interaction.followup.send(f"⚠️ {e}", ephemeral=True)
+    if not count:
+        buffer.close()
+        return await interaction.followup.send("⚠️ Keine Daten für diesen Server gefunden.", ephemeral=True)
+
+    filename = filename or default_name
+    try:
+        await interaction.followup.send(
+            f"📤 **{EXPORTERS[domain][0]}** – {count} Einträge",
+            file=discord.File(buffer, filename=filename),
+            ephemeral=ephemeral,
+        )
+    finally:
+        buffer.close()
+    print(f"✅ Export {filename} ({count} Einträge) für {interaction.user}")
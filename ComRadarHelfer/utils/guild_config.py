@@ -2,6 +2,9 @@ import json, os
 
 SETTINGS_FILE = "data/guild_settings.json"
 
+# Cache für load_settings_cached(): (mtime, settings)
+_settings_cache = {"mtime": None, "data": {}}
+
 def load_settings():
     if not os.path.exists(SETTINGS_FILE):
         return {}
@@ -15,3 +18,29 @@ def save_settings(settings):
     os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
     with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
         json.dump(settings, f, indent=4, ensure_ascii=False)
+    invalidate_settings_cache()
+
+def settings_mtime():
+    """Änderungszeitpunkt der Settings-Datei (None, wenn sie fehlt)."""
+    try:
+        return os.stat(SETTINGS_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+def load_settings_cached():
+    """Wie load_settings(), parst die Datei aber nur neu, wenn sie sich geändert hat.
+
+    Das Ergebnis wird geteilt – nur lesen, nie verändern!
+    """
+    mtime = settings_mtime()
+    if mtime != _settings_cache["mtime"]:
+        _settings_cache["data"] = load_settings() if mtime is not None else {}
+        _settings_cache["mtime"] = mtime
+    return _settings_cache["data"]
+
+def get_guild_settings_cached(guild_id):
+    """Liefert die (gecachten) Einstellungen einer Guild."""
+    return load_settings_cached().get(str(guild_id), {})
+
+def invalidate_settings_cache():
+    _settings_cache["mtime"] = None
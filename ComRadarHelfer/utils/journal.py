@@ -0,0 +1,102 @@
+import json
+import os
+
+# =====================================================
+# 📒 JSON-Snapshot + Append-Journal
+# =====================================================
+class JournalStore:
+    """Basisklasse für Daten, die inkrementell gespeichert werden.
+
+    Der Zustand liegt im Speicher (self.data). Jede Änderung wird als eine
+    Zeile JSON an <datei>.journal angehängt, statt die komplette Datei neu zu
+    schreiben. Nach COMPACT_AFTER Journal-Zeilen (oder per compact()) wird ein
+    neuer Snapshot geschrieben und das Journal geleert.
+
+    Unterklassen implementieren apply(op) und optional empty(),
+    from_snapshot() und to_snapshot().
+    """
+
+    COMPACT_AFTER = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.data = self.empty()
+        self._journal_lines = 0
+        self.load()
+
+    # ---------------------------------------------
+    # Hooks für Unterklassen
+    # ---------------------------------------------
+    def empty(self):
+        return {}
+
+    def apply(self, op: dict):
+        raise NotImplementedError
+
+    def from_snapshot(self, raw):
+        return raw
+
+    def to_snapshot(self):
+        return self.data
+
+    # ---------------------------------------------
+    # Laden / Speichern
+    # ---------------------------------------------
+    def load(self):
+        self.data = self.empty()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.data = self.from_snapshot(json.load(f))
+            except json.JSONDecodeError:
+                print(f"[WARNUNG] {self.path} war beschädigt – starte mit leerem Stand.")
+        self._journal_lines = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # unvollständige letzte Zeile nach Absturz
+                    self._apply(op)
+                    self._journal_lines += 1
+
+    def _apply(self, op: dict):
+        if op.get("op") == "batch":
+            for sub in op["ops"]:
+                self.apply(sub)
+        else:
+            self.apply(op)
+
+    def _append(self, op: dict):
+        os.makedirs(os.path.dirname(self.path) or "data", exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._journal_lines += 1
+        if self._journal_lines >= self.COMPACT_AFTER:
+            self.compact()
+
+    def record(self, op: dict):
+        """Wendet eine Änderung an und hängt sie ans Journal."""
+        self.apply(op)
+        self._append(op)
+
+    def record_many(self, ops: list):
+        """Mehrere Änderungen als eine Journal-Zeile – alles oder nichts."""
+        if not ops:
+            return
+        batch = {"op": "batch", "ops": ops}
+        self._apply(batch)
+        self._append(batch)
+
+    def compact(self):
+        """Schreibt einen vollständigen Snapshot und leert das Journal."""
+        os.makedirs(os.path.dirname(self.path) or "data", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_snapshot(), f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_lines = 0
@@ -0,0 +1,232 @@
+import asyncio
+import io
+from collections import deque
+import discord
+from utils.guild_config import get_guild_settings_cached, settings_mtime
+from utils.permissions import logger
+
+# =====================================================
+# 📡 Log-Routing (gemeinsam für AuditLogger, AutoRole, AutoRoleRestore)
+# =====================================================
+# Log-Art → Schlüssel in guild_settings.json
+LOG_KINDS = {
+    "log": "LOG_CHANNEL_ID",
+    "join": "JOIN_LOG_CHANNEL_ID",
+}
+
+# Discord-Limits pro Nachricht
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_FILES_PER_MESSAGE = 10
+
+FLUSH_INTERVAL = 2.0       # Sekunden, die auf weitere Einträge gewartet wird
+MAX_QUEUE_SIZE = 1000      # danach werden die ältesten Einträge verworfen
+BACKPRESSURE_WARN = 200    # ab dieser Queue-Tiefe wird gewarnt
+
+
+class _ChannelQueue:
+    """Sende-Queue eines einzelnen Log-Kanals inkl. Kennzahlen."""
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.items = deque()
+        self.ready = asyncio.Event()
+        self.full = asyncio.Event()
+        self.task = None
+        self.warned = False
+        # 📊 Kennzahlen
+        self.enqueued = 0
+        self.sent_messages = 0
+        self.sent_embeds = 0
+        self.dropped = 0
+        self.failed = 0
+        self.max_depth = 0
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self.items),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "sent_messages": self.sent_messages,
+            "sent_embeds": self.sent_embeds,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+class LogRouter:
+    """Löst Log-Kanäle pro (Guild, Log-Art) einmal auf und cached das Kanal-Objekt.
+
+    Der Cache wird verworfen, sobald sich guild_settings.json ändert oder ein
+    gecachter Kanal gelöscht wird.
+
+    Versendet wird gebündelt: jeder Kanal hat eine eigene Queue, aus der bis zu
+    zehn Embeds pro Nachricht verschickt werden. Lange Texte (transcript) eines
+    Bündels landen gemeinsam in einer einzigen Datei.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._channels = {}  # (guild_id, kind) → Kanal oder None
+        self._queues = {}    # channel_id → _ChannelQueue
+        self._settings_mtime = settings_mtime()
+        bot.add_listener(self._on_guild_channel_delete, "on_guild_channel_delete")
+        bot.add_listener(self._on_guild_remove, "on_guild_remove")
+
+    # ---------------------------------------------
+    # ♻️ Invalidierung
+    # ---------------------------------------------
+    def invalidate(self, guild_id: int = None):
+        if guild_id is None:
+            self._channels.clear()
+            return
+        for key in [k for k in self._channels if k[0] == guild_id]:
+            del self._channels[key]
+
+    def _check_settings(self):
+        mtime = settings_mtime()
+        if mtime != self._settings_mtime:
+            self._settings_mtime = mtime
+            self._channels.clear()
+
+    async def _on_guild_channel_delete(self, channel):
+        for key, cached in list(self._channels.items()):
+            if cached is not None and cached.id == channel.id:
+                del self._channels[key]
+
+    async def _on_guild_remove(self, guild):
+        self.invalidate(guild.id)
+
+    # ---------------------------------------------
+    # 🔎 Auflösung
+    # ---------------------------------------------
+    def get_channel(self, guild_id: int, kind: str = "log"):
+        """Gibt den Log-Kanal der Guild zurück (oder None, wenn nicht konfiguriert)."""
+        self._check_settings()
+        key = (guild_id, kind)
+        if key in self._channels:
+            return self._channels[key]
+
+        channel = None
+        channel_id = get_guild_settings_cached(guild_id).get(LOG_KINDS[kind])
+        guild = self.bot.get_guild(guild_id)
+        if channel_id and guild:
+            channel = guild.get_channel(channel_id)
+        # Nur aufgelöste Kanäle bzw. "nicht konfiguriert" cachen – ein noch
+        # nicht im Cache liegender Kanal wird beim nächsten Mal erneut gesucht.
+        if channel is not None or not channel_id:
+            self._channels[key] = channel
+        return channel
+
+    def has_channel(self, guild_id: int, kind: str = "log") -> bool:
+        return self.get_channel(guild_id, kind) is not None
+
+    # ---------------------------------------------
+    # 📨 Versand
+    # ---------------------------------------------
+    async def send(self, guild_id: int, embed: discord.Embed = None, file: discord.File = None,
+                   kind: str = "log", transcript: tuple = None):
+        """Reiht einen Log-Eintrag in die Queue des passenden Kanals ein.
+
+        transcript: optional (name, text) – wird beim Versand mit den anderen
+        Transkripten desselben Bündels zu einer Datei zusammengefasst.
+        """
+        channel = self.get_channel(guild_id, kind)
+        if not channel:
+            return
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = _ChannelQueue(guild_id)
+
+        if len(queue.items) >= MAX_QUEUE_SIZE:
+            queue.items.popleft()
+            queue.dropped += 1
+        queue.items.append((embed, file, transcript))
+        queue.enqueued += 1
+        depth = len(queue.items)
+        queue.max_depth = max(queue.max_depth, depth)
+        if depth >= BACKPRESSURE_WARN and not queue.warned:
+            queue.warned = True
+            logger.warning(f"⚠️ Log-Queue für Kanal {channel.id} staut sich ({depth} Einträge).")
+
+        if depth >= MAX_EMBEDS_PER_MESSAGE:
+            queue.full.set()
+        queue.ready.set()
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._worker(channel.id, queue))
+
+    def stats(self, guild_id: int = None) -> dict:
+        """Kennzahlen der Sende-Queues (optional nur für eine Guild)."""
+        return {
+            channel_id: queue.stats()
+            for channel_id, queue in self._queues.items()
+            if guild_id is None or queue.guild_id == guild_id
+        }
+
+    async def _worker(self, channel_id: int, queue: _ChannelQueue):
+        while True:
+            await queue.ready.wait()
+            if len(queue.items) < MAX_EMBEDS_PER_MESSAGE:
+                try:
+                    await asyncio.wait_for(queue.full.wait(), timeout=FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+            while queue.items:
+                await self._deliver(channel_id, queue, self._take_batch(queue))
+            queue.ready.clear()
+            queue.full.clear()
+            queue.warned = False
+
+    @staticmethod
+    def _take_batch(queue: _ChannelQueue) -> list:
+        """Nimmt so viele Einträge, wie in eine Discord-Nachricht passen."""
+        batch, embeds, chars, files = [], 0, 0, 0
+        while queue.items:
+            embed, file, transcript = queue.items[0]
+            size = len(embed) if embed else 0
+            if batch and (
+                embeds + (1 if embed else 0) > MAX_EMBEDS_PER_MESSAGE
+                or chars + size > MAX_EMBED_CHARS_PER_MESSAGE
+                # ein Platz bleibt für die zusammengefasste Transkript-Datei
+                or files + (1 if file else 0) > MAX_FILES_PER_MESSAGE - 1
+            ):
+                break
+            batch.append(queue.items.popleft())
+            embeds += 1 if embed else 0
+            chars += size
+            files += 1 if file else 0
+        return batch
+
+    async def _deliver(self, channel_id: int, queue: _ChannelQueue, batch: list):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            queue.dropped += len(batch)
+            return
+
+        embeds = [embed for embed, _, _ in batch if embed]
+        files = [file for _, file, _ in batch if file]
+        transcripts = [t for _, _, t in batch if t]
+        if transcripts:
+            text = "\n\n".join(f"===== {name} =====\n{content}" for name, content in transcripts)
+            filename = f"{transcripts[0][0]}.txt" if len(transcripts) == 1 else f"audit_log_{channel_id}_{len(transcripts)}.txt"
+            files.append(discord.File(io.BytesIO(text.encode("utf-8")), filename=filename))
+
+        try:
+            await channel.send(embeds=embeds, files=files)
+            queue.sent_messages += 1
+            queue.sent_embeds += len(embeds)
+        except discord.NotFound:
+            queue.dropped += len(batch)
+            self.invalidate(queue.guild_id)
+        except discord.HTTPException as e:
+            queue.failed += len(batch)
+            logger.warning(f"⚠️ Log-Bündel konnte nicht gesendet werden (Kanal {channel_id}): {e}")
+
+
+def get_log_router(bot) -> LogRouter:
+    """Liefert den gemeinsamen LogRouter des Bots (wird beim ersten Aufruf erstellt)."""
+    router = getattr(bot, "log_router", None)
+    if router is None:
+        router = LogRouter(bot)
+        bot.log_router = router
+    return router
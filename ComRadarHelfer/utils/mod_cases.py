@@ -0,0 +1,214 @@
+import json
+import os
+from bisect import bisect_left, insort
+from datetime import datetime
+from utils.journal import JournalStore
+
+# =====================================================
+# 📂 Moderations-Fälle (pro Guild & Benutzer indiziert)
+# =====================================================
+CASES_FILE = "data/modcases.json"
+LEGACY_FILE = "data/modactions.json"  # altes Format: {user_id: [eintrag, ...]} ohne Guild
+LEGACY_GUILD = "*"
+
+
+class ModCaseStore(JournalStore):
+    """Alle Moderationsfälle als {guild_id: {"next_id": n, "cases": {case_id: fall}}}.
+
+    Im Speicher werden zusätzlich gepflegt:
+      • pro (Guild, Benutzer) die sortierten Fall-IDs,
+      • pro (Guild, Benutzer, Aktion) die Fall-IDs – len() ist der Zähler.
+    Dadurch sind Warn-Zähler und Historien-Abfragen unabhängig von der
+    Gesamtgröße der Datei.
+    """
+
+    def empty(self):
+        self._by_user = {}    # (gid, uid) → [case_id, ...] aufsteigend
+        self._by_action = {}  # (gid, uid, action) → [case_id, ...] aufsteigend
+        return {}
+
+    def from_snapshot(self, raw):
+        data = raw.get("guilds", {})
+        for guild_id, guild_data in data.items():
+            for case in sorted(guild_data["cases"].values(), key=lambda c: c["id"]):
+                self._index(guild_id, case)
+        return data
+
+    def to_snapshot(self):
+        return {"version": 1, "guilds": self.data}
+
+    # ---------------------------------------------
+    # Index-Pflege
+    # ---------------------------------------------
+    def _index(self, guild_id: str, case: dict):
+        uid = str(case["user"])
+        for ids in (self._by_user.setdefault((guild_id, uid), []),
+                    self._by_action.setdefault((guild_id, uid, case["action"]), [])):
+            if ids and ids[-1] > case["id"]:
+                insort(ids, case["id"])  # nur bei nachträglichen Änderungen älterer Fälle
+            else:
+                ids.append(case["id"])
+
+    def _unindex(self, guild_id: str, case: dict):
+        uid = str(case["user"])
+        for key in ((guild_id, uid), (guild_id, uid, case["action"])):
+            index = self._by_user if len(key) == 2 else self._by_action
+            ids = index.get(key)
+            if ids:
+                pos = bisect_left(ids, case["id"])
+                if pos < len(ids) and ids[pos] == case["id"]:
+                    ids.pop(pos)
+                if not ids:
+                    del index[key]
+
+    def apply(self, op):
+        guild_id = op["g"]
+        guild_data = self.data.setdefault(guild_id, {"next_id": 1, "cases": {}})
+        if op["op"] == "add":
+            case = op["case"]
+            guild_data["cases"][str(case["id"])] = case
+            guild_data["next_id"] = max(guild_data["next_id"], case["id"] + 1)
+            self._index(guild_id, case)
+        elif op["op"] == "del":
+            for case_id in op["ids"]:
+                case = guild_data["cases"].pop(str(case_id), None)
+                if case:
+                    self._unindex(guild_id, case)
+        elif op["op"] == "update":
+            case = guild_data["cases"].get(str(op["id"]))
+            if case:
+                self._unindex(guild_id, case)
+                case.update(op["fields"])
+                self._index(guild_id, case)
+
+    # ---------------------------------------------
+    # Migration aus modactions.json
+    # ---------------------------------------------
+    def import_legacy(self, path: str = LEGACY_FILE):
+        """Übernimmt Einträge aus dem alten Format einmalig in einen Sammel-Bereich.
+
+        Die Guild ist dort unbekannt – die Fälle werden beim ersten Zugriff
+        auf den Benutzer in einer Guild dieser zugeordnet (claim_legacy).
+        """
+        if self.data or not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        ops = []
+        next_id = 1
+        for user_id, entries in legacy.items():
+            for entry in entries:
+                ops.append({"op": "add", "g": LEGACY_GUILD, "case": self._make_case(next_id, user_id, **{
+                    "action": entry.get("action"),
+                    "moderator_id": entry.get("moderator"),
+                    "reason": entry.get("reason"),
+                    "duration": entry.get("duration"),
+                    "timestamp": entry.get("timestamp"),
+                })})
+                next_id += 1
+        self.record_many(ops)
+        self.compact()
+
+    def claim_legacy(self, guild_id: int, user_id: int):
+        key = (LEGACY_GUILD, str(user_id))
+        ids = self._by_user.get(key)
+        if not ids:
+            return
+        cases = [self.data[LEGACY_GUILD]["cases"][str(cid)] for cid in ids]
+        ops = [{"op": "del", "g": LEGACY_GUILD, "ids": list(ids)}]
+        next_id = self._next_id(guild_id)
+        for case in cases:
+            moved = dict(case, id=next_id)
+            ops.append({"op": "add", "g": str(guild_id), "case": moved})
+            next_id += 1
+        self.record_many(ops)
+
+    # ---------------------------------------------
+    # Schreiben
+    # ---------------------------------------------
+    @staticmethod
+    def _make_case(case_id, user_id, action, moderator_id, reason, duration=None, timestamp=None, **extra):
+        case = {
+            "id": case_id,
+            "user": int(user_id),
+            "action": action,
+            "reason": reason,
+            "moderator": moderator_id,
+            "timestamp": timestamp or datetime.utcnow().isoformat(),
+            "duration": duration,
+        }
+        case.update(extra)
+        return case
+
+    def _next_id(self, guild_id: int) -> int:
+        return self.data.get(str(guild_id), {}).get("next_id", 1)
+
+    def add_case(self, guild_id: int, user_id: int, action: str, moderator_id: int, reason: str,
+                 duration: str = None, **extra) -> dict:
+        case = self._make_case(self._next_id(guild_id), user_id, action, moderator_id, reason, duration, **extra)
+        self.record({"op": "add", "g": str(guild_id), "case": case})
+        return case
+
+    def add_cases(self, guild_id: int, user_ids, action: str, moderator_id: int, reason: str,
+                  duration: str = None, **extra) -> list:
+        """Legt mehrere Fälle in einer Journal-Zeile an (z.B. Massenban)."""
+        next_id = self._next_id(guild_id)
+        cases = [self._make_case(next_id + i, uid, action, moderator_id, reason, duration, **extra)
+                 for i, uid in enumerate(user_ids)]
+        self.record_many([{"op": "add", "g": str(guild_id), "case": case} for case in cases])
+        return cases
+
+    def delete_action(self, guild_id: int, user_id: int, action: str) -> int:
+        """Löscht alle Fälle einer Aktion (z.B. Warn) eines Benutzers. Gibt die Anzahl zurück."""
+        ids = list(self._by_action.get((str(guild_id), str(user_id), action), ()))
+        if ids:
+            self.record({"op": "del", "g": str(guild_id), "ids": ids})
+        return len(ids)
+
+    def expire_case(self, guild_id: int, case_id: int) -> bool:
+        """Markiert einen Fall als abgelaufen. Er bleibt in der Historie, zählt aber nicht mehr mit."""
+        case = self.get_case(guild_id, case_id)
+        if case is None or case.get("expired"):
+            return False
+        self.record({"op": "update", "g": str(guild_id), "id": case_id, "fields": {
+            "action": f"{case['action']} (abgelaufen)",
+            "expired": datetime.utcnow().isoformat(),
+        }})
+        return True
+
+    # ---------------------------------------------
+    # Lesen
+    # ---------------------------------------------
+    def count(self, guild_id: int, user_id: int, action: str = None) -> int:
+        if action is None:
+            return len(self._by_user.get((str(guild_id), str(user_id)), ()))
+        return len(self._by_action.get((str(guild_id), str(user_id), action), ()))
+
+    def page(self, guild_id: int, user_id: int, before: int = None, limit: int = 5):
+        """Eine Seite der Historie, neueste zuerst.
+
+        before ist ein Cursor (Fall-ID): geliefert werden nur ältere Fälle.
+        Gibt (fälle, nächster_cursor) zurück; der Cursor ist None auf der letzten Seite.
+        """
+        guild_key = str(guild_id)
+        ids = self._by_user.get((guild_key, str(user_id)), [])
+        end = len(ids) if before is None else bisect_left(ids, before)
+        start = max(0, end - limit)
+        cases = self.data[guild_key]["cases"] if ids else {}
+        page = [cases[str(cid)] for cid in reversed(ids[start:end])]
+        return page, (ids[start] if start > 0 else None)
+
+    def get_case(self, guild_id: int, case_id: int):
+        return self.data.get(str(guild_id), {}).get("cases", {}).get(str(case_id))
+
+
+_store = None
+
+
+def get_case_store() -> ModCaseStore:
+    """Gemeinsame Instanz des Fall-Speichers (wird beim ersten Zugriff geladen)."""
+    global _store
+    if _store is None:
+        _store = ModCaseStore(CASES_FILE)
+        _store.import_legacy()
+    return _store
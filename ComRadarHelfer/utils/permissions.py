@@ -1,9 +1,11 @@
 import discord
+from collections import OrderedDict
 from functools import wraps
 import logging
 import os
 from logging.handlers import TimedRotatingFileHandler
 import json
+from utils.guild_config import load_settings_cached
 
 # =====================================================
 # 📂 Server-Konfig-Datei
@@ -18,6 +20,30 @@ def load_server_config(guild_id: int) -> dict:
         all_data = json.load(f)
     return all_data.get(str(guild_id), {})
 
+# Cache für load_server_configs_cached(): (mtime, alle Server)
+_server_config_cache = {"mtime": None, "data": {}}
+
+def load_server_configs_cached() -> dict:
+    """Alle Server-Konfigurationen; die Datei wird nur nach Änderungen neu geparst.
+
+    Das Ergebnis wird geteilt – nur lesen, nie verändern!
+    """
+    try:
+        mtime = os.stat(SERVER_CONFIG_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime != _server_config_cache["mtime"]:
+        data = {}
+        if mtime is not None:
+            try:
+                with open(SERVER_CONFIG_FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except json.JSONDecodeError:
+                data = {}
+        _server_config_cache["data"] = data
+        _server_config_cache["mtime"] = mtime
+    return _server_config_cache["data"]
+
 
 # =====================================================
 # 🎨 Farbige Logging-Ausgabe in Konsole & Datei
@@ -89,8 +115,9 @@ class DiscordLogHandler(logging.Handler):
 
     async def send_to_discord(self, record: logging.LogRecord, message: str):
         await self.bot.wait_until_ready()
+        configs = load_server_configs_cached()
         for guild in self.bot.guilds:
-            cfg = load_server_config(guild.id)
+            cfg = configs.get(str(guild.id), {})
             log_channel_id = cfg.get("LOG_CHANNEL_ID")
             if not log_channel_id:
                 continue
@@ -126,28 +153,122 @@ class DiscordLogHandler(logging.Handler):
 # =====================================================
 # 🛡️ Berechtigungen
 # =====================================================
-def has_permission(user: discord.Member) -> bool:
-    guild_id = user.guild.id
-    cfg = load_server_config(guild_id)
+# Bereich → (Quelle, Rollen-Schlüssel, Benutzer-Schlüssel, Administrator reicht aus)
+PERMISSION_SCOPES = {
+    "team":    ("server_config", ("ALLOWED_ROLE_IDS", "ADMIN_ROLE_IDS", "SUPPORT_ROLE_IDS"), ("ALLOWED_USER_IDS",), True),
+    "mod":     ("guild_settings", ("MOD_ROLE_IDS",), (), True),
+    "admin":   ("guild_settings", ("ADMIN_ROLE_IDS",), (), True),
+    "support": ("guild_settings", ("ADMIN_ROLE_IDS", "SUPPORT_ROLE_IDS"), (), True),
+    "wahlen":  ("guild_settings", ("comradar_admin_roles",), (), False),
+}
+DECISION_CACHE_SIZE = 2048
+
+
+def _id_set(value) -> set:
+    """Akzeptiert eine ID oder eine Liste von IDs (beides kommt in den Dateien vor)."""
+    if value is None:
+        return set()
+    if isinstance(value, (list, tuple, set)):
+        return {int(v) for v in value}
+    return {int(value)}
+
+
+class PermissionService:
+    """Zentrale Berechtigungsprüfung für alle Cogs.
+
+    Pro (Guild, Bereich) werden die erlaubten Rollen/Benutzer einmal zu
+    frozensets kompiliert. Entscheidungen landen zusätzlich in einem kleinen
+    LRU-Cache, Schlüssel (Guild, Bereich, Benutzer, Hash der Rollen) – ändern
+    sich die Rollen eines Mitglieds, ändert sich automatisch der Schlüssel.
+    Alles wird verworfen, sobald sich server_config.json oder
+    guild_settings.json ändern; Rollen-Änderungen einer Guild leeren deren Einträge.
+    """
+
+    def __init__(self):
+        self._compiled = {}                # (guild_id, scope) → (rollen, benutzer, admin_ok)
+        self._decisions = OrderedDict()    # (guild_id, scope, user_id, rollen_hash) → bool
+        self._sources = (None, None)
+
+    def _check_sources(self):
+        sources = (load_server_configs_cached(), load_settings_cached())
+        if sources[0] is not self._sources[0] or sources[1] is not self._sources[1]:
+            self._sources = sources
+            self._compiled.clear()
+            self._decisions.clear()
+
+    def _compile(self, guild_id: int, scope: str):
+        source, role_keys, user_keys, admin_ok = PERMISSION_SCOPES[scope]
+        config = self._sources[0] if source == "server_config" else self._sources[1]
+        guild_cfg = config.get(str(guild_id), {})
+        roles, users = set(), set()
+        for key in role_keys:
+            roles |= _id_set(guild_cfg.get(key))
+        for key in user_keys:
+            users |= _id_set(guild_cfg.get(key))
+        compiled = self._compiled[(guild_id, scope)] = (frozenset(roles), frozenset(users), admin_ok)
+        return compiled
+
+    def allowed(self, member: discord.Member, scope: str = "team") -> bool:
+        guild = getattr(member, "guild", None)
+        if guild is None:
+            return False  # z.B. in DMs
+        self._check_sources()
+
+        role_ids = getattr(member, "_roles", None)
+        if role_ids is None:
+            role_ids = [r.id for r in member.roles]
+        key = (guild.id, scope, member.id, hash(tuple(role_ids)))
+        decision = self._decisions.get(key)
+        if decision is not None:
+            self._decisions.move_to_end(key)
+            return decision
+
+        roles, users, admin_ok = self._compiled.get((guild.id, scope)) or self._compile(guild.id, scope)
+        decision = (
+            member.id in users
+            or not roles.isdisjoint(role_ids)
+            or (admin_ok and member.guild_permissions.administrator)
+        )
+        self._decisions[key] = decision
+        if len(self._decisions) > DECISION_CACHE_SIZE:
+            self._decisions.popitem(last=False)
+        return decision
+
+    def invalidate(self, guild_id: int = None):
+        if guild_id is None:
+            self._compiled.clear()
+            self._decisions.clear()
+            return
+        for key in [k for k in self._compiled if k[0] == guild_id]:
+            del self._compiled[key]
+        for key in [k for k in self._decisions if k[0] == guild_id]:
+            del self._decisions[key]
+
+    # Rollenrechte oder Besitzer geändert → Entscheidungen der Guild verwerfen
+    async def _on_role_change(self, role, *_):
+        self.invalidate(role.guild.id)
+
+    async def _on_guild_update(self, before, after):
+        self.invalidate(after.id)
+
+
+permission_service = PermissionService()
+
+
+def is_authorized(member: discord.Member, scope: str = "team") -> bool:
+    """Prüft, ob ein Mitglied für einen Bereich (siehe PERMISSION_SCOPES) berechtigt ist."""
+    return permission_service.allowed(member, scope)
 
-    allowed_users = cfg.get("ALLOWED_USER_IDS", [])
-    allowed_roles = cfg.get("ALLOWED_ROLE_IDS", [])
-    admin_roles = cfg.get("ADMIN_ROLE_IDS", [])
-    support_roles = cfg.get("SUPPORT_ROLE_IDS", [])
 
-    if user.id in allowed_users:
-        return True
-
-    role_ids = [r.id for r in user.roles]
-    allowed_combined = set(allowed_roles + admin_roles + support_roles)
-
-    if any(rid in allowed_combined for rid in role_ids):
-        return True
+def has_permission(user: discord.Member) -> bool:
+    return permission_service.allowed(user, "team")
 
-    if user.guild_permissions.administrator:
-        return True
 
-    return False
+def setup_permission_cache(bot):
+    """Meldet die Listener an, die den Berechtigungs-Cache bei Rollen-Änderungen leeren."""
+    bot.add_listener(permission_service._on_role_change, "on_guild_role_update")
+    bot.add_listener(permission_service._on_role_change, "on_guild_role_delete")
+    bot.add_listener(permission_service._on_guild_update, "on_guild_update")
 
 
 # =====================================================
@@ -0,0 +1,52 @@
+import discord
+
+# =====================================================
+# 🧷 Persistente Buttons (überleben Neustarts)
+# =====================================================
+# Jeder Button trägt seine Daten in der custom_id, z.B. "giveaway:join" oder
+# "ticket:close:<ersteller>". Statt pro Nachricht ein View-Objekt im Speicher
+# zu halten, meldet jedes Cog seine DynamicItem-Klassen einmal an; discord.py
+# erkennt Klicks über das Template und baut den Button erst beim Klick. Den
+# Zustand lädt der Callback dann anhand der Nachrichten-ID.
+
+
+class PersistentViewRegistry:
+    """Merkt sich, welches Cog welche DynamicItems angemeldet hat.
+
+    Beim Neuladen eines Cogs werden die alten Klassen zuerst abgemeldet, damit
+    keine veralteten Callbacks aus dem vorherigen Modul-Stand übrig bleiben.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._owners = {}  # Cog-Name → [DynamicItem-Klassen]
+
+    def register(self, owner: str, *items):
+        self.unregister(owner)
+        self.bot.add_dynamic_items(*items)
+        self._owners[owner] = list(items)
+
+    def unregister(self, owner: str):
+        items = self._owners.pop(owner, None)
+        if items:
+            self.bot.remove_dynamic_items(*items)
+
+    def registered(self) -> dict:
+        return {owner: [item.__name__ for item in items] for owner, items in self._owners.items()}
+
+
+def get_view_registry(bot) -> PersistentViewRegistry:
+    """Liefert die gemeinsame Registry des Bots."""
+    registry = getattr(bot, "view_registry", None)
+    if registry is None:
+        registry = PersistentViewRegistry(bot)
+        bot.view_registry = registry
+    return registry
+
+
+def persistent_view(*items) -> discord.ui.View:
+    """Baut eine View ohne Timeout aus fertigen DynamicItems (zum Versenden)."""
+    view = discord.ui.View(timeout=None)
+    for item in items:
+        view.add_item(item)
+    return view
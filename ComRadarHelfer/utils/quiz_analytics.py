@@ -0,0 +1,91 @@
+import csv
+import io
+
+# =====================================================
+# 📈 Quiz-Auswertung pro Frage (inkrementell)
+# =====================================================
+MIN_ANSWERS_FOR_RANKING = 5   # erst ab so vielen Antworten zählt eine Frage als "leicht"/"schwer"
+CSV_COLUMNS = ["frage_id", "frage", "kategorie", "gestellt", "antworten", "richtig", "quote_prozent",
+               "antwortzeit_avg_s", "antwortzeit_min_s", "antwortzeit_max_s", "verteilung"]
+
+
+class QuizAnalytics:
+    """Kennzahlen pro Frage-ID, fortgeschrieben mit jeder Antwort.
+
+    {frage_id: {"asked", "answers", "correct", "options": {index: anzahl},
+                "time_sum", "time_n", "time_min", "time_max"}}
+    Die Antwort-Historie wird dafür nie durchsucht.
+    """
+
+    def __init__(self, data: dict = None):
+        self.data = data or {}
+
+    def _entry(self, question_id) -> dict:
+        return self.data.setdefault(str(question_id), {
+            "asked": 0, "answers": 0, "correct": 0, "options": {},
+            "time_sum": 0.0, "time_n": 0, "time_min": None, "time_max": None,
+        })
+
+    def record_asked(self, question_id):
+        self._entry(question_id)["asked"] += 1
+
+    def record_answer(self, question_id, option_index, correct: bool, seconds=None):
+        entry = self._entry(question_id)
+        entry["answers"] += 1
+        entry["correct"] += 1 if correct else 0
+        key = str(option_index)
+        entry["options"][key] = entry["options"].get(key, 0) + 1
+        if seconds is not None and seconds >= 0:
+            entry["time_sum"] += seconds
+            entry["time_n"] += 1
+            entry["time_min"] = seconds if entry["time_min"] is None else min(entry["time_min"], seconds)
+            entry["time_max"] = seconds if entry["time_max"] is None else max(entry["time_max"], seconds)
+
+    # ---------------------------------------------
+    # Auswertung
+    # ---------------------------------------------
+    def summary(self, question_id):
+        entry = self.data.get(str(question_id))
+        if not entry:
+            return None
+        return {
+            "asked": entry["asked"],
+            "answers": entry["answers"],
+            "correct": entry["correct"],
+            "rate": entry["correct"] / entry["answers"] if entry["answers"] else None,
+            "avg_time": entry["time_sum"] / entry["time_n"] if entry["time_n"] else None,
+            "min_time": entry["time_min"],
+            "max_time": entry["time_max"],
+            "options": {int(k): v for k, v in entry["options"].items()},
+        }
+
+    def ranked(self, min_answers: int = MIN_ANSWERS_FOR_RANKING):
+        """[(frage_id, quote), ...] von schwer nach leicht."""
+        rates = [(qid, e["correct"] / e["answers"]) for qid, e in self.data.items() if e["answers"] >= min_answers]
+        return sorted(rates, key=lambda item: item[1])
+
+    def to_csv(self, questions: dict) -> str:
+        out = io.StringIO()
+        writer = csv.writer(out, delimiter=";")
+        writer.writerow(CSV_COLUMNS)
+        for qid in sorted(self.data, key=lambda q: int(q) if q.isdigit() else 0):
+            s = self.summary(qid)
+            question = questions.get(qid, {})
+            options = question.get("optionen", [])
+            distribution = ", ".join(
+                f"{options[i] if i < len(options) else chr(65 + i)}: {n}" for i, n in sorted(s["options"].items())
+            )
+            writer.writerow([
+                qid,
+                question.get("frage", ""),
+                question.get("kategorie") or "",
+                s["asked"],
+                s["answers"],
+                s["correct"],
+                "" if s["rate"] is None else round(s["rate"] * 100, 1),
+                "" if s["avg_time"] is None else round(s["avg_time"], 1),
+                "" if s["min_time"] is None else round(s["min_time"], 1),
+                "" if s["max_time"] is None else round(s["max_time"], 1),
+                distribution,
+            ])
+        return out.getvalue()
@@ -0,0 +1,196 @@
+import csv
+import io
+import json
+import os
+import random
+
+# =====================================================
+# 🃏 Fragenpool mit Stapeln pro Guild & Kategorie
+# =====================================================
+DATA_DIR = "data"
+POOL_FILE = os.path.join(DATA_DIR, "quizpool.json")
+DECKS_FILE = os.path.join(DATA_DIR, "quiz_decks.json")
+ALL_CATEGORIES = "*"
+
+# Gewicht beim Mischen: höher = kommt im Stapel tendenziell früher
+QUIZ_DIFFICULTY_WEIGHTS = {
+    "leicht": 1.0,
+    "mittel": 1.0,
+    "schwer": 0.6,
+}
+DEFAULT_DIFFICULTY = "mittel"
+
+
+def _load(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _dump_atomic(path, data):
+    os.makedirs(os.path.dirname(path) or DATA_DIR, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def weighted_shuffle(ids, weights):
+    """Gewichtetes Mischen (Efraimidis–Spirakis): Schlüssel u^(1/w), absteigend sortiert."""
+    return sorted(ids, key=lambda qid: random.random() ** (1.0 / weights[qid]), reverse=True)
+
+
+class QuizPool:
+    """Gemeinsamer Fragenkatalog, aus dem jede Guild über eigene Stapel zieht.
+
+    Der Katalog (quizpool.json) wird nicht mehr verbraucht. Pro Guild und
+    Kategorie gibt es einen gemischten Stapel (Liste von IDs + Cursor) in
+    quiz_decks.json; Ziehen ist damit O(1) und wiederholt keine Frage, bis
+    der Stapel durch ist. Erst dann wird neu gemischt.
+    """
+
+    def __init__(self):
+        self.questions = _load(POOL_FILE)
+        self.decks = _load(DECKS_FILE)  # {guild: {kategorie: {"order": [...], "cursor": n}}}
+        self._by_category = {}
+        for qid, question in self.questions.items():
+            self._by_category.setdefault(question.get("kategorie"), []).append(qid)
+
+    # ---------------------------------------------
+    # Ziehen
+    # ---------------------------------------------
+    def _category_ids(self, category):
+        if category in (None, ALL_CATEGORIES):
+            return list(self.questions)
+        return list(self._by_category.get(category, ()))
+
+    def _weight(self, qid) -> float:
+        difficulty = self.questions[qid].get("schwierigkeit", DEFAULT_DIFFICULTY)
+        return QUIZ_DIFFICULTY_WEIGHTS.get(difficulty, 1.0)
+
+    def _new_deck(self, category) -> dict:
+        ids = self._category_ids(category)
+        return {"order": weighted_shuffle(ids, {qid: self._weight(qid) for qid in ids}), "cursor": 0}
+
+    def draw(self, guild_id, category: str = None):
+        """Zieht die nächste Frage für eine Guild. Gibt (id, frage) oder (None, None) zurück."""
+        category = category or ALL_CATEGORIES
+        guild_decks = self.decks.setdefault(str(guild_id), {})
+        deck = guild_decks.get(category)
+        for _ in range(2):  # höchstens einmal neu mischen
+            if deck is None or deck["cursor"] >= len(deck["order"]):
+                deck = guild_decks[category] = self._new_deck(category)
+                if not deck["order"]:
+                    return None, None
+            while deck["cursor"] < len(deck["order"]):
+                qid = deck["order"][deck["cursor"]]
+                deck["cursor"] += 1
+                if qid in self.questions:  # gelöschte Fragen überspringen
+                    _dump_atomic(DECKS_FILE, self.decks)
+                    return qid, self.questions[qid]
+        return None, None
+
+    # ---------------------------------------------
+    # Hinzufügen & Import
+    # ---------------------------------------------
+    def next_id(self) -> str:
+        return str(max((int(qid) for qid in self.questions if qid.isdigit()), default=0) + 1)
+
+    def add(self, question: dict, save: bool = True) -> str:
+        qid = self.next_id()
+        self.questions[qid] = question
+        self._by_category.setdefault(question.get("kategorie"), []).append(qid)
+        # In laufende Stapel an einer zufälligen, noch nicht gezogenen Stelle einsortieren
+        for guild_decks in self.decks.values():
+            for category in (question.get("kategorie"), ALL_CATEGORIES):
+                deck = guild_decks.get(category)
+                if deck is None:
+                    continue
+                deck["order"].append(qid)
+                pos = random.randint(deck["cursor"], len(deck["order"]) - 1)
+                deck["order"][pos], deck["order"][-1] = deck["order"][-1], deck["order"][pos]
+        if save:
+            self.save()
+        return qid
+
+    def save(self):
+        _dump_atomic(POOL_FILE, self.questions)
+        _dump_atomic(DECKS_FILE, self.decks)
+
+    def import_questions(self, filename: str, raw: bytes):
+        """Importiert Fragen aus CSV oder JSON. Gibt (importiert, fehler) zurück."""
+        text = raw.decode("utf-8-sig")
+        if filename.lower().endswith(".json"):
+            rows = json.loads(text)
+            if isinstance(rows, dict):
+                rows = list(rows.values())
+            if not isinstance(rows, list):
+                raise ValueError("JSON muss eine Liste oder ein Objekt von Fragen sein")
+        else:
+            rows = list(csv.DictReader(io.StringIO(text), delimiter=";" if text.count(";") > text.count(",") else ","))
+
+        imported, errors = 0, []
+        for line, row in enumerate(rows, start=1):
+            try:
+                question = parse_question(row)
+            except ValueError as e:
+                errors.append(f"Zeile {line}: {e}")
+                continue
+            self.add(question, save=False)
+            imported += 1
+        if imported:
+            self.save()
+        return imported, errors
+
+    def categories(self) -> dict:
+        return {category: len(ids) for category, ids in self._by_category.items()}
+
+
+def parse_question(row: dict) -> dict:
+    """Normalisiert eine Frage aus dem Import (CSV-Spalten oder JSON wie in quizpool.json)."""
+    if not isinstance(row, dict):
+        raise ValueError("Eintrag ist kein Objekt")
+    if "optionen" in row:
+        if not isinstance(row["optionen"], list):
+            raise ValueError("optionen muss eine Liste sein")
+        options = [str(o).strip() for o in row["optionen"]]
+    else:
+        options = [str(row.get(f"option_{c}", "")).strip() for c in "abc"]
+    options = [o for o in options if o]
+    frage = str(row.get("frage", "")).strip()
+    if not frage or len(options) < 2:
+        raise ValueError("Frage oder Antwortoptionen fehlen")
+
+    korrekt = str(row.get("korrekt", "")).strip()
+    if korrekt not in options and korrekt.upper() in ("A", "B", "C"):
+        index = "ABC".index(korrekt.upper())
+        if index >= len(options):
+            raise ValueError(f"Option {korrekt.upper()} existiert nicht")
+        korrekt = options[index]
+    if korrekt not in options:
+        raise ValueError("korrekte Antwort ist keine der Optionen")
+
+    difficulty = str(row.get("schwierigkeit") or DEFAULT_DIFFICULTY).strip().lower()
+    if difficulty not in QUIZ_DIFFICULTY_WEIGHTS:
+        raise ValueError(f"unbekannte Schwierigkeit '{difficulty}'")
+
+    return {
+        "frage": frage,
+        "optionen": options,
+        "korrekt": korrekt,
+        "loesung": str(row.get("loesung") or "").strip() or "Keine Begründung angegeben.",
+        "kategorie": str(row.get("kategorie") or "").strip() or None,
+        "schwierigkeit": difficulty,
+    }
+
+
+_pool = None
+
+
+def get_quiz_pool() -> QuizPool:
+    """Gemeinsamer Fragenpool (wird beim ersten Zugriff geladen)."""
+    global _pool
+    if _pool is None:
+        _pool = QuizPool()
+    return _pool
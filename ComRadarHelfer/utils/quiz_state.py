@@ -0,0 +1,223 @@
+import json
+import os
+from bisect import bisect_left, insort
+from datetime import datetime
+from utils.journal import JournalStore
+from utils.quiz_analytics import QuizAnalytics
+
+# =====================================================
+# 🧠 Quiz-Zustand im Speicher (Antworten, Punkte, Fragen)
+# =====================================================
+DATA_DIR = "data"
+QUESTIONS_FILE = os.path.join(DATA_DIR, "quizfragen.json")
+ANSWERS_FILE = os.path.join(DATA_DIR, "quiz_answers.json")
+SEASONS_FILE = os.path.join(DATA_DIR, "quiz_seasons.json")
+# Früher getrennt gespeichert – werden nur noch einmalig übernommen
+LEGACY_SCORES_FILE = os.path.join(DATA_DIR, "quiz_scores.json")
+LEGACY_STATS_FILE = os.path.join(DATA_DIR, "quiz_stats.json")
+
+
+def _load(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        print(f"[WARNUNG] {path} war beschädigt – starte mit leerem Stand.")
+        return {}
+
+
+def _dump_atomic(path, data):
+    os.makedirs(os.path.dirname(path) or DATA_DIR, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class Leaderboard:
+    """Rangliste einer Guild als sortierte Liste (-punkte, user_id).
+
+    Wird bei jeder Punktänderung per bisect aktualisiert; Top-N ist ein
+    Slice, der Rang eines Benutzers eine binäre Suche.
+    """
+
+    def __init__(self, scores: dict = None):
+        self.points = dict(scores or {})
+        self._sorted = sorted((-pts, uid) for uid, pts in self.points.items())
+
+    def set(self, user_id: str, points: int):
+        old = self.points.get(user_id)
+        if old is not None:
+            pos = bisect_left(self._sorted, (-old, user_id))
+            if pos < len(self._sorted) and self._sorted[pos] == (-old, user_id):
+                self._sorted.pop(pos)
+        self.points[user_id] = points
+        insort(self._sorted, (-points, user_id))
+
+    def top(self, n: int = 10):
+        """[(user_id, punkte), ...] absteigend."""
+        return [(uid, -neg) for neg, uid in self._sorted[:n]]
+
+    def rank(self, user_id: str):
+        """Rang (1 = Bester, Gleichstand teilt sich den Rang) oder None."""
+        points = self.points.get(user_id)
+        if points is None:
+            return None
+        return bisect_left(self._sorted, (-points,)) + 1
+
+    def leaders(self):
+        """Alle Benutzer mit der Höchstpunktzahl."""
+        if not self._sorted:
+            return [], 0
+        best = self._sorted[0][0]
+        end = bisect_left(self._sorted, (best + 1,))
+        return [uid for _, uid in self._sorted[:end]], -best
+
+    def __len__(self):
+        return len(self._sorted)
+
+
+class QuizState(JournalStore):
+    """Antworten ({datum: {guild: {user: antwort}}}) und Punkte ({guild: {user: punkte}}).
+
+    Ein Klick auf einen Antwort-Button prüft und zählt nur noch im Speicher
+    und hängt eine Zeile an quiz_answers.json.journal an. Antworten, Punkte
+    und Auswertung liegen gemeinsam im Snapshot quiz_answers.json, der
+    periodisch (snapshot()) bzw. beim Entladen geschrieben wird – so passen
+    Snapshot und Journal immer zusammen und nach einem Absturz wird nichts
+    doppelt gezählt. Die Tagesfragen (quizfragen.json) werden einmal
+    geladen und nur beim Posten einer neuen Frage gespeichert.
+    """
+
+    COMPACT_AFTER = 5000  # Snapshots übernimmt sonst der periodische Task
+
+    def load(self):
+        # Altes Format: Punkte und Auswertung in eigenen Dateien (ein neuer Snapshot überschreibt das)
+        self.scores = _load(LEGACY_SCORES_FILE)
+        self.analytics = QuizAnalytics(_load(LEGACY_STATS_FILE))
+        self.questions = _load(QUESTIONS_FILE)
+        self._boards = {}
+        super().load()
+
+    def from_snapshot(self, raw):
+        if raw.get("version") == 2:
+            self.scores = raw.get("scores", {})
+            self.analytics = QuizAnalytics(raw.get("stats", {}))
+            return raw.get("answers", {})
+        return raw
+
+    def to_snapshot(self):
+        return {"version": 2, "answers": self.data, "scores": self.scores, "stats": self.analytics.data}
+
+    def apply(self, op):
+        if op["op"] == "answer":
+            day = self.data.setdefault(op["d"], {}).setdefault(op["g"], {})
+            day[op["u"]] = {"antwort": op["a"], "richtig": op["r"]}
+            if op["r"]:
+                self._add_points(op["g"], [op["u"]])
+            if op.get("q") is not None:
+                self.analytics.record_answer(op["q"], op.get("i"), op["r"], op.get("t"))
+        elif op["op"] == "asked":
+            self.analytics.record_asked(op["q"])
+        elif op["op"] == "points":
+            self._add_points(op["g"], op["users"])
+        elif op["op"] == "season_reset":
+            self.scores[op["g"]] = {}
+            self._boards.pop(op["g"], None)
+
+    def _add_points(self, guild_id: str, user_ids):
+        guild_scores = self.scores.setdefault(guild_id, {})
+        board = self._boards.get(guild_id)
+        for uid in user_ids:
+            guild_scores[uid] = guild_scores.get(uid, 0) + 1
+            if board is not None:
+                board.set(uid, guild_scores[uid])
+
+    def compact(self):
+        super().compact()
+        # Stand steckt jetzt im Snapshot – alte Dateien würden nur verwirren
+        for path in (LEGACY_SCORES_FILE, LEGACY_STATS_FILE):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def snapshot(self):
+        """Schreibt die Dateien nur, wenn seit dem letzten Snapshot etwas passiert ist."""
+        if self._journal_lines:
+            self.compact()
+
+    # ---------------------------------------------
+    # Fragen
+    # ---------------------------------------------
+    def question(self, date: str, guild_id):
+        return self.questions.get(date, {}).get(str(guild_id))
+
+    def set_question(self, date: str, guild_id, question: dict):
+        self.questions.setdefault(date, {})[str(guild_id)] = question
+        _dump_atomic(QUESTIONS_FILE, self.questions)
+        if question.get("id") is not None:
+            self.record({"op": "asked", "q": str(question["id"])})
+
+    # ---------------------------------------------
+    # Antworten & Punkte
+    # ---------------------------------------------
+    def answers(self, date: str, guild_id) -> dict:
+        return self.data.get(date, {}).get(str(guild_id), {})
+
+    def has_answered(self, date: str, guild_id, user_id) -> bool:
+        return str(user_id) in self.answers(date, guild_id)
+
+    def record_answer(self, date: str, guild_id, user_id, option: str, correct: bool,
+                      question_id=None, index: int = None, seconds: float = None):
+        op = {"op": "answer", "d": date, "g": str(guild_id), "u": str(user_id), "a": option, "r": correct}
+        if question_id is not None:
+            # Für die Auswertung: Frage, gewählte Option und Antwortzeit
+            op.update(q=str(question_id), i=index, t=None if seconds is None else round(seconds, 1))
+        self.record(op)
+
+    def add_points(self, guild_id, user_ids):
+        if user_ids:
+            self.record({"op": "points", "g": str(guild_id), "users": [str(u) for u in user_ids]})
+
+    def guild_scores(self, guild_id) -> dict:
+        return self.scores.get(str(guild_id), {})
+
+    def leaderboard(self, guild_id) -> Leaderboard:
+        """Rangliste der Guild (wird beim ersten Zugriff einmal sortiert aufgebaut)."""
+        board = self._boards.get(str(guild_id))
+        if board is None:
+            board = self._boards[str(guild_id)] = Leaderboard(self.guild_scores(guild_id))
+        return board
+
+    # ---------------------------------------------
+    # Saisons
+    # ---------------------------------------------
+    def seasons(self, guild_id) -> list:
+        return _load(SEASONS_FILE).get(str(guild_id), [])
+
+    def end_season(self, guild_id, winner_id=None) -> dict:
+        """Archiviert die aktuellen Punkte in quiz_seasons.json und startet eine neue Saison."""
+        archive = _load(SEASONS_FILE)
+        seasons = archive.setdefault(str(guild_id), [])
+        season = {
+            "saison": len(seasons) + 1,
+            "beendet": datetime.utcnow().isoformat(),
+            "gewinner": None if winner_id is None else str(winner_id),
+            "punkte": dict(self.guild_scores(guild_id)),
+        }
+        seasons.append(season)
+        _dump_atomic(SEASONS_FILE, archive)
+        self.record({"op": "season_reset", "g": str(guild_id)})
+        return season
+
+
+_state = None
+
+
+def get_quiz_state() -> QuizState:
+    """Gemeinsamer Quiz-Zustand (wird beim ersten Zugriff geladen)."""
+    global _state
+    if _state is None:
+        _state = QuizState(ANSWERS_FILE)
+    return _state
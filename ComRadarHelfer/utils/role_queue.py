@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections import deque
+import discord
+from utils.permissions import logger
+from utils.roles import add_roles_bisect
+
+# =====================================================
+# 🎭 Rollenvergabe-Queue (gemeinsam für alle Cogs)
+# =====================================================
+MIN_INTERVAL = 0.5     # Sekunden zwischen zwei Rollen-Edits derselben Guild
+RETRY_DELAY = 5.0      # Wartezeit nach Rate-Limit/Serverfehler
+MAX_RETRIES = 3
+
+
+class _GuildQueue:
+    def __init__(self):
+        self.jobs = deque()
+        self.pending = {}      # member_id → Job (zum Zusammenführen)
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.last_call = 0.0
+        self.processed = 0
+
+
+class _Job:
+    __slots__ = ("member", "roles", "reason", "future", "retries")
+
+    def __init__(self, member, roles, reason):
+        self.member = member
+        self.roles = list(roles)
+        self.reason = reason
+        self.future = asyncio.get_running_loop().create_future()
+        self.retries = 0
+
+
+class RoleAssignmentQueue:
+    """Vergibt Rollen pro Guild nacheinander und mit Mindestabstand.
+
+    Jede Guild hat einen eigenen Worker, damit ein Raid auf einem Server die
+    anderen nicht ausbremst. Mehrere Aufträge für dasselbe Mitglied, die noch
+    warten, werden zu einem Edit zusammengeführt.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._queues = {}  # guild_id → _GuildQueue
+
+    def submit(self, member: discord.Member, roles, reason: str = None) -> asyncio.Future:
+        """Reiht eine Rollenvergabe ein. Das Future liefert (vergeben, abgelehnt)."""
+        queue = self._queues.get(member.guild.id)
+        if queue is None:
+            queue = self._queues[member.guild.id] = _GuildQueue()
+
+        job = queue.pending.get(member.id)
+        if job is not None:
+            job.roles.extend(r for r in roles if r not in job.roles)
+            return job.future
+
+        job = _Job(member, roles, reason)
+        queue.jobs.append(job)
+        queue.pending[member.id] = job
+        queue.wakeup.set()
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._worker(queue))
+        return job.future
+
+    def pending(self, guild_id: int) -> int:
+        queue = self._queues.get(guild_id)
+        return len(queue.jobs) if queue else 0
+
+    async def _worker(self, queue: _GuildQueue):
+        while True:
+            await queue.wakeup.wait()
+            while queue.jobs:
+                job = queue.jobs.popleft()
+                queue.pending.pop(job.member.id, None)
+
+                wait = queue.last_call + MIN_INTERVAL - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                queue.last_call = time.monotonic()
+
+                # Mitglied inzwischen wieder weg → nichts zu tun
+                if job.member.guild.get_member(job.member.id) is None:
+                    job.future.set_result(([], []))
+                    continue
+
+                try:
+                    result = await add_roles_bisect(job.member, job.roles, reason=job.reason)
+                except discord.HTTPException as e:
+                    if (e.status == 429 or e.status >= 500) and job.retries < MAX_RETRIES:
+                        job.retries += 1
+                        queue.jobs.appendleft(job)
+                        queue.pending[job.member.id] = job
+                        await asyncio.sleep(RETRY_DELAY * job.retries)
+                        continue
+                    logger.warning(f"⚠️ Rollenvergabe an {job.member} fehlgeschlagen: {e}")
+                    result = ([], job.roles)
+                queue.processed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            queue.wakeup.clear()
+
+
+def get_role_queue(bot) -> RoleAssignmentQueue:
+    """Liefert die gemeinsame Rollenvergabe-Queue des Bots."""
+    role_queue = getattr(bot, "role_queue", None)
+    if role_queue is None:
+        role_queue = RoleAssignmentQueue(bot)
+        bot.role_queue = role_queue
+    return role_queue
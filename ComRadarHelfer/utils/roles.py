@@ -0,0 +1,62 @@
+import discord
+
+# =====================================================
+# 🎭 Hilfsfunktionen für Rollenvergabe
+# =====================================================
+def assignable_roles(member: discord.Member, role_ids):
+    """Ermittelt, welche der gespeicherten Rollen der Bot dem Mitglied geben kann.
+
+    Gibt (roles, skipped) zurück – skipped ist eine Liste von (role_id, Grund).
+    Gelöschte, verwaltete (Bots/Booster), @everyone- und Rollen oberhalb der
+    höchsten Bot-Rolle werden vorab aussortiert, ebenso Rollen, die das
+    Mitglied bereits besitzt.
+    """
+    guild = member.guild
+    me = guild.me
+    have = {r.id for r in member.roles}
+    roles, skipped = [], []
+    for role_id in dict.fromkeys(role_ids):  # Duplikate entfernen, Reihenfolge behalten
+        role = guild.get_role(role_id)
+        if role is None:
+            skipped.append((role_id, "gelöscht"))
+        elif role.is_default() or role.managed:
+            skipped.append((role_id, "verwaltet"))
+        elif me is not None and role >= me.top_role and guild.owner_id != me.id:
+            skipped.append((role_id, "über der Bot-Rolle"))
+        elif role.id not in have:
+            roles.append(role)
+    return roles, skipped
+
+
+async def add_roles_bisect(member: discord.Member, roles, reason: str = None):
+    """Vergibt alle Rollen mit einem einzigen Member-Edit.
+
+    Schlägt das mit Forbidden fehl, wird die Liste halbiert, bis die
+    verantwortliche(n) Rolle(n) gefunden sind. Gibt (vergeben, abgelehnt) zurück.
+
+    Jeder PATCH setzt die komplette Rollenliste. discord.py aktualisiert
+    member.roles nach einem Edit nicht, deshalb wird die Liste aus dem
+    Ausgangsstand plus allen bereits vergebenen Rollen gebaut – sonst würde
+    ein späterer PATCH die eben vergebenen Rollen wieder entfernen.
+    """
+    roles = list(roles)
+    if not roles:
+        return [], []
+    base_roles = member.roles[1:]  # ohne @everyone
+    granted, rejected = [], []
+
+    async def attempt(candidate):
+        try:
+            await member.edit(roles=base_roles + granted + candidate, reason=reason)
+        except discord.Forbidden:
+            if len(candidate) == 1:
+                rejected.extend(candidate)
+                return
+            mid = len(candidate) // 2
+            await attempt(candidate[:mid])
+            await attempt(candidate[mid:])
+        else:
+            granted.extend(candidate)
+
+    await attempt(roles)
+    return granted, rejected
@@ -0,0 +1,141 @@
+import re
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+# =====================================================
+# ⏱️ Dauer- und Zeitpunkt-Eingaben (Umfrage, Giveaway, Moderation)
+# =====================================================
+BERLIN_TZ = ZoneInfo("Europe/Berlin")  # Automatische Sommer-/Winterzeit
+MAX_DURATION = timedelta(days=366)
+
+# Einheit → Sekunden; Kurzformen und deutsche Schreibweisen
+DURATION_UNITS = {
+    "w": 604800, "wo": 604800, "woche": 604800, "wochen": 604800,
+    "d": 86400, "t": 86400, "tag": 86400, "tage": 86400,
+    "h": 3600, "std": 3600, "stunde": 3600, "stunden": 3600,
+    "m": 60, "min": 60, "minute": 60, "minuten": 60,
+    "s": 1, "sek": 1, "sekunde": 1, "sekunden": 1,
+}
+_UNIT_PATTERN = "|".join(sorted(DURATION_UNITS, key=len, reverse=True))
+DURATION_PART = re.compile(rf"(\d{{1,6}})\s*({_UNIT_PATTERN})", re.IGNORECASE)
+DURATION_FULL = re.compile(rf"(?:in\s+)?(?:\d{{1,6}}\s*(?:{_UNIT_PATTERN})\s*)+", re.IGNORECASE)
+
+# Absolute Angaben, immer in Berliner Zeit
+DATETIME_PATTERNS = [
+    # 24.12.2025 18:30 / 24.12.25 18:30 / 24.12.2025
+    re.compile(r"(?P<day>\d{1,2})\.(?P<month>\d{1,2})\.(?P<year>\d{4}|\d{2})(?:\s+(?P<hour>\d{1,2}):(?P<minute>\d{2}))?"),
+    # 24.12. 18:30 (aktuelles Jahr, bzw. nächstes, falls schon vorbei)
+    re.compile(r"(?P<day>\d{1,2})\.(?P<month>\d{1,2})\.(?:\s+(?P<hour>\d{1,2}):(?P<minute>\d{2}))?"),
+    # 2025-12-24 18:30 / 2025-12-24T18:30
+    re.compile(r"(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})(?:[ T](?P<hour>\d{2}):(?P<minute>\d{2}))?"),
+    # 18:30 (heute, bzw. morgen, falls schon vorbei)
+    re.compile(r"(?P<hour>\d{1,2}):(?P<minute>\d{2})(?:\s*uhr)?", re.IGNORECASE),
+]
+
+
+def parse_duration(text: str, minimum: timedelta = None, maximum: timedelta = MAX_DURATION) -> timedelta:
+    """Liest Dauern wie "1w", "2d6h", "1h 90m", "3 Tage 4 Std". Wirft ValueError.
+
+    Jede Einheit darf nur einmal vorkommen; die Reihenfolge ist egal.
+    """
+    text = (text or "").strip()
+    if not DURATION_FULL.fullmatch(text):
+        raise ValueError("Ungültige Dauer. Beispiele: `30m`, `2d6h`, `1w`, `1h 90m`")
+
+    seconds, seen = 0, set()
+    for amount, unit in DURATION_PART.findall(text):
+        factor = DURATION_UNITS[unit.lower()]
+        if factor in seen:
+            raise ValueError(f"Die Einheit `{unit}` kommt mehrfach vor.")
+        seen.add(factor)
+        seconds += int(amount) * factor
+
+    duration = timedelta(seconds=seconds)
+    if duration <= timedelta(0):
+        raise ValueError("Die Dauer muss größer als 0 sein.")
+    if minimum is not None and duration < minimum:
+        raise ValueError(f"Die Dauer muss mindestens {format_duration(minimum)} betragen.")
+    if maximum is not None and duration > maximum:
+        raise ValueError(f"Die Dauer darf höchstens {format_duration(maximum)} betragen.")
+    return duration
+
+
+def _localize(naive: datetime) -> datetime:
+    """Hängt Berliner Zeit an und lehnt Uhrzeiten ab, die es wegen der Zeitumstellung nicht gibt."""
+    aware = naive.replace(tzinfo=BERLIN_TZ)
+    roundtrip = aware.astimezone(timezone.utc).astimezone(BERLIN_TZ).replace(tzinfo=None)
+    if roundtrip != naive:
+        raise ValueError(f"{naive.strftime('%d.%m.%Y %H:%M')} existiert wegen der Zeitumstellung nicht.")
+    return aware
+
+
+def parse_datetime(text: str, now: datetime = None) -> datetime:
+    """Liest einen Zeitpunkt in Berliner Zeit ("24.12.2025 18:30", "24.12. 18:30",
+    "2025-12-24 18:30", "18:30"). Gibt ein zeitzonenbewusstes datetime zurück. Wirft ValueError.
+    """
+    text = (text or "").strip()
+    now = (now or datetime.now(BERLIN_TZ)).astimezone(BERLIN_TZ)
+    for pattern in DATETIME_PATTERNS:
+        match = pattern.fullmatch(text)
+        if not match:
+            continue
+        parts = match.groupdict()
+        hour = int(parts["hour"]) if parts.get("hour") else 0
+        minute = int(parts["minute"]) if parts.get("minute") else 0
+        try:
+            if parts.get("day") is None:  # nur Uhrzeit
+                naive = now.replace(tzinfo=None, hour=hour, minute=minute, second=0, microsecond=0)
+                if naive <= now.replace(tzinfo=None):
+                    naive += timedelta(days=1)
+            else:
+                year = parts.get("year")
+                if year is None:
+                    naive = datetime(now.year, int(parts["month"]), int(parts["day"]), hour, minute)
+                    if naive <= now.replace(tzinfo=None):
+                        naive = naive.replace(year=now.year + 1)
+                else:
+                    year = int(year) + 2000 if len(year) == 2 else int(year)
+                    naive = datetime(year, int(parts["month"]), int(parts["day"]), hour, minute)
+        except ValueError:
+            raise ValueError(f"`{text}` ist kein gültiges Datum.")
+        return _localize(naive)
+    raise ValueError("Ungültiger Zeitpunkt. Beispiele: `24.12.2025 18:30`, `24.12. 18:30`, `18:30`")
+
+
+def parse_when(text: str, now: datetime = None, minimum: timedelta = None,
+               maximum: timedelta = MAX_DURATION) -> datetime:
+    """Relativ ("2d6h", "in 3 Std") oder absolut (siehe parse_datetime); muss in der Zukunft liegen."""
+    now = (now or datetime.now(BERLIN_TZ)).astimezone(BERLIN_TZ)
+    if DURATION_FULL.fullmatch((text or "").strip()):
+        # In UTC rechnen, sonst verschiebt die Zeitumstellung das Ergebnis um eine Stunde
+        return (now.astimezone(timezone.utc) + parse_duration(text, minimum, maximum)).astimezone(BERLIN_TZ)
+    when = parse_datetime(text, now)
+    ahead = when.astimezone(timezone.utc) - now.astimezone(timezone.utc)
+    if ahead <= timedelta(0):
+        raise ValueError("Der Zeitpunkt liegt in der Vergangenheit.")
+    if minimum is not None and ahead < minimum:
+        raise ValueError(f"Der Zeitpunkt muss mindestens {format_duration(minimum)} in der Zukunft liegen.")
+    if maximum is not None and ahead > maximum:
+        raise ValueError(f"Der Zeitpunkt darf höchstens {format_duration(maximum)} in der Zukunft liegen.")
+    return when
+
+
+def format_duration(duration: timedelta) -> str:
+    """timedelta → "2 Tage 6 Stunden" (Sekunden nur, wenn sonst nichts übrig bleibt)."""
+    seconds = int(duration.total_seconds())
+    parts = []
+    for factor, singular, plural in ((604800, "Woche", "Wochen"), (86400, "Tag", "Tage"),
+                                     (3600, "Stunde", "Stunden"), (60, "Minute", "Minuten")):
+        amount, seconds = divmod(seconds, factor)
+        if amount:
+            parts.append(f"{amount} {singular if amount == 1 else plural}")
+    if seconds or not parts:
+        parts.append(f"{seconds} Sekunde" if seconds == 1 else f"{seconds} Sekunden")
+    return " ".join(parts)
+
+
+def format_berlin(dt: datetime) -> str:
+    """Zeitpunkt in Berliner Zeit, naive Werte gelten als UTC."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(BERLIN_TZ).strftime("%d.%m.%Y um %H:%M Uhr")
@@ -0,0 +1,76 @@
+import os
+from utils.journal import JournalStore
+
+# =====================================================
+# 📊 Stimmen der Button-Umfragen im Speicher
+# =====================================================
+DATA_DIR = "data"
+VOTES_FILE = os.path.join(DATA_DIR, "umfrage_votes.json")
+
+
+class UmfrageVotes(JournalStore):
+    """Stimmen pro Umfrage ({nachricht_id: {user_id: [option, ...]}}).
+
+    Zu jeder Umfrage wird zusätzlich eine Zählung ({option: anzahl}) im
+    Speicher mitgeführt und bei jeder Stimme angepasst. Ein Klick kostet
+    damit eine Journal-Zeile, das Ergebnis muss nie aus den Reaktionen oder
+    der kompletten Stimmliste neu berechnet werden.
+    """
+
+    def load(self):
+        self.tallies = {}
+        super().load()
+
+    def from_snapshot(self, raw):
+        for message_id, votes in raw.items():
+            tally = self.tallies.setdefault(message_id, {})
+            for options in votes.values():
+                for option in options:
+                    tally[option] = tally.get(option, 0) + 1
+        return raw
+
+    def apply(self, op):
+        if op["op"] == "vote":
+            votes = self.data.setdefault(op["m"], {})
+            tally = self.tallies.setdefault(op["m"], {})
+            for option in votes.pop(op["u"], []):
+                tally[option] -= 1
+            if op["o"]:
+                votes[op["u"]] = op["o"]
+                for option in op["o"]:
+                    tally[option] = tally.get(option, 0) + 1
+        elif op["op"] == "drop":
+            self.data.pop(op["m"], None)
+            self.tallies.pop(op["m"], None)
+
+    # ---------------------------------------------
+    # Zugriff
+    # ---------------------------------------------
+    def choices(self, message_id, user_id) -> list:
+        return self.data.get(str(message_id), {}).get(str(user_id), [])
+
+    def vote(self, message_id, user_id, options: list):
+        """Setzt die Stimme eines Benutzers (leere Liste = zurückziehen)."""
+        self.record({"op": "vote", "m": str(message_id), "u": str(user_id), "o": sorted(set(options))})
+
+    def tally(self, message_id) -> dict:
+        return self.tallies.get(str(message_id), {})
+
+    def voters(self, message_id) -> int:
+        return len(self.data.get(str(message_id), {}))
+
+    def drop(self, message_id):
+        """Entfernt die Einzelstimmen einer beendeten Umfrage."""
+        if str(message_id) in self.data:
+            self.record({"op": "drop", "m": str(message_id)})
+
+
+_votes = None
+
+
+def get_umfrage_votes() -> UmfrageVotes:
+    """Gemeinsamer Stimmen-Speicher (wird beim ersten Zugriff geladen)."""
+    global _votes
+    if _votes is None:
+        _votes = UmfrageVotes(VOTES_FILE)
+    return _votes
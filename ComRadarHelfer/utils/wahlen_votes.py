@@ -0,0 +1,123 @@
+import asyncio
+import os
+from utils.journal import JournalStore
+
+# =====================================================
+# 🗳️ Nominierungen & Stimmen der ComRadar-Wahlen
+# =====================================================
+DATA_DIR = "data"
+WAHLEN_FILE = os.path.join(DATA_DIR, "comradar_wahlen.json")
+FLUSH_DELAY = 2.0   # Sekunden – Stimmen in diesem Fenster landen in einer Journal-Zeile
+CHOICES = ("yes", "no")
+
+
+class NominationStore(JournalStore):
+    """Alle Nominierungen (Liste wie bisher in comradar_wahlen.json).
+
+    Im Speicher liegen die Wähler als Mengen ({"yes": set, "no": set}) und
+    ein Index Nachrichten-ID → Nominierung; eine Stimme ist damit O(1) statt
+    Datei laden + Listen durchsuchen + Datei schreiben. Stimmen werden
+    gesammelt und höchstens alle FLUSH_DELAY Sekunden als ein Batch ins
+    Journal geschrieben.
+    """
+
+    def __init__(self, path: str = WAHLEN_FILE):
+        self._pending = []
+        self._flush_task = None
+        super().__init__(path)
+
+    def empty(self):
+        self._by_message = {}
+        self._by_guild = {}
+        return []
+
+    def from_snapshot(self, raw):
+        for nomination in raw:
+            self._index(nomination)
+        return raw
+
+    def to_snapshot(self):
+        return [
+            {**nomination, "voters": {choice: sorted(nomination["voters"][choice]) for choice in CHOICES}}
+            for nomination in self.data
+        ]
+
+    def _index(self, nomination: dict):
+        voters = nomination.get("voters") or {}
+        nomination["voters"] = {choice: set(voters.get(choice, [])) for choice in CHOICES}
+        self._by_message[str(nomination["public_msg_id"])] = nomination
+        self._by_guild.setdefault(str(nomination["guild_id"]), []).append(nomination)
+
+    def apply(self, op):
+        if op["op"] == "add":
+            nomination = dict(op["nomination"])
+            self.data.append(nomination)
+            self._index(nomination)
+        elif op["op"] == "vote":
+            nomination = self._by_message.get(op["m"])
+            if nomination is None:
+                return
+            for choice in CHOICES:
+                nomination["voters"][choice].discard(op["u"])
+            if op["c"] in CHOICES:
+                nomination["voters"][op["c"]].add(op["u"])
+
+    # ---------------------------------------------
+    # Zugriff
+    # ---------------------------------------------
+    def add_nomination(self, nomination: dict) -> dict:
+        self.flush()  # Reihenfolge im Journal beibehalten
+        self.record({"op": "add", "nomination": nomination})
+        return self._by_message[str(nomination["public_msg_id"])]
+
+    def by_message(self, message_id):
+        return self._by_message.get(str(message_id))
+
+    def for_guild(self, guild_id) -> list:
+        return self._by_guild.get(str(guild_id), [])
+
+    def choice_of(self, nomination: dict, user_id):
+        for choice in CHOICES:
+            if user_id in nomination["voters"][choice]:
+                return choice
+        return None
+
+    def vote(self, nomination: dict, user_id: int, choice):
+        """Setzt die Stimme (choice None = löschen) sofort im Speicher; gespeichert wird gebündelt."""
+        op = {"op": "vote", "m": str(nomination["public_msg_id"]), "u": user_id, "c": choice}
+        self.apply(op)
+        self._pending.append(op)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    # ---------------------------------------------
+    # Gebündeltes Speichern
+    # ---------------------------------------------
+    async def _flush_later(self):
+        await asyncio.sleep(FLUSH_DELAY)
+        self.flush()
+
+    def flush(self):
+        """Schreibt gesammelte Stimmen als eine Journal-Zeile."""
+        if not self._pending:
+            return
+        ops, self._pending = self._pending, []
+        batch = {"op": "batch", "ops": ops}
+        self._append(batch)  # bereits angewendet
+
+    def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        self.flush()
+        self.compact()
+
+
+_store = None
+
+
+def get_nomination_store() -> NominationStore:
+    """Gemeinsamer Wahlen-Speicher (wird beim ersten Zugriff geladen)."""
+    global _store
+    if _store is None:
+        _store = NominationStore()
+    return _store